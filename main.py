@@ -15,10 +15,17 @@ Usage:
     python main.py --dry-run          # Test without sending to Slack
     python main.py --verbose          # Enable debug logging
     python main.py --no-cache         # Disable sentiment cache
+    python main.py --import-cache logs/sentiment_cache.json.gz --export-cache logs/sentiment_cache.json.gz
+    python main.py --cost-summary     # Show Claude spend vs daily/monthly budgets
+    python main.py --train-classifier # Train the local classifier from Claude labels
+    python main.py --prompt-stats     # Compare prompt tokens/tweet per layout
+    python main.py --eval logs/tweets_raw_2026-01-09_172555.json  # Offline prompt eval
+    python main.py --rollups day --rollup-days 90  # Daily score for the last quarter
 """
 
 import sys
 import os
+import glob
 import json
 import time
 import argparse
@@ -33,6 +40,19 @@ from twitter_client import TwitterClient
 from sentiment_analyzer import SentimentAnalyzer
 from aggregator import SentimentAggregator
 from slack_notifier import SlackNotifier
+from cost_ledger import CostLedger
+from trend_store import TrendStore
+from rollups import RollupStore
+from spike_detector import SpikeDetector
+from report_format import save_report
+from fast_path import FastPathAlerter
+from local_classifier import load_training_examples, train_classifier
+from prompt_eval import (
+    record_responses,
+    reference_file_for,
+    run_eval,
+    variants_from_config,
+)
 from utils import (
     load_env,
     load_config,
@@ -66,6 +86,13 @@ Examples:
   %(prog)s --verbose                Enable debug logging
   %(prog)s --no-cache               Disable sentiment cache
   %(prog)s --config custom.yaml    Use custom config file
+  %(prog)s --import-cache snap.gz --export-cache snap.gz
+                                    Restore and persist the cache across CI runs
+  %(prog)s --cost-summary           Show Claude spend vs daily/monthly budgets
+  %(prog)s --train-classifier       Train the local classifier from Claude labels
+  %(prog)s --prompt-stats           Compare prompt tokens/tweet per layout
+  %(prog)s --rollups hour           Negative share per hour (last 30 days)
+  %(prog)s --windows 1 24 168       1h, 24h and 7d reports from one 7d fetch
         """,
     )
 
@@ -82,6 +109,14 @@ Examples:
         help="Hours to look back for tweets (default: 24, supports decimals like 0.5 for 30 mins)",
     )
 
+    parser.add_argument(
+        "--windows",
+        type=float,
+        nargs="+",
+        metavar="HOURS",
+        help="Also report these trailing windows (hours) from one fetch of the widest; overrides --hours",
+    )
+
     parser.add_argument(
         "--output", type=str, help="Custom output file path for report JSON"
     )
@@ -96,6 +131,71 @@ Examples:
         help="Disable sentiment cache (re-analyze all tweets)",
     )
 
+    parser.add_argument(
+        "--import-cache",
+        type=str,
+        metavar="PATH",
+        help="Restore sentiment cache from a compressed snapshot before analysis",
+    )
+
+    parser.add_argument(
+        "--export-cache",
+        type=str,
+        metavar="PATH",
+        help="Write a compressed snapshot of valid cache entries after analysis",
+    )
+
+    parser.add_argument(
+        "--cost-summary",
+        action="store_true",
+        help="Print Claude cost ledger summary (daily/monthly budgets) and exit",
+    )
+
+    parser.add_argument(
+        "--train-classifier",
+        action="store_true",
+        help="Train the local classifier from cached Claude labels and exit",
+    )
+
+    parser.add_argument(
+        "--prompt-stats",
+        action="store_true",
+        help="Measure prompt tokens per tweet for each layout on logs/tweets_raw_*.json and exit",
+    )
+
+    parser.add_argument(
+        "--eval",
+        type=str,
+        metavar="RAW_FILE",
+        help="Replay a tweets_raw_*.json file through each prompt variant offline and exit",
+    )
+
+    parser.add_argument(
+        "--eval-reference",
+        type=str,
+        metavar="PATH",
+        help="Analyzed file to measure label agreement with (default: same run's tweets_analyzed_*.json)",
+    )
+
+    parser.add_argument(
+        "--eval-record",
+        action="store_true",
+        help="With --eval, send the requests to the real API and record the responses for replay",
+    )
+
+    parser.add_argument(
+        "--rollups",
+        choices=["hour", "day"],
+        help="Print tweets, negative share and score per hour or day from the rollups and exit",
+    )
+
+    parser.add_argument(
+        "--rollup-days",
+        type=float,
+        default=30,
+        help="Days covered by --rollups (default: 30)",
+    )
+
     parser.add_argument(
         "--config",
         type=str,
@@ -106,6 +206,297 @@ Examples:
     return parser.parse_args()
 
 
+def print_cost_summary(config_path: str) -> int:
+    """
+    Print the persistent Claude cost ledger summary.
+
+    Args:
+        config_path: Path to configuration file (for budget limits)
+
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    try:
+        config = load_config(config_path)
+    except Exception as e:
+        logger.error(f"❌ Failed to load config: {e}")
+        return 1
+
+    cost_limits = config.get("claude", {}).get("cost_limits", {})
+    ledger = CostLedger(
+        config.get("claude", {}).get("ledger_file", "logs/cost_ledger.jsonl")
+    )
+    summary = ledger.summary(
+        cost_limits.get("max_per_day_usd"), cost_limits.get("max_per_month_usd")
+    )
+
+    lines = [f"💰 Claude cost ledger ({ledger.ledger_file})", "-" * 60]
+    for label, key in [("Last 24 hours", "daily"), ("Last 30 days", "monthly")]:
+        window = summary[key]
+        limit = (
+            f" of ${window['limit_usd']:.2f} (${window['remaining_usd']:.4f} left)"
+            if window["limit_usd"] is not None
+            else ""
+        )
+        lines.append(
+            f"{label}: ${window['cost_usd']:.4f}{limit} | "
+            f"{window['requests']} requests | "
+            f"{window['input_tokens']:,} in / {window['output_tokens']:,} out tokens | "
+            f"cache {window['cache_read_input_tokens']:,} read / "
+            f"{window['cache_creation_input_tokens']:,} written"
+        )
+
+    latency = summary["latency_seconds"]
+    cost = summary["cost_per_request_usd"]
+    lines.append("-" * 60)
+    lines.append(
+        f"Runs: {summary['runs']} | Failed requests: {summary['failed_requests']}"
+    )
+    lines.append(
+        "Latency (s): " + " | ".join(f"{p} {v:.2f}" for p, v in latency.items())
+    )
+    lines.append(
+        "Cost/request ($): " + " | ".join(f"{p} {v:.4f}" for p, v in cost.items())
+    )
+    for model, stats in summary["by_model"].items():
+        lines.append(
+            f"• {model}: {stats['requests']} requests, ${stats['cost_usd']:.4f}"
+        )
+
+    print("\n".join(lines))
+    return 0
+
+
+def train_local_classifier(config_path: str) -> int:
+    """
+    Train the local classifier from Claude labels in logs/.
+
+    Args:
+        config_path: Path to configuration file (for the model file path)
+
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    try:
+        config = load_config(config_path)
+    except Exception as e:
+        logger.error(f"❌ Failed to load config: {e}")
+        return 1
+
+    local_config = config.get("claude", {}).get("local_classifier", {})
+    model_file = local_config.get("model_file", "logs/local_classifier.json")
+
+    examples = load_training_examples("logs")
+    try:
+        classifier = train_classifier(examples)
+    except ValueError as e:
+        logger.error(f"❌ {e}")
+        return 1
+    classifier.save(model_file)
+
+    # Measure single-core classification throughput
+    texts = [text for text, _ in examples]
+    repeats = max(1, 5000 // len(texts))
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text in texts:
+            classifier.classify(text)
+    elapsed = time.perf_counter() - start
+
+    metadata = classifier.metadata
+    print(
+        f"🧮 Local classifier trained on {metadata['examples']} tweets → {model_file}"
+    )
+    for field, accuracy in metadata["holdout_accuracy"].items():
+        print(
+            f"  {field}: {accuracy:.1%} holdout accuracy "
+            f"({metadata['holdout_examples']} held out)"
+        )
+    print(f"  Throughput: {len(texts) * repeats / elapsed:,.0f} tweets/s")
+    return 0
+
+
+def open_rollups(config: Dict) -> RollupStore:
+    """
+    Open the hourly/daily rollup store configured in advanced.rollups.
+
+    Args:
+        config: Loaded configuration
+
+    Returns:
+        RollupStore with any saved buckets
+    """
+    rollup_config = config.get("advanced", {}).get("rollups", {})
+    return RollupStore(
+        rollup_config.get("file", "logs/rollups.json"),
+        hourly_days=rollup_config.get("hourly_days", 30),
+        daily_days=rollup_config.get("daily_days", 400),
+    )
+
+
+def print_rollups(config_path: str, resolution: str, days: float) -> int:
+    """
+    Print per-bucket tweet counts, negative share and score from the rollups.
+
+    Args:
+        config_path: Path to configuration file
+        resolution: "hour" or "day"
+        days: Days to cover, ending now
+
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    try:
+        config = load_config(config_path)
+    except Exception as e:
+        logger.error(f"❌ Failed to load config: {e}")
+        return 1
+
+    rollups = open_rollups(config)
+    now = datetime.utcnow()
+    buckets = rollups.buckets(now - timedelta(days=days), now, resolution)
+    if not buckets:
+        print(f"No rollups for the last {days:g} days in {rollups.rollup_file}")
+        return 0
+
+    key_format = "%Y-%m-%d %H:00" if resolution == "hour" else "%Y-%m-%d"
+    lines = [f"📈 Rollups per {resolution} ({rollups.rollup_file})", "-" * 60]
+    for start, bucket in buckets:
+        themes = ", ".join(theme for theme, _ in bucket.top_themes(3))
+        lines.append(
+            f"{start.strftime(key_format)} | {bucket.tweets:>5} tweets | "
+            f"negative {bucket.negative_share:>6.1%} | "
+            f"score {bucket.sentiment_score:>6.1f} | "
+            f"FUD {bucket.critical_fud} | {themes}"
+        )
+
+    print("\n".join(lines))
+    return 0
+
+
+def print_prompt_stats(config_path: str) -> int:
+    """
+    Compare prompt tokens per tweet for each layout on saved raw tweets.
+
+    Args:
+        config_path: Path to configuration file (batch size, layout options)
+
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    try:
+        config = load_config(config_path)
+    except Exception as e:
+        logger.error(f"❌ Failed to load config: {e}")
+        return 1
+
+    raw_files = sorted(glob.glob("logs/tweets_raw_*.json"))
+    if not raw_files:
+        logger.error("❌ No logs/tweets_raw_*.json files to measure")
+        return 1
+
+    # Only formats prompts; no requests are sent, so no API key is needed
+    analyzer = SentimentAnalyzer(api_key="unused", config=config)
+    batch_size = config.get("claude", {}).get("batch_size", 15)
+
+    print(f"📏 Estimated input tokens per tweet (batch size {batch_size})")
+    print("-" * 60)
+    for raw_file in raw_files:
+        with open(raw_file, "r") as f:
+            tweets = json.load(f)
+        stats = analyzer.measure_prompt_tokens(tweets, batch_size)
+        full, compact = stats["full"], stats["compact"]
+        saved = 1 - compact["tweets"] / full["tweets"] if full["tweets"] else 0.0
+        print(
+            f"{os.path.basename(raw_file)} ({len(tweets)} tweets): "
+            f"prompt {full['prompt']:,.0f} → {compact['prompt']:,.0f} | "
+            f"tweet blocks {full['tweets']:,.0f} → {compact['tweets']:,.0f} "
+            f"({saved:.0%} fewer)"
+        )
+    return 0
+
+
+def evaluate_prompts(
+    config_path: str, raw_file: str, reference_file: str = None, record: bool = False
+) -> int:
+    """
+    Compare prompt variants on a saved tweet archive.
+
+    Args:
+        config_path: Path to configuration file (variants, recordings file)
+        raw_file: tweets_raw_*.json file to replay
+        reference_file: Analyzed file to measure agreement with
+        record: Send requests to the real API and record the responses
+
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    try:
+        config = load_config(config_path)
+    except Exception as e:
+        logger.error(f"❌ Failed to load config: {e}")
+        return 1
+
+    if not os.path.exists(raw_file):
+        logger.error(f"❌ Raw tweet file not found: {raw_file}")
+        return 1
+
+    eval_config = config.get("claude", {}).get("eval", {})
+    recordings_file = eval_config.get("recordings_file", "logs/eval_recordings.json")
+    variants = variants_from_config(config)
+
+    if record:
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not api_key:
+            logger.error("❌ ANTHROPIC_API_KEY is required to record responses")
+            return 1
+        try:
+            recorded = record_responses(
+                config, raw_file, recordings_file, api_key, variants
+            )
+        except ValueError as e:
+            logger.error(f"❌ Invalid prompt variant: {e}")
+            return 1
+        print(f"🎙️ Recorded {recorded} responses → {recordings_file}")
+
+    reference_file = reference_file or reference_file_for(raw_file)
+    try:
+        report = run_eval(config, raw_file, reference_file, recordings_file, variants)
+    except ValueError as e:
+        logger.error(f"❌ Invalid prompt variant: {e}")
+        return 1
+
+    print(f"🧪 Prompt evaluation of {os.path.basename(raw_file)}")
+    print(f"Reference: {reference_file or 'none'} | Recordings: {recordings_file}")
+    print("-" * 60)
+    for name, result in report.items():
+        agreement = " | ".join(
+            f"{field} {value:.0%}" if value is not None else f"{field} n/a"
+            for field, value in result["agreement"].items()
+        )
+        print(
+            f"{name}: {result['input_tokens_per_tweet']:,.1f} in / "
+            f"{result['output_tokens_per_tweet']:,.1f} out tokens per tweet | "
+            f"${result['cost_per_tweet_usd']:.5f}/tweet | "
+            f"parse failures {result['parse_failure_rate']:.0%} of "
+            f"{result['requests']} requests"
+        )
+        print(
+            f"  Agreement on recorded ({result['reference_tweets']} tweets): "
+            f"{agreement} | "
+            f"responses {result['responses']['recorded']} recorded / "
+            f"{result['responses']['synthesized']} synthesized"
+        )
+    return 0
+
+
+def window_label(hours: float) -> str:
+    """Short label for a report window, e.g. "1h", "24h" or "7d"."""
+    if hours >= 48 and hours % 24 == 0:
+        return f"{hours / 24:g}d"
+    return f"{hours:g}h"
+
+
 def main() -> int:
     """
     Main workflow orchestration.
@@ -121,6 +512,28 @@ def main() -> int:
     log_file = os.getenv("LOG_FILE", "logs/sentiment_monitor.log")
     setup_logging(log_level, log_file)
 
+    if args.cost_summary:
+        return print_cost_summary(args.config)
+
+    if args.train_classifier:
+        return train_local_classifier(args.config)
+
+    if args.prompt_stats:
+        return print_prompt_stats(args.config)
+
+    if args.rollups:
+        return print_rollups(args.config, args.rollups, args.rollup_days)
+
+    if args.eval:
+        return evaluate_prompts(
+            args.config, args.eval, args.eval_reference, args.eval_record
+        )
+
+    # Windows are sliced from one fetch of the widest window
+    windows = sorted(set(args.windows or []))
+    if windows:
+        args.hours = windows[-1]
+
     # Start timer
     start_time = time.time()
 
@@ -160,6 +573,30 @@ def main() -> int:
             logger.error(f"❌ Failed to load config: {e}")
             return 1
 
+        # Check rolling daily/monthly Claude budgets before spending anything
+        cost_limits = config.get("claude", {}).get("cost_limits", {})
+        cost_ledger = CostLedger(
+            config.get("claude", {}).get("ledger_file", "logs/cost_ledger.jsonl")
+        )
+        within_budget, budget_reason = cost_ledger.check_budget(
+            cost_limits.get("max_per_day_usd"), cost_limits.get("max_per_month_usd")
+        )
+        if not within_budget:
+            local_config = config.get("claude", {}).get("local_classifier", {})
+            if (
+                local_config.get("enabled", False)
+                and local_config.get("degraded_mode", True)
+                and os.path.exists(
+                    local_config.get("model_file", "logs/local_classifier.json")
+                )
+            ):
+                logger.warning(f"⚠️ {budget_reason}")
+                logger.warning("Continuing in degraded mode with the local classifier")
+            else:
+                logger.error(f"❌ {budget_reason}")
+                logger.error("Run `python main.py --cost-summary` for details")
+                return 1
+
         # ====================================================================
         # STEP 2: Initialize Clients
         # ====================================================================
@@ -176,15 +613,41 @@ def main() -> int:
 
         # Initialize sentiment analyzer
         try:
-            sentiment_analyzer = SentimentAnalyzer()
+            sentiment_analyzer = SentimentAnalyzer(config=config, ledger=cost_ledger)
             logger.info("✅ Sentiment analyzer initialized")
         except Exception as e:
             logger.error(f"❌ Failed to initialize sentiment analyzer: {e}")
             return 1
 
-        # Initialize aggregator
+        # Restore cache snapshot (fresh CI runners start with an empty cache)
+        cache_max_age = (
+            config.get("sentiment", {}).get("cache", {}).get("max_age_days", 7)
+        )
+        if args.import_cache and not args.no_cache:
+            try:
+                sentiment_analyzer.import_cache(args.import_cache, cache_max_age)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to import cache snapshot: {e}")
+
+        # Initialize aggregator, with earlier runs' scores for the trend
+        advanced = config.get("advanced", {})
+        trend_store = None
+        if advanced.get("track_sentiment_trends", True):
+            try:
+                trend_store = TrendStore(
+                    advanced.get("trend_store_file", "logs/trend_store.jsonl")
+                )
+                if not trend_store.entries():
+                    trend_store.backfill(sorted(glob.glob("logs/report_*.json")))
+            except Exception as e:
+                logger.warning(f"⚠️ Trend store unavailable: {e}")
+                trend_store = None
+
         try:
-            aggregator = SentimentAggregator()
+            aggregator = SentimentAggregator(
+                trend_store=trend_store,
+                trend_window_days=advanced.get("trend_window_days", 7),
+            )
             logger.info("✅ Aggregator initialized")
         except Exception as e:
             logger.error(f"❌ Failed to initialize aggregator: {e}")
@@ -204,14 +667,27 @@ def main() -> int:
         logger.info("")
         logger.info(f"Step 3: Fetching tweets (last {args.hours} hours)...")
 
+        # Urgent tweets are analyzed and alerted on while later pages load
+        fast_path = FastPathAlerter.from_config(
+            config, sentiment_analyzer, slack_notifier, dry_run=args.dry_run
+        )
+
         try:
-            tweets = twitter_client.search_mentions(hours=args.hours)
+            tweets = twitter_client.search_mentions(
+                hours=args.hours, on_page=fast_path.submit if fast_path else None
+            )
             logger.info(f"✅ Found {len(tweets)} tweets")
         except Exception as e:
             logger.error(f"❌ Failed to fetch tweets: {e}")
             logger.error("Check your Twitter API credentials and rate limits")
             return 1
 
+        # Bulk analysis reuses fast path results, so let them finish first
+        if fast_path:
+            fast_path_alerts = fast_path.wait()
+            if fast_path_alerts:
+                logger.warning(f"⚡ {len(fast_path_alerts)} urgent alerts sent early")
+
         # Handle empty results
         if len(tweets) == 0:
             logger.warning("⚠️ No tweets found in time range")
@@ -251,20 +727,60 @@ def main() -> int:
             logger.error("Check your Anthropic API key and rate limits")
             return 1
 
-        # Calculate total API cost
-        total_cost = sum(
-            t.get("api_cost", {}).get("estimated_cost_usd", 0) for t in analyzed_tweets
+        # Shadow comparison goes to its own file, never into the report
+        shadow_cost = 0.0
+        if sentiment_analyzer.shadow:
+            shadow_summary = sentiment_analyzer.shadow.finish()
+            shadow_cost = shadow_summary["shadow_cost_usd"]
+            logger.info(
+                f"👥 Shadow {shadow_summary['shadow']['model']} "
+                f"({shadow_summary['shadow']['prompt_layout']}): "
+                f"{shadow_summary['tweets_compared']} tweets compared, agreement "
+                + ", ".join(
+                    f"{field} {rate:.0%}"
+                    for field, rate in shadow_summary["agreement"].items()
+                    if rate is not None
+                )
+            )
+
+        # Persist cache snapshot for the next run
+        if args.export_cache and not args.no_cache:
+            try:
+                sentiment_analyzer.export_cache(args.export_cache, cache_max_age)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to export cache snapshot: {e}")
+
+        cache_stats = sentiment_analyzer.get_cache_stats()
+        logger.info(
+            f"💾 Cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+            f"({cache_stats['hit_rate']:.1%} hit rate)"
         )
+        if cache_stats["revalidations"]:
+            logger.info(
+                "💾 Re-analyzed cached tweets: "
+                + ", ".join(f"{n} {r}" for r, n in cache_stats["revalidations"].items())
+            )
+
+        # Calculate total API cost (includes abandoned hedge requests and
+        # shadow requests, as the cost ledger does)
+        total_cost = sentiment_analyzer.total_cost + shadow_cost
         logger.info(f"💰 Total Claude API cost: ${total_cost:.4f}")
+        if shadow_cost:
+            logger.info(f"👥 Of which shadow evaluation: ${shadow_cost:.4f}")
 
-        # Check cost limit
-        max_cost = (
-            config.get("claude", {}).get("cost_limits", {}).get("max_per_run_usd", 5.0)
-        )
-        if total_cost > max_cost:
+        # Cost limit is enforced before each batch; report what was left out
+        unanalyzed_tweets = sentiment_analyzer.unanalyzed_tweets
+        if unanalyzed_tweets:
             logger.warning(
-                f"⚠️ Cost ${total_cost:.4f} exceeds configured limit ${max_cost:.2f}"
+                f"⚠️ {len(unanalyzed_tweets)} tweets were not analyzed "
+                f"(cost limit or API failure)"
             )
+            unanalyzed_file = f"logs/tweets_unanalyzed_{timestamp}.json"
+            try:
+                save_json(unanalyzed_tweets, unanalyzed_file)
+                logger.info(f"💾 Saved unanalyzed tweets to {unanalyzed_file}")
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to save unanalyzed tweets: {e}")
 
         # Save analyzed tweets
         analyzed_file = f"logs/tweets_analyzed_{timestamp}.json"
@@ -281,7 +797,12 @@ def main() -> int:
         logger.info("Step 5: Aggregating results and generating report...")
 
         try:
-            report = aggregator.aggregate(analyzed_tweets)
+            if windows:
+                window_reports = aggregator.aggregate_windows(analyzed_tweets, windows)
+                report = window_reports[args.hours]
+            else:
+                window_reports = {}
+                report = aggregator.aggregate(analyzed_tweets)
             logger.info("✅ Report generated")
         except Exception as e:
             logger.error(f"❌ Aggregation failed: {e}")
@@ -290,9 +811,37 @@ def main() -> int:
         # Update metadata
         report["metadata"]["analysis_duration"] = round(time.time() - start_time, 2)
         report["metadata"]["total_api_cost"] = total_cost
+        report["metadata"]["shadow_api_cost"] = shadow_cost
         report["metadata"]["tweets_analyzed"] = len(tweets)
+        report["metadata"]["cache_hits"] = cache_stats["hits"]
+        report["metadata"]["cache_hit_rate"] = cache_stats["hit_rate"]
+        report["metadata"]["tweets_unanalyzed"] = len(unanalyzed_tweets)
+        local_stats = sentiment_analyzer.local_stats
+        report["metadata"]["tweets_classified_locally"] = local_stats["local"]
+        report["metadata"]["tweets_degraded"] = local_stats["degraded"]
+        if fast_path:
+            report["metadata"]["fast_path"] = fast_path.summary()
+        report["metadata"]["batch_latency"] = (
+            sentiment_analyzer.request_hedger.latency_summary()
+        )
         report["metadata"]["date_range"] = get_time_range_string(args.hours)
 
+        # File analyzed tweets into the hourly rollups by creation time, then
+        # check the completed hours for spikes against their baselines
+        if config.get("advanced", {}).get("rollups", {}).get("enabled", True):
+            try:
+                rollups = open_rollups(config)
+                added = rollups.add_tweets(analyzed_tweets)
+                rollups.downsample()
+                rollups.save()
+                logger.info(f"📈 Added {added} tweets to {rollups.rollup_file}")
+
+                spike_detector = SpikeDetector(config.get("monitoring", {}))
+                report["raw_data"]["anomalies"] = spike_detector.process(rollups)
+                spike_detector.save()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to update rollups: {e}")
+
         # Log summary statistics
         summary = report["raw_data"]["summary"]
         logger.info("")
@@ -329,11 +878,38 @@ def main() -> int:
             args.output or f'logs/report_{datetime.now().strftime("%Y-%m-%d")}.json'
         )
         try:
-            save_json(report, report_file)
+            save_report(report, report_file)
             logger.info(f"💾 Saved report to {report_file}")
         except Exception as e:
             logger.warning(f"⚠️ Failed to save report: {e}")
 
+        # Narrower windows share the run's fetch and analysis; only the widest
+        # (primary) report feeds Slack, the trend store and rollups
+        for hours, window_report in window_reports.items():
+            if hours == args.hours:
+                continue
+            window_report["metadata"]["date_range"] = get_time_range_string(hours)
+            window_summary = window_report["raw_data"]["summary"]
+            logger.info(
+                f"🪟 Last {window_label(hours)}: "
+                f"{window_summary['total_tweets']} tweets, "
+                f"{window_summary['negative_pct']:.1f}% negative, "
+                f"score {window_summary['sentiment_score']:.1f}/100"
+            )
+            window_file = (
+                f"logs/window_{window_label(hours)}_"
+                f'{datetime.now().strftime("%Y-%m-%d")}.json'
+            )
+            try:
+                save_report(window_report, window_file)
+                logger.info(f"💾 Saved {window_label(hours)} report to {window_file}")
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to save window report: {e}")
+
+        # Append this run to the trend store for later runs' trend
+        if trend_store:
+            trend_store.record(report)
+
         # ====================================================================
         # STEP 6: Send to Slack
         # ====================================================================
@@ -345,6 +921,10 @@ def main() -> int:
             logger.info("📊 REPORT PREVIEW (Message 1 - Summary):")
             logger.info("=" * 60)
             print("\n" + report["message_1"] + "\n")
+            for hours, window_report in window_reports.items():
+                if hours != args.hours:
+                    logger.info(f"📊 {window_label(hours)} window (Message 1):")
+                    print("\n" + window_report["message_1"] + "\n")
             logger.info("=" * 60)
             logger.info("ℹ️ Message 2 (Detailed Analysis) available in: " + report_file)
             logger.info("=" * 60)
@@ -383,6 +963,7 @@ def main() -> int:
             # Keep reports longer
             report_retention = config.get("retention", {}).get("reports_days", 90)
             cleanup_old_files("logs", report_retention, pattern="report_*.json")
+            cleanup_old_files("logs", report_retention, pattern="window_*.json")
 
             logger.info("✅ Cleanup complete")
         except Exception as e:
@@ -1,12 +1,17 @@
 """Comprehensive sentiment data aggregation and report generation for Nansen."""
 
+import heapq
 import json
 import logging
 import time
-from typing import List, Dict, Tuple, Optional
-from datetime import datetime
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from functools import reduce
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from pathlib import Path
 
+from trend_store import TrendStore
+from utils import parse_created_at
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -64,15 +69,441 @@ THEME_CATEGORY_MAPPING = {
 }
 
 
+# Strategic categories counted in strategic_highlights
+STRATEGIC_CATEGORY_COUNTERS = {
+    "STRATEGIC_WIN": "strategic_wins",
+    "ADOPTION_SIGNAL": "adoption_signals",
+    "CRITICAL_FUD": "critical_fud",
+    "AFFILIATE_VIOLATION": "affiliate_violations",
+}
+
+# Products counted in product_mentions
+TRACKED_PRODUCTS = [
+    "nansen_mobile",
+    "season2_rewards",
+    "nansen_trading",
+    "ai_insights",
+    "nansen_points",
+]
+
+# Sentiment score contribution per sentiment (NEUTRAL and MIXED count as 0)
+SENTIMENT_BASE_SCORES = {"POSITIVE": 1.0, "NEGATIVE": -1.0}
+
+# Urgency levels, most urgent first
+URGENCY_ORDER = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
+
+# Example tweets linked per theme in the Slack summary
+EXAMPLES_PER_THEME = 3
+
+# Report sides: NEGATIVE tweets, and everything else
+SIDES = ["positive", "negative"]
+
+# Bumped when the serialized AggregateState layout changes
+STATE_VERSION = 2
+
+
+def map_theme_to_category(theme: str, patterns: List[str]) -> str:
+    """
+    Map theme to category label for negative phrase analysis.
+
+    Args:
+        theme: Theme name
+        patterns: List of negative patterns
+
+    Returns:
+        Category label like [AIRDROP], [SCAM], etc.
+    """
+    # Check patterns first (more specific)
+    for pattern in patterns:
+        if pattern in THEME_CATEGORY_MAPPING:
+            return THEME_CATEGORY_MAPPING[pattern]
+
+    # Fall back to theme mapping
+    if theme in THEME_CATEGORY_MAPPING:
+        return THEME_CATEGORY_MAPPING[theme]
+
+    return "[GENERAL]"
+
+
+class AggregateState:
+    """
+    Every counter, group and list a report needs, filled in one pass.
+
+    add() files a tweet under each report section at once, so aggregating
+    is a single linear scan however many sections the report has. Negative
+    phrases are bucketed by urgency as they arrive, which yields them
+    HIGH first without a sort. Themes keep a tweet count and a bounded
+    min-heap of their best examples (influencers first, then engagement,
+    earlier tweets on ties) instead of every tweet, so picking examples is
+    O(n log k) and the JSON report and Slack show the same ones.
+
+    States are mergeable: merge(a, b) equals the state of a's tweets
+    followed by b's, and merging is associative, so hourly partials or
+    per-worker shards combine into the same report as one pass over all
+    tweets. to_dict()/from_dict() make a state storable as JSON.
+    """
+
+    def __init__(self):
+        """Initialize empty state."""
+        self.total = 0
+        self.weighted_score = 0.0
+        self.total_weight = 0.0
+        self.product_mentions = {product: 0 for product in TRACKED_PRODUCTS}
+        self.strategic_highlights = {
+            **{counter: 0 for counter in STRATEGIC_CATEGORY_COUNTERS.values()},
+            "influencer_mentions": 0,
+        }
+        # Compact rows (url, username, text, ...) of every tweet, in order
+        self.positive_tweets: List[Dict] = []
+        self.negative_tweets: List[Dict] = []
+        # Per side: tweets per theme (first-seen order) and example heaps of
+        # [is_influencer, engagement, -position, row], worst example on top
+        self.theme_counts: Dict[str, Dict[str, int]] = {side: {} for side in SIDES}
+        self.best_examples: Dict[str, Dict[str, List[List]]] = {
+            side: {} for side in SIDES
+        }
+        self.negative_theme_urgency: Dict[str, str] = {}
+        # One bucket per urgency level, plus one for unknown levels
+        self.phrases_by_urgency: List[List[Dict]] = [[] for _ in range(4)]
+        self.urls: Set[str] = set()
+
+    @classmethod
+    def from_tweets(cls, analyzed_tweets: List[Dict]) -> "AggregateState":
+        """
+        Build state from analyzed tweets in one pass.
+
+        Args:
+            analyzed_tweets: Analyzed tweet dictionaries from SentimentAnalyzer
+
+        Returns:
+            AggregateState holding every tweet
+        """
+        state = cls()
+        for tweet in analyzed_tweets:
+            state.add(tweet)
+        return state
+
+    def add(self, tweet: Dict) -> None:
+        """
+        File one analyzed tweet under every report section.
+
+        Args:
+            tweet: Analyzed tweet dictionary from SentimentAnalyzer
+        """
+        analysis = tweet["analysis"]
+        original = tweet["original_tweet"]
+        sentiment = analysis["sentiment"]
+        confidence = analysis["confidence"] / 100.0  # Normalize to 0-1
+
+        self.total += 1
+        self.urls.add(original["url"])
+        self.weighted_score += SENTIMENT_BASE_SCORES.get(sentiment, 0.0) * confidence
+        self.total_weight += confidence
+
+        for product in analysis.get("product_mentions", []):
+            if product in self.product_mentions:
+                self.product_mentions[product] += 1
+
+        counter = STRATEGIC_CATEGORY_COUNTERS.get(
+            analysis.get("strategic_category", "")
+        )
+        if counter:
+            self.strategic_highlights[counter] += 1
+        is_influencer = analysis.get("is_influencer", False)
+        if is_influencer:
+            self.strategic_highlights["influencer_mentions"] += 1
+
+        negative = sentiment == "NEGATIVE"
+        side = "negative" if negative else "positive"
+        themes = analysis.get("themes", [])
+        urgency = analysis.get("urgency", "LOW")
+        engagement = original.get("engagement", {}).get("total", 0)
+        row = {
+            "url": original["url"],
+            "username": original["author_username"],
+            "text": original["text"],
+            "engagement": engagement,
+            "is_influencer": is_influencer,
+            "themes": themes,
+            "urgency": urgency,
+        }
+        (self.negative_tweets if negative else self.positive_tweets).append(row)
+
+        theme_counts = self.theme_counts[side]
+        best_examples = self.best_examples[side]
+        # Negated position: on equal rank, the earlier tweet is the better one
+        entry = [is_influencer, engagement, -self.total, row]
+        for theme in themes or ["general"]:
+            theme_counts[theme] = theme_counts.get(theme, 0) + 1
+            heap = best_examples.get(theme)
+            if heap is None:
+                best_examples[theme] = [entry]
+            elif len(heap) < EXAMPLES_PER_THEME:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+            if negative and urgency in URGENCY_ORDER:
+                current = self.negative_theme_urgency.get(theme, "LOW")
+                if URGENCY_ORDER[urgency] < URGENCY_ORDER[current]:
+                    self.negative_theme_urgency[theme] = urgency
+
+        if negative:
+            primary_theme = themes[0] if themes else "unknown"
+            category = map_theme_to_category(
+                primary_theme, analysis.get("negative_patterns", [])
+            )
+            bucket = self.phrases_by_urgency[URGENCY_ORDER.get(urgency, 3)]
+            for keyword in analysis.get("critical_keywords", []):
+                bucket.append(
+                    {
+                        "phrase": keyword,
+                        "username": original["author_username"],
+                        "theme": primary_theme,
+                        "category": category,
+                        "url": original["url"],
+                        "urgency": urgency,
+                    }
+                )
+
+    def theme_examples(self, side: str) -> Dict[str, List[Dict]]:
+        """
+        Example tweet rows per theme, best first.
+
+        Args:
+            side: "positive" or "negative"
+
+        Returns:
+            Dictionary mapping theme to at most EXAMPLES_PER_THEME rows
+        """
+        return {
+            theme: [entry[3] for entry in sorted(heap, reverse=True)]
+            for theme, heap in self.best_examples[side].items()
+        }
+
+    @property
+    def sentiment_score(self) -> float:
+        """Confidence-weighted sentiment score from -100 to +100."""
+        if self.total_weight > 0:
+            return self.weighted_score / self.total_weight * 100
+        return 0.0
+
+    @property
+    def negative_phrases(self) -> List[Dict]:
+        """Negative phrases, HIGH urgency first."""
+        return [phrase for bucket in self.phrases_by_urgency for phrase in bucket]
+
+    def to_dict(self) -> Dict:
+        """Serialize the state to a JSON-compatible dictionary."""
+        return {
+            "version": STATE_VERSION,
+            "total": self.total,
+            "weighted_score": self.weighted_score,
+            "total_weight": self.total_weight,
+            "product_mentions": self.product_mentions,
+            "strategic_highlights": self.strategic_highlights,
+            "positive_tweets": self.positive_tweets,
+            "negative_tweets": self.negative_tweets,
+            "theme_counts": self.theme_counts,
+            "best_examples": self.best_examples,
+            "negative_theme_urgency": self.negative_theme_urgency,
+            "phrases_by_urgency": self.phrases_by_urgency,
+            "urls": sorted(self.urls),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "AggregateState":
+        """
+        Load a state serialized with to_dict().
+
+        Raises:
+            ValueError: If the data was written by an incompatible version
+        """
+        version = data.get("version")
+        if version != STATE_VERSION:
+            raise ValueError(f"Unsupported aggregate state version {version}")
+
+        state = cls()
+        for field in (
+            "total",
+            "weighted_score",
+            "total_weight",
+            "product_mentions",
+            "strategic_highlights",
+            "positive_tweets",
+            "negative_tweets",
+            "theme_counts",
+            "best_examples",
+            "negative_theme_urgency",
+            "phrases_by_urgency",
+        ):
+            setattr(state, field, data[field])
+        state.urls = set(data["urls"])
+        return state
+
+    def save(self, state_file: str) -> None:
+        """
+        Save the state as JSON, e.g. as an hourly partial.
+
+        Args:
+            state_file: Output path
+        """
+        path = Path(state_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, state_file: str) -> "AggregateState":
+        """
+        Load a state saved with save().
+
+        Args:
+            state_file: Path to the state file
+
+        Returns:
+            AggregateState
+        """
+        with open(state_file, "r") as f:
+            return cls.from_dict(json.load(f))
+
+
+def merge(a: AggregateState, b: AggregateState) -> AggregateState:
+    """
+    Combine two states as if b's tweets had been added after a's.
+
+    Counts and score sums add up, tweet and phrase lists concatenate, and
+    theme examples are re-selected from both sides' bounded heaps (b's
+    positions shifted past a's), so merging touches no more than the
+    states themselves. Merging is
+    associative (not commutative: a's tweets come first), and neither
+    input is modified.
+
+    Args:
+        a: Earlier state
+        b: Later state
+
+    Returns:
+        New merged AggregateState
+    """
+    merged = AggregateState()
+    merged.total = a.total + b.total
+    merged.weighted_score = a.weighted_score + b.weighted_score
+    merged.total_weight = a.total_weight + b.total_weight
+    merged.product_mentions = _add_counts(a.product_mentions, b.product_mentions)
+    merged.strategic_highlights = _add_counts(
+        a.strategic_highlights, b.strategic_highlights
+    )
+    merged.positive_tweets = a.positive_tweets + b.positive_tweets
+    merged.negative_tweets = a.negative_tweets + b.negative_tweets
+
+    for side in SIDES:
+        merged.theme_counts[side] = _add_counts(
+            a.theme_counts[side], b.theme_counts[side]
+        )
+        for theme in merged.theme_counts[side]:
+            entries = list(a.best_examples[side].get(theme, []))
+            entries += [
+                [is_influencer, engagement, position - a.total, row]
+                for is_influencer, engagement, position, row in b.best_examples[
+                    side
+                ].get(theme, [])
+            ]
+            heap = heapq.nlargest(EXAMPLES_PER_THEME, entries)
+            heapq.heapify(heap)
+            merged.best_examples[side][theme] = heap
+
+    merged.negative_theme_urgency = dict(a.negative_theme_urgency)
+    for theme, urgency in b.negative_theme_urgency.items():
+        current = merged.negative_theme_urgency.get(theme, "LOW")
+        if URGENCY_ORDER[urgency] < URGENCY_ORDER[current]:
+            merged.negative_theme_urgency[theme] = urgency
+
+    merged.phrases_by_urgency = [
+        first + second
+        for first, second in zip(a.phrases_by_urgency, b.phrases_by_urgency)
+    ]
+    merged.urls = a.urls | b.urls
+    return merged
+
+
+def _add_counts(a: Dict[str, int], b: Dict[str, int]) -> Dict[str, int]:
+    """Sum two count dictionaries, keeping a's key order then b's new keys."""
+    counts = dict(a)
+    for key, count in b.items():
+        counts[key] = counts.get(key, 0) + count
+    return counts
+
+
 class SentimentAggregator:
     """Aggregates sentiment analysis results and generates comprehensive reports."""
 
-    def __init__(self):
-        """Initialize sentiment aggregator."""
+    def __init__(
+        self, trend_store: Optional[TrendStore] = None, trend_window_days: float = 7
+    ):
+        """
+        Initialize sentiment aggregator.
+
+        Args:
+            trend_store: Optional store of earlier runs; the report trend
+                compares the score with their average (STABLE without it)
+            trend_window_days: Days of earlier runs the trend compares with
+        """
+        self.trend_store = trend_store
+        self.trend_window_days = trend_window_days
         self.reports_dir = Path("logs")
         self.reports_dir.mkdir(parents=True, exist_ok=True)
+        # Running state for update()/snapshot(); aggregate() does not use it
+        self.state = AggregateState()
         logger.info("SentimentAggregator initialized")
 
+    def update(self, analyzed_tweet: Dict) -> None:
+        """
+        Add one analyzed tweet to the running report.
+
+        Each update changes a fixed number of counters, theme groups and
+        example rankings, so a long-running monitor can keep a report
+        current without re-aggregating everything it has seen.
+
+        Args:
+            analyzed_tweet: Analyzed tweet dictionary from SentimentAnalyzer
+        """
+        self.state.add(analyzed_tweet)
+
+    def snapshot(self) -> Dict:
+        """
+        Build the report for every tweet passed to update() so far.
+
+        The state is left untouched, so updates can continue afterwards.
+
+        Returns:
+            Same report dictionary aggregate() returns for those tweets
+        """
+        if not self.state.total:
+            return self._generate_empty_report()
+        return self._build_report(self.state, time.time())
+
+    def reset(self) -> None:
+        """Discard the running state, e.g. at the start of a new period."""
+        self.state = AggregateState()
+
+    def report_from_states(self, states: Iterable[AggregateState]) -> Dict:
+        """
+        Build one report from partial states, e.g. a day's hourly partials.
+
+        Only the states are merged, so no tweet is re-aggregated.
+
+        Args:
+            states: Partial states in chronological order
+
+        Returns:
+            Same report dictionary aggregate() returns for all their tweets
+        """
+        start_time = time.time()
+        state = reduce(merge, states, AggregateState())
+        if not state.total:
+            return self._generate_empty_report()
+        return self._build_report(state, start_time)
+
     def aggregate(self, analyzed_tweets: List[Dict]) -> Dict:
         """
         Aggregate analyzed tweets and generate comprehensive report.
@@ -96,14 +527,120 @@ class SentimentAggregator:
             logger.warning("No tweets to analyze")
             return self._generate_empty_report()
 
+        # Fill every counter, group and phrase list in a single pass
+        state = AggregateState()
+        for tweet in analyzed_tweets:
+            state.add(tweet)
+
+        return self._build_report(state, start_time)
+
+    def aggregate_windows(
+        self,
+        analyzed_tweets: List[Dict],
+        window_hours: Iterable[float],
+        now: Optional[datetime] = None,
+    ) -> Dict[float, Dict]:
+        """
+        Generate reports for several trailing windows from one set of tweets.
+
+        Tweets are sorted by created_at once; bisecting that index at each
+        window start splits them into disjoint segments (e.g. last hour,
+        1-24h ago, older), each folded once in fetch order. A window's
+        report merges its segments, newest first, so every tweet is added
+        once however many windows there are. The widest window holds every
+        tweet (the fetch window), including tweets without a parseable
+        created_at, and its report is the one aggregate() gives: when the
+        list is not newest first (e.g. cached tweets come back first), its
+        segments would merge out of fetch order, so it is folded straight
+        from the list instead.
+
+        Args:
+            analyzed_tweets: Analyzed tweets fetched for the widest window
+            window_hours: Window lengths in hours, e.g. [1, 24, 168]
+            now: End of every window (default: current UTC time)
+
+        Returns:
+            Dictionary mapping each window length to its report
+        """
+        start_time = time.time()
+        now = now or datetime.utcnow()
+        hours = sorted(set(window_hours))
+        if not hours:
+            return {}
+
+        # Shared index: (created_at, position) sorted by creation time
+        index = []
+        undated = []
+        for position, tweet in enumerate(analyzed_tweets):
+            created = parse_created_at(
+                tweet.get("original_tweet", {}).get("created_at", "")
+            )
+            if created is None:
+                undated.append(position)
+            else:
+                index.append((created, position))
+        index.sort()
+        created_times = [created for created, _ in index]
+
+        # Segment positions in fetch order, newest segment first; the last
+        # one runs back to the oldest tweet and holds the undated ones
+        segments = []
+        end = len(index)
+        for window in hours[:-1]:
+            start = bisect_left(created_times, now - timedelta(hours=window))
+            start = min(start, end)
+            segments.append(sorted(position for _, position in index[start:end]))
+            end = start
+        segments.append(sorted(undated + [position for _, position in index[:end]]))
+
+        filled = [segment for segment in segments if segment]
+        in_fetch_order = all(
+            newer[-1] < older[0] for newer, older in zip(filled, filled[1:])
+        )
+
+        reports = {}
+        state = AggregateState()
+        for window, segment in zip(hours, segments):
+            if window == hours[-1] and not in_fetch_order:
+                state = AggregateState.from_tweets(analyzed_tweets)
+            else:
+                state = merge(
+                    state,
+                    AggregateState.from_tweets(
+                        [analyzed_tweets[position] for position in segment]
+                    ),
+                )
+            if state.total:
+                report = self._build_report(state, start_time)
+            else:
+                report = self._generate_empty_report()
+            report["metadata"]["window_hours"] = window
+            reports[window] = report
+
+        logger.info(
+            "Window reports: "
+            + ", ".join(
+                f"{window:g}h={report['raw_data']['summary']['total_tweets']}"
+                for window, report in reports.items()
+            )
+        )
+        return reports
+
+    def _build_report(self, state: AggregateState, start_time: float) -> Dict:
+        """
+        Build the report sections from aggregate state.
+
+        Args:
+            state: State filled with the analyzed tweets
+            start_time: time.time() when aggregation started
+
+        Returns:
+            Dictionary with message_1, message_2, raw_data, and metadata
+        """
         # Calculate summary statistics
-        total_tweets = len(analyzed_tweets)
-        positive_tweets = [
-            t for t in analyzed_tweets if t["analysis"]["sentiment"] != "NEGATIVE"
-        ]
-        negative_tweets = [
-            t for t in analyzed_tweets if t["analysis"]["sentiment"] == "NEGATIVE"
-        ]
+        total_tweets = state.total
+        positive_tweets = state.positive_tweets
+        negative_tweets = state.negative_tweets
 
         positive_count = len(positive_tweets)
         negative_count = len(negative_tweets)
@@ -122,28 +659,26 @@ class SentimentAggregator:
                 f"Tweet count mismatch! Positive: {positive_count}, Negative: {negative_count}, Total: {total_tweets}"
             )
 
-        # Calculate sentiment score
-        sentiment_score = self._calculate_sentiment_score(analyzed_tweets)
+        sentiment_score = state.sentiment_score
 
         # Determine trend (compare with historical if available)
-        trend = self._determine_trend(sentiment_score, [])
-
-        # Count product mentions
-        product_mentions = self._count_product_mentions(analyzed_tweets)
+        historical_scores = (
+            self.trend_store.values("sentiment_score", self.trend_window_days)
+            if self.trend_store
+            else []
+        )
+        trend = self._determine_trend(sentiment_score, historical_scores)
 
-        # Group by themes
-        positive_theme_groups = self._group_by_themes(positive_tweets)
-        negative_theme_groups = self._group_by_themes(negative_tweets)
+        product_mentions = dict(state.product_mentions)
+        positive_examples = state.theme_examples("positive")
+        negative_examples = state.theme_examples("negative")
 
         # Get top themes
-        top_positive_themes = self._get_top_themes(positive_theme_groups, n=5)
-        top_negative_themes = self._get_top_themes(negative_theme_groups, n=5)
-
-        # Count strategic categories
-        strategic_highlights = self._count_strategic_categories(analyzed_tweets)
+        top_positive_themes = self._get_top_themes(state.theme_counts["positive"], n=5)
+        top_negative_themes = self._get_top_themes(state.theme_counts["negative"], n=5)
 
-        # Extract negative phrases
-        negative_phrases = self._extract_negative_phrases(negative_tweets)
+        strategic_highlights = dict(state.strategic_highlights)
+        negative_phrases = state.negative_phrases
 
         # Log strategic alerts
         if (
@@ -175,8 +710,8 @@ class SentimentAggregator:
             positive_tweets,
             negative_tweets,
             negative_phrases,
-            positive_theme_groups,
-            negative_theme_groups,
+            positive_examples,
+            negative_examples,
         )
 
         # Build raw data structure
@@ -196,15 +731,11 @@ class SentimentAggregator:
                     "theme": theme,
                     "count": count,
                     "description": self._format_theme_description(
-                        theme, positive_theme_groups[theme]
+                        theme, positive_examples[theme]
                     ),
                     "example_tweets": [
-                        {
-                            "url": t["original_tweet"]["url"],
-                            "username": t["original_tweet"]["author_username"],
-                            "text": t["original_tweet"]["text"],
-                        }
-                        for t in positive_theme_groups[theme][:3]
+                        {"url": t["url"], "username": t["username"], "text": t["text"]}
+                        for t in positive_examples[theme]
                     ],
                 }
                 for theme, count in top_positive_themes
@@ -214,18 +745,18 @@ class SentimentAggregator:
                     "theme": theme,
                     "count": count,
                     "description": self._format_theme_description(
-                        theme, negative_theme_groups[theme]
+                        theme, negative_examples[theme]
                     ),
                     "example_tweets": [
                         {
-                            "url": t["original_tweet"]["url"],
-                            "username": t["original_tweet"]["author_username"],
-                            "text": t["original_tweet"]["text"],
-                            "urgency": t["analysis"].get("urgency", "LOW"),
+                            "url": t["url"],
+                            "username": t["username"],
+                            "text": t["text"],
+                            "urgency": t["urgency"],
                         }
-                        for t in negative_theme_groups[theme][:3]
+                        for t in negative_examples[theme]
                     ],
-                    "urgency": self._get_theme_urgency(negative_theme_groups[theme]),
+                    "urgency": state.negative_theme_urgency.get(theme, "LOW"),
                 }
                 for theme, count in top_negative_themes
             ],
@@ -233,22 +764,20 @@ class SentimentAggregator:
             "negative_phrase_analysis": negative_phrases,
             "all_positive_tweets": [
                 {
-                    "url": t["original_tweet"]["url"],
-                    "username": t["original_tweet"]["author_username"],
-                    "text": t["original_tweet"]["text"],
-                    "engagement": t["original_tweet"]
-                    .get("engagement", {})
-                    .get("total", 0),
+                    "url": t["url"],
+                    "username": t["username"],
+                    "text": t["text"],
+                    "engagement": t["engagement"],
                 }
                 for t in positive_tweets
             ],
             "all_negative_tweets": [
                 {
-                    "url": t["original_tweet"]["url"],
-                    "username": t["original_tweet"]["author_username"],
-                    "text": t["original_tweet"]["text"],
-                    "themes": t["analysis"].get("themes", []),
-                    "urgency": t["analysis"].get("urgency", "LOW"),
+                    "url": t["url"],
+                    "username": t["username"],
+                    "text": t["text"],
+                    "themes": t["themes"],
+                    "urgency": t["urgency"],
                 }
                 for t in negative_tweets
             ],
@@ -262,6 +791,7 @@ class SentimentAggregator:
             "analysis_duration": round(duration, 2),
             "tweets_analyzed": total_tweets,
             "cache_hits": 0,  # This would be passed from analyzer
+            "cache_hit_rate": 0.0,  # This would be passed from analyzer
             "total_api_cost": 0.0,  # This would be passed from analyzer
         }
 
@@ -273,7 +803,7 @@ class SentimentAggregator:
             "metadata": metadata,
         }
 
-        if self._validate_report(report, analyzed_tweets):
+        if self._validate_report(report, state.urls):
             logger.info("✓ Report validation passed - all tweets accounted for")
         else:
             logger.warning("⚠️ Report validation found issues")
@@ -313,8 +843,8 @@ Overall Sentiment Score: {score:.0f}/100 {trend_emoji}"""
         positive_tweets: List,
         negative_tweets: List,
         negative_phrases: List,
-        positive_groups: Dict,
-        negative_groups: Dict,
+        positive_examples: Dict,
+        negative_examples: Dict,
     ) -> str:
         """Generate detailed analysis message (Message 2)."""
         sections = []
@@ -343,9 +873,11 @@ Overall Sentiment Score: {score:.0f}/100 {trend_emoji}"""
         if top_positive:
             for theme, count in top_positive:
                 description = self._format_theme_description(
-                    theme, positive_groups.get(theme, [])
+                    theme, positive_examples.get(theme, [])
+                )
+                examples = self._get_example_tweets(
+                    positive_examples.get(theme, []), n=3
                 )
-                examples = self._get_example_tweets(positive_groups.get(theme, []), n=3)
                 sections.append(f"• {description} (e.g., {examples})")
         else:
             sections.append("No significant positive sentiments this period.")
@@ -356,9 +888,11 @@ Overall Sentiment Score: {score:.0f}/100 {trend_emoji}"""
         if top_negative:
             for theme, count in top_negative:
                 description = self._format_theme_description(
-                    theme, negative_groups.get(theme, [])
+                    theme, negative_examples.get(theme, [])
+                )
+                examples = self._get_example_tweets(
+                    negative_examples.get(theme, []), n=3
                 )
-                examples = self._get_example_tweets(negative_groups.get(theme, []), n=3)
                 sections.append(f"• {description} (e.g., {examples})")
         else:
             sections.append("No significant negative sentiments this period.")
@@ -390,17 +924,13 @@ Overall Sentiment Score: {score:.0f}/100 {trend_emoji}"""
         sections.append("")
         sections.append(f"✅ Positive tweets (Total: {len(positive_tweets)})")
         for tweet in positive_tweets:
-            url = tweet["original_tweet"]["url"]
-            username = tweet["original_tweet"]["author_username"]
-            sections.append(f"• <{url}|@{username}>")
+            sections.append(f"• <{tweet['url']}|@{tweet['username']}>")
         sections.append("")
 
         sections.append(f"⚠️ Negative tweets (Total: {len(negative_tweets)})")
         if negative_tweets:
             for tweet in negative_tweets:
-                url = tweet["original_tweet"]["url"]
-                username = tweet["original_tweet"]["author_username"]
-                sections.append(f"• <{url}|@{username}>")
+                sections.append(f"• <{tweet['url']}|@{tweet['username']}>")
         else:
             sections.append("None")
         sections.append("")
@@ -423,83 +953,21 @@ Overall Sentiment Score: {score:.0f}/100 {trend_emoji}"""
 
         return "\n".join(sections)
 
-    def _calculate_sentiment_score(self, tweets: List[Dict]) -> float:
-        """
-        Calculate weighted sentiment score.
-
-        Args:
-            tweets: List of analyzed tweets
-
-        Returns:
-            Sentiment score from -100 to +100
-        """
-        if not tweets:
-            return 0.0
-
-        total_weighted_score = 0.0
-        total_weight = 0.0
-
-        for tweet in tweets:
-            sentiment = tweet["analysis"]["sentiment"]
-            confidence = tweet["analysis"]["confidence"] / 100.0  # Normalize to 0-1
-
-            # Assign base score
-            if sentiment == "POSITIVE":
-                base_score = 1.0
-            elif sentiment == "NEGATIVE":
-                base_score = -1.0
-            else:  # NEUTRAL or MIXED
-                base_score = 0.0
-
-            # Weight by confidence
-            weighted_score = base_score * confidence
-            total_weighted_score += weighted_score
-            total_weight += confidence
-
-        # Calculate average and scale to -100 to +100
-        if total_weight > 0:
-            avg_score = total_weighted_score / total_weight
-            return avg_score * 100
-        return 0.0
-
-    def _group_by_themes(self, tweets: List[Dict]) -> Dict[str, List[Dict]]:
-        """
-        Group tweets by themes.
-
-        Args:
-            tweets: List of analyzed tweets
-
-        Returns:
-            Dictionary mapping theme to list of tweets
-        """
-        groups = {}
-
-        for tweet in tweets:
-            themes = tweet["analysis"].get("themes", [])
-            if not themes:
-                themes = ["general"]  # Default theme
-
-            for theme in themes:
-                if theme not in groups:
-                    groups[theme] = []
-                groups[theme].append(tweet)
-
-        return groups
-
-    def _get_top_themes(self, theme_groups: Dict, n: int = 5) -> List[Tuple[str, int]]:
+    def _get_top_themes(
+        self, theme_counts: Dict[str, int], n: int = 5
+    ) -> List[Tuple[str, int]]:
         """
         Get top N themes by tweet count.
 
         Args:
-            theme_groups: Dictionary mapping theme to tweets
+            theme_counts: Dictionary mapping theme to tweet count
             n: Number of top themes to return
 
         Returns:
             List of (theme, count) tuples sorted by count
         """
-        theme_counts = [(theme, len(tweets)) for theme, tweets in theme_groups.items()]
-        theme_counts.sort(key=lambda x: x[1], reverse=True)
-        return theme_counts[:n]
+        # Same result as a stable sort by count, without sorting every theme
+        return heapq.nlargest(n, theme_counts.items(), key=lambda x: x[1])
 
     def _format_theme_description(self, theme: str, tweets: List[Dict]) -> str:
         """
@@ -519,182 +987,20 @@ Overall Sentiment Score: {score:.0f}/100 {trend_emoji}"""
         # Fallback: Capitalize and humanize
         return theme.replace("_", " ").title()
 
-    def _get_example_tweets(self, tweets: List[Dict], n: int = 3) -> str:
+    def _get_example_tweets(self, examples: List[Dict], n: int = 3) -> str:
         """
         Get formatted example tweet URLs.
 
         Args:
-            tweets: List of tweets
+            examples: Example tweet rows, best first (influencers, then
+                engagement; see AggregateState)
             n: Number of examples to include
 
         Returns:
             Formatted string with Slack-style links
         """
-        # Sort by engagement or influencer status
-        sorted_tweets = sorted(
-            tweets,
-            key=lambda t: (
-                t["analysis"].get("is_influencer", False),
-                t["original_tweet"].get("engagement", {}).get("total", 0),
-            ),
-            reverse=True,
-        )
-
-        examples = []
-        for tweet in sorted_tweets[:n]:
-            url = tweet["original_tweet"]["url"]
-            username = tweet["original_tweet"]["author_username"]
-            examples.append(f"<{url}|@{username}>")
-
-        return " ".join(examples) if examples else "No examples available"
-
-    def _count_product_mentions(self, tweets: List[Dict]) -> Dict[str, int]:
-        """
-        Count occurrences of each product mention.
-
-        Args:
-            tweets: List of analyzed tweets
-
-        Returns:
-            Dictionary mapping product to count
-        """
-        counts = {
-            "nansen_mobile": 0,
-            "season2_rewards": 0,
-            "nansen_trading": 0,
-            "ai_insights": 0,
-            "nansen_points": 0,
-        }
-
-        for tweet in tweets:
-            products = tweet["analysis"].get("product_mentions", [])
-            for product in products:
-                if product in counts:
-                    counts[product] += 1
-
-        return counts
-
-    def _count_strategic_categories(self, tweets: List[Dict]) -> Dict[str, int]:
-        """
-        Count tweets by strategic category.
-
-        Args:
-            tweets: List of analyzed tweets
-
-        Returns:
-            Dictionary with strategic category counts
-        """
-        counts = {
-            "strategic_wins": 0,
-            "adoption_signals": 0,
-            "critical_fud": 0,
-            "affiliate_violations": 0,
-            "influencer_mentions": 0,
-        }
-
-        for tweet in tweets:
-            category = tweet["analysis"].get("strategic_category", "")
-
-            if category == "STRATEGIC_WIN":
-                counts["strategic_wins"] += 1
-            elif category == "ADOPTION_SIGNAL":
-                counts["adoption_signals"] += 1
-            elif category == "CRITICAL_FUD":
-                counts["critical_fud"] += 1
-            elif category == "AFFILIATE_VIOLATION":
-                counts["affiliate_violations"] += 1
-
-            # Count influencers separately
-            if tweet["analysis"].get("is_influencer", False):
-                counts["influencer_mentions"] += 1
-
-        return counts
-
-    def _extract_negative_phrases(self, tweets: List[Dict]) -> List[Dict]:
-        """
-        Extract negative phrases for detailed analysis.
-
-        Args:
-            tweets: List of negative tweets
-
-        Returns:
-            List of dictionaries with phrase, username, theme, URL
-        """
-        phrases = []
-
-        for tweet in tweets:
-            critical_keywords = tweet["analysis"].get("critical_keywords", [])
-            negative_patterns = tweet["analysis"].get("negative_patterns", [])
-            themes = tweet["analysis"].get("themes", [])
-
-            # Get primary theme for categorization
-            primary_theme = themes[0] if themes else "unknown"
-            category = self._map_theme_to_category(primary_theme, negative_patterns)
-
-            # Extract from critical keywords
-            for keyword in critical_keywords:
-                phrases.append(
-                    {
-                        "phrase": keyword,
-                        "username": tweet["original_tweet"]["author_username"],
-                        "theme": primary_theme,
-                        "category": category,
-                        "url": tweet["original_tweet"]["url"],
-                        "urgency": tweet["analysis"].get("urgency", "LOW"),
-                    }
-                )
-
-        # Sort by urgency (HIGH first)
-        urgency_order = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
-        phrases.sort(key=lambda x: urgency_order.get(x["urgency"], 3))
-
-        return phrases
-
-    def _map_theme_to_category(self, theme: str, patterns: List[str]) -> str:
-        """
-        Map theme to category label for negative phrase analysis.
-
-        Args:
-            theme: Theme name
-            patterns: List of negative patterns
-
-        Returns:
-            Category label like [AIRDROP], [SCAM], etc.
-        """
-        # Check patterns first (more specific)
-        for pattern in patterns:
-            if pattern in THEME_CATEGORY_MAPPING:
-                return THEME_CATEGORY_MAPPING[pattern]
-
-        # Fall back to theme mapping
-        if theme in THEME_CATEGORY_MAPPING:
-            return THEME_CATEGORY_MAPPING[theme]
-
-        return "[GENERAL]"
-
-    def _get_theme_urgency(self, tweets: List[Dict]) -> str:
-        """
-        Determine overall urgency level for a theme.
-
-        Args:
-            tweets: List of tweets with this theme
-
-        Returns:
-            Urgency level: HIGH, MEDIUM, or LOW
-        """
-        urgency_counts = {"HIGH": 0, "MEDIUM": 0, "LOW": 0}
-
-        for tweet in tweets:
-            urgency = tweet["analysis"].get("urgency", "LOW")
-            if urgency in urgency_counts:
-                urgency_counts[urgency] += 1
-
-        # Return highest urgency level found
-        if urgency_counts["HIGH"] > 0:
-            return "HIGH"
-        elif urgency_counts["MEDIUM"] > 0:
-            return "MEDIUM"
-        return "LOW"
+        links = [f"<{t['url']}|@{t['username']}>" for t in examples[:n]]
+        return " ".join(links) if links else "No examples available"
 
     def _determine_trend(
         self, current_score: float, historical_scores: List[float]
@@ -741,13 +1047,13 @@ Overall Sentiment Score: {score:.0f}/100 {trend_emoji}"""
             return False
         return True
 
-    def _validate_report(self, report: Dict, tweets: List[Dict]) -> bool:
+    def _validate_report(self, report: Dict, original_urls: Set[str]) -> bool:
         """
         Validate report completeness and accuracy.
 
         Args:
             report: Generated report dictionary
-            tweets: Original analyzed tweets
+            original_urls: URLs of the original analyzed tweets
 
         Returns:
             True if validation passes
@@ -768,8 +1074,6 @@ Overall Sentiment Score: {score:.0f}/100 {trend_emoji}"""
             negative_urls = {t["url"] for t in raw_data["all_negative_tweets"]}
             all_urls = positive_urls | negative_urls
 
-            original_urls = {t["original_tweet"]["url"] for t in tweets}
-
             if len(all_urls) != len(original_urls):
                 logger.warning(
                     f"URL count mismatch: {len(all_urls)} in report, "
@@ -820,6 +1124,7 @@ Overall Sentiment Score: {score:.0f}/100 {trend_emoji}"""
                 "analysis_duration": 0.0,
                 "tweets_analyzed": 0,
                 "cache_hits": 0,
+                "cache_hit_rate": 0.0,
                 "total_api_cost": 0.0,
             },
         }
@@ -0,0 +1,284 @@
+"""Columnar (NumPy) representation of analyzed tweets for large aggregations."""
+
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from aggregator import (
+    SENTIMENT_BASE_SCORES,
+    STRATEGIC_CATEGORY_COUNTERS,
+    TRACKED_PRODUCTS,
+    URGENCY_ORDER,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Known labels get fixed codes; unseen labels are appended after them
+SENTIMENT_LABELS = ["POSITIVE", "NEGATIVE", "NEUTRAL", "MIXED"]
+CATEGORY_LABELS = list(STRATEGIC_CATEGORY_COUNTERS) + [
+    "ROUTINE_NEGATIVE",
+    "NEUTRAL_MENTION",
+]
+URGENCY_LABELS = list(URGENCY_ORDER)
+
+NEGATIVE_CODE = SENTIMENT_LABELS.index("NEGATIVE")
+
+
+class _Vocabulary:
+    """Assigns consecutive integer codes to labels."""
+
+    def __init__(self, labels: Iterable[str] = ()):
+        self.labels: List[str] = []
+        self.codes: Dict[str, int] = {}
+        for label in labels:
+            self.code(label)
+
+    def code(self, label: str) -> int:
+        """Code for a label, assigning the next one if it is new."""
+        code = self.codes.get(label)
+        if code is None:
+            code = self.codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+
+class AnalysisTable:
+    """
+    Analyzed tweets stored as columns instead of a list of dictionaries.
+
+    Sentiment, strategic category and urgency are int-coded arrays,
+    confidence and engagement numeric arrays, and the multi-label product
+    and theme lists CSR-style indexes (a flat array of label codes plus
+    row offsets). Counts and the sentiment score are vectorized reductions
+    that match SentimentAggregator's dict-based results, so multi-week
+    aggregations over hundreds of thousands of tweets avoid per-dict loops.
+    """
+
+    def __init__(
+        self,
+        tweet_ids: List[str],
+        sentiment: np.ndarray,
+        category: np.ndarray,
+        urgency: np.ndarray,
+        confidence: np.ndarray,
+        engagement: np.ndarray,
+        is_influencer: np.ndarray,
+        products: Tuple[np.ndarray, np.ndarray],
+        themes: Tuple[np.ndarray, np.ndarray],
+        sentiment_labels: List[str],
+        category_labels: List[str],
+        urgency_labels: List[str],
+        product_labels: List[str],
+        theme_labels: List[str],
+    ):
+        """
+        Initialize table from prepared columns (see from_tweets()).
+
+        Args:
+            tweet_ids: Tweet ID per row
+            sentiment: Sentiment code per row
+            category: Strategic category code per row
+            urgency: Urgency code per row
+            confidence: Confidence (0-100) per row
+            engagement: Total engagement per row
+            is_influencer: Influencer flag per row
+            products: (offsets, product codes) CSR index
+            themes: (offsets, theme codes) CSR index
+            sentiment_labels: Label per sentiment code
+            category_labels: Label per category code
+            urgency_labels: Label per urgency code
+            product_labels: Label per product code
+            theme_labels: Label per theme code
+        """
+        self.tweet_ids = tweet_ids
+        self.sentiment = sentiment
+        self.category = category
+        self.urgency = urgency
+        self.confidence = confidence
+        self.engagement = engagement
+        self.is_influencer = is_influencer
+        self.product_offsets, self.product_codes = products
+        self.theme_offsets, self.theme_codes = themes
+        self.sentiment_labels = sentiment_labels
+        self.category_labels = category_labels
+        self.urgency_labels = urgency_labels
+        self.product_labels = product_labels
+        self.theme_labels = theme_labels
+
+    @classmethod
+    def from_tweets(cls, analyzed_tweets: List[Dict]) -> "AnalysisTable":
+        """
+        Build a table from analyzed tweet dictionaries.
+
+        Args:
+            analyzed_tweets: Analyzed tweets from SentimentAnalyzer
+
+        Returns:
+            AnalysisTable with one row per tweet
+        """
+        sentiments = _Vocabulary(SENTIMENT_LABELS)
+        categories = _Vocabulary(CATEGORY_LABELS)
+        urgencies = _Vocabulary(URGENCY_LABELS)
+        products = _Vocabulary(TRACKED_PRODUCTS)
+        themes = _Vocabulary()
+
+        # Columns are collected as lists and converted once at the end
+        sentiment, category, urgency = [], [], []
+        confidence, engagement, is_influencer = [], [], []
+        product_codes: List[int] = []
+        theme_codes: List[int] = []
+        product_offsets, theme_offsets = [0], [0]
+        tweet_ids = []
+
+        for tweet in analyzed_tweets:
+            analysis = tweet["analysis"]
+            original = tweet.get("original_tweet", {})
+            tweet_ids.append(tweet.get("tweet_id") or original.get("tweet_id"))
+            sentiment.append(sentiments.code(analysis["sentiment"]))
+            category.append(categories.code(analysis.get("strategic_category", "")))
+            urgency.append(urgencies.code(analysis.get("urgency", "LOW")))
+            confidence.append(analysis["confidence"])
+            engagement.append(original.get("engagement", {}).get("total", 0) or 0)
+            is_influencer.append(bool(analysis.get("is_influencer", False)))
+
+            for product in analysis.get("product_mentions", []):
+                product_codes.append(products.code(product))
+            # Tweets without themes are grouped under "general", as in reports
+            for theme in analysis.get("themes", []) or ["general"]:
+                theme_codes.append(themes.code(theme))
+            product_offsets.append(len(product_codes))
+            theme_offsets.append(len(theme_codes))
+
+        return cls(
+            tweet_ids,
+            np.array(sentiment, dtype=np.int16),
+            np.array(category, dtype=np.int16),
+            np.array(urgency, dtype=np.int16),
+            np.array(confidence, dtype=np.float64),
+            np.array(engagement, dtype=np.int64),
+            np.array(is_influencer, dtype=bool),
+            (
+                np.array(product_offsets, dtype=np.int64),
+                np.array(product_codes, dtype=np.int32),
+            ),
+            (
+                np.array(theme_offsets, dtype=np.int64),
+                np.array(theme_codes, dtype=np.int32),
+            ),
+            sentiments.labels,
+            categories.labels,
+            urgencies.labels,
+            products.labels,
+            themes.labels,
+        )
+
+    @classmethod
+    def from_files(cls, analyzed_files: Iterable[str]) -> "AnalysisTable":
+        """
+        Build a table from tweets_analyzed_*.json files.
+
+        A tweet found in several files (e.g. a cache hit in consecutive
+        runs) is counted once, with its latest analysis.
+
+        Args:
+            analyzed_files: Paths in chronological order
+
+        Returns:
+            AnalysisTable with one row per distinct tweet
+        """
+        by_id: Dict[str, Dict] = {}
+        for analyzed_file in analyzed_files:
+            try:
+                with open(analyzed_file, "r") as f:
+                    for tweet in json.load(f):
+                        by_id[tweet["tweet_id"]] = tweet
+            except Exception as e:
+                logger.warning(f"Skipping {analyzed_file}: {e}")
+        return cls.from_tweets(list(by_id.values()))
+
+    def __len__(self) -> int:
+        return len(self.tweet_ids)
+
+    @property
+    def negative(self) -> np.ndarray:
+        """Boolean mask of NEGATIVE rows (everything else counts as positive)."""
+        return self.sentiment == NEGATIVE_CODE
+
+    def sentiment_score(self, rows: Optional[np.ndarray] = None) -> float:
+        """
+        Confidence-weighted sentiment score from -100 to +100.
+
+        Args:
+            rows: Optional boolean mask or index array selecting rows
+
+        Returns:
+            Score matching AggregateState.sentiment_score (up to
+            floating-point summation order)
+        """
+        base_scores = np.array(
+            [SENTIMENT_BASE_SCORES.get(label, 0.0) for label in self.sentiment_labels]
+        )
+        sentiment = self.sentiment if rows is None else self.sentiment[rows]
+        weights = (self.confidence if rows is None else self.confidence[rows]) / 100.0
+
+        total_weight = weights.sum()
+        if total_weight > 0:
+            return float(np.dot(base_scores[sentiment], weights) / total_weight * 100)
+        return 0.0
+
+    def summary(self) -> Dict:
+        """Counts, shares and score as in report raw_data["summary"] (no trend)."""
+        total = len(self)
+        negative_count = int(self.negative.sum())
+        positive_count = total - negative_count
+        return {
+            "total_tweets": total,
+            "positive_count": positive_count,
+            "negative_count": negative_count,
+            "positive_pct": round(positive_count / total * 100, 1) if total else 0.0,
+            "negative_pct": round(negative_count / total * 100, 1) if total else 0.0,
+            "sentiment_score": round(self.sentiment_score(), 1),
+        }
+
+    def product_mentions(self) -> Dict[str, int]:
+        """Product counts, as AggregateState.product_mentions."""
+        counts = np.bincount(self.product_codes, minlength=len(self.product_labels))
+        # Tracked products hold the first codes, in TRACKED_PRODUCTS order
+        return {
+            product: int(counts[code]) for code, product in enumerate(TRACKED_PRODUCTS)
+        }
+
+    def strategic_highlights(self) -> Dict[str, int]:
+        """Category counts, as AggregateState.strategic_highlights."""
+        counts = np.bincount(self.category, minlength=len(self.category_labels))
+        highlights = {
+            counter: int(counts[CATEGORY_LABELS.index(category)])
+            for category, counter in STRATEGIC_CATEGORY_COUNTERS.items()
+        }
+        highlights["influencer_mentions"] = int(self.is_influencer.sum())
+        return highlights
+
+    def theme_counts(self, negative: bool) -> Dict[str, int]:
+        """
+        Tweets per theme for one side of the report.
+
+        Args:
+            negative: Count NEGATIVE tweets (True) or all others (False)
+
+        Returns:
+            Theme counts in first-seen order, matching
+            AggregateState.theme_counts for the same side
+        """
+        row_lengths = np.diff(self.theme_offsets)
+        selected = np.repeat(self.negative == negative, row_lengths)
+        codes = self.theme_codes[selected]
+        if not len(codes):
+            return {}
+
+        counts = np.bincount(codes, minlength=len(self.theme_labels))
+        present, first_seen = np.unique(codes, return_index=True)
+        order = present[np.argsort(first_seen, kind="stable")]
+        return {self.theme_labels[code]: int(counts[code]) for code in order}
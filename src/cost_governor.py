@@ -0,0 +1,131 @@
+"""In-run cost governor enforcing claude.cost_limits before each Claude request."""
+
+import logging
+import threading
+from typing import Dict, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class CostGovernor:
+    """
+    Tracks Claude spend for a single run and gates each batch on the budget.
+
+    Every batch reserves its estimated worst-case cost before it is sent and
+    settles the reservation with the actual cost once the response arrives.
+    Reservations and settlements happen under a lock, so concurrent dispatchers
+    can never commit more than the configured limit between them.
+    """
+
+    def __init__(
+        self, max_per_run_usd: Optional[float] = 5.0, warn_threshold_usd: float = 2.0
+    ):
+        """
+        Initialize cost governor.
+
+        Args:
+            max_per_run_usd: Hard spend limit for the run (None disables the limit)
+            warn_threshold_usd: Log a warning once committed spend reaches this
+        """
+        self.max_per_run_usd = max_per_run_usd
+        self.warn_threshold_usd = warn_threshold_usd
+        self.spent_usd = 0.0
+        self.reserved_usd = 0.0
+        self.rejected_batches = 0
+        self._warned = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "CostGovernor":
+        """
+        Build a governor from the claude.cost_limits section of config.yaml.
+
+        Args:
+            config: Full configuration dictionary
+
+        Returns:
+            Configured CostGovernor
+        """
+        limits = config.get("claude", {}).get("cost_limits", {})
+        return cls(
+            max_per_run_usd=limits.get("max_per_run_usd", 5.0),
+            warn_threshold_usd=limits.get("warn_threshold_usd", 2.0),
+        )
+
+    def limit_to(self, max_usd: Optional[float]) -> None:
+        """
+        Tighten the run limit, e.g. to what the daily/monthly budget still allows.
+
+        Args:
+            max_usd: New upper bound in USD (None leaves the limit unchanged)
+        """
+        if max_usd is None:
+            return
+
+        with self._lock:
+            if self.max_per_run_usd is None or max_usd < self.max_per_run_usd:
+                logger.info(f"Run cost limit tightened to ${max_usd:.4f}")
+                self.max_per_run_usd = max_usd
+
+    @property
+    def remaining_usd(self) -> Optional[float]:
+        """Budget left after committed spend and open reservations."""
+        if self.max_per_run_usd is None:
+            return None
+        with self._lock:
+            return max(0.0, self.max_per_run_usd - self.spent_usd - self.reserved_usd)
+
+    def reserve(self, estimated_cost: float) -> bool:
+        """
+        Reserve budget for a batch before dispatching it.
+
+        Args:
+            estimated_cost: Worst-case cost estimate for the batch in USD
+
+        Returns:
+            True if the batch fits in the budget and may be sent
+        """
+        with self._lock:
+            committed = self.spent_usd + self.reserved_usd + estimated_cost
+
+            if self.max_per_run_usd is not None and committed > self.max_per_run_usd:
+                self.rejected_batches += 1
+                logger.warning(
+                    f"💸 Cost limit reached: ${self.spent_usd:.4f} spent, "
+                    f"${self.reserved_usd:.4f} in flight, next batch needs up to "
+                    f"${estimated_cost:.4f} (limit ${self.max_per_run_usd:.2f})"
+                )
+                return False
+
+            self.reserved_usd += estimated_cost
+            self._check_warn_threshold(committed)
+            return True
+
+    def settle(self, estimated_cost: float, actual_cost: float) -> None:
+        """
+        Replace a reservation with the actual cost of the batch.
+
+        Args:
+            estimated_cost: Amount previously passed to reserve()
+            actual_cost: Cost actually incurred (0 if the request failed)
+        """
+        with self._lock:
+            self.reserved_usd = max(0.0, self.reserved_usd - estimated_cost)
+            self.spent_usd += actual_cost
+
+    def _check_warn_threshold(self, committed: float) -> None:
+        """Log a one-time warning when spend approaches the limit."""
+        if self._warned or committed < self.warn_threshold_usd:
+            return
+
+        self._warned = True
+        limit = (
+            f"${self.max_per_run_usd:.2f}"
+            if self.max_per_run_usd is not None
+            else "unlimited"
+        )
+        logger.warning(
+            f"⚠️ Claude spend approaching limit: ${committed:.4f} committed "
+            f"(warn at ${self.warn_threshold_usd:.2f}, limit {limit})"
+        )
@@ -0,0 +1,283 @@
+"""Persistent append-only ledger of Claude requests with rolling budget checks."""
+
+import json
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from utils import calculate_percentile
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Rolling budget windows
+DAILY_WINDOW = timedelta(days=1)
+MONTHLY_WINDOW = timedelta(days=30)
+
+# Percentiles reported in the ledger summary
+SUMMARY_PERCENTILES = [50, 90, 95, 99]
+
+
+class CostLedger:
+    """
+    Records every Claude request to a local JSON Lines file.
+
+    The ledger outlives the process, so spend from earlier runs (including
+    manual workflow_dispatch runs) counts towards the rolling daily and
+    monthly budgets. Entries are only ever appended.
+    """
+
+    def __init__(self, ledger_file: str = "logs/cost_ledger.jsonl"):
+        """
+        Initialize cost ledger.
+
+        Args:
+            ledger_file: Path to the JSON Lines ledger file
+        """
+        self.ledger_file = Path(ledger_file)
+        self.ledger_file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        run_id: str,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        latency_seconds: float,
+        cost_usd: float,
+        cache_creation_input_tokens: int = 0,
+        cache_read_input_tokens: int = 0,
+        status: str = "ok",
+        request_type: str = "batch",
+    ) -> Dict:
+        """
+        Append one Claude request to the ledger.
+
+        Args:
+            run_id: Identifier of the monitor run that made the request
+            model: Claude model name
+            input_tokens: Uncached input tokens billed
+            output_tokens: Output tokens billed
+            latency_seconds: Wall-clock request latency
+            cost_usd: Cost of the request in USD
+            cache_creation_input_tokens: Tokens written to the prompt cache
+            cache_read_input_tokens: Tokens read from the prompt cache
+            status: "ok" or an error label for failed requests
+            request_type: "batch", "fast_path" (single urgent tweet) or
+                "shadow" (shadow evaluation)
+
+        Returns:
+            The recorded entry
+        """
+        entry = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "run_id": run_id,
+            "model": model,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_creation_input_tokens": cache_creation_input_tokens,
+            "cache_read_input_tokens": cache_read_input_tokens,
+            "latency_seconds": round(latency_seconds, 3),
+            "cost_usd": cost_usd,
+            "status": status,
+            "request_type": request_type,
+        }
+
+        try:
+            with self._lock:
+                with open(self.ledger_file, "a") as f:
+                    f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        except Exception as e:
+            logger.error(f"Failed to write cost ledger entry: {e}")
+
+        return entry
+
+    def load_entries(self, since: Optional[datetime] = None) -> List[Dict]:
+        """
+        Load ledger entries, optionally limited to a time window.
+
+        Args:
+            since: Only return entries recorded at or after this UTC time
+
+        Returns:
+            List of entry dictionaries in append order
+        """
+        if not self.ledger_file.exists():
+            return []
+
+        cutoff = since.isoformat() if since else ""
+        entries = []
+
+        with open(self.ledger_file, "r") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupt ledger line {line_number}")
+                    continue
+                if entry.get("timestamp", "") >= cutoff:
+                    entries.append(entry)
+
+        return entries
+
+    def spend_since(self, since: datetime) -> float:
+        """
+        Sum recorded spend since a point in time.
+
+        Args:
+            since: UTC start of the window
+
+        Returns:
+            Total cost in USD
+        """
+        return sum(entry.get("cost_usd", 0.0) for entry in self.load_entries(since))
+
+    def remaining_budget(
+        self,
+        daily_limit_usd: Optional[float],
+        monthly_limit_usd: Optional[float],
+        now: Optional[datetime] = None,
+    ) -> Optional[float]:
+        """
+        Get the spend still allowed by the rolling daily and monthly caps.
+
+        Args:
+            daily_limit_usd: Cap on spend over the last 24 hours (None = no cap)
+            monthly_limit_usd: Cap on spend over the last 30 days (None = no cap)
+            now: Reference time (default: current UTC time)
+
+        Returns:
+            Remaining USD (never negative), or None if no cap is configured
+        """
+        now = now or datetime.utcnow()
+        remaining = []
+
+        if daily_limit_usd is not None:
+            remaining.append(daily_limit_usd - self.spend_since(now - DAILY_WINDOW))
+        if monthly_limit_usd is not None:
+            remaining.append(monthly_limit_usd - self.spend_since(now - MONTHLY_WINDOW))
+
+        if not remaining:
+            return None
+        return max(0.0, min(remaining))
+
+    def check_budget(
+        self,
+        daily_limit_usd: Optional[float],
+        monthly_limit_usd: Optional[float],
+        now: Optional[datetime] = None,
+    ) -> Tuple[bool, str]:
+        """
+        Check whether the rolling daily and monthly caps still allow spend.
+
+        Args:
+            daily_limit_usd: Cap on spend over the last 24 hours (None = no cap)
+            monthly_limit_usd: Cap on spend over the last 30 days (None = no cap)
+            now: Reference time (default: current UTC time)
+
+        Returns:
+            Tuple of (within_budget, reason)
+        """
+        now = now or datetime.utcnow()
+
+        if daily_limit_usd is not None:
+            daily_spend = self.spend_since(now - DAILY_WINDOW)
+            if daily_spend >= daily_limit_usd:
+                return (
+                    False,
+                    f"Daily budget exhausted: ${daily_spend:.4f} of "
+                    f"${daily_limit_usd:.2f} spent in the last 24 hours",
+                )
+
+        if monthly_limit_usd is not None:
+            monthly_spend = self.spend_since(now - MONTHLY_WINDOW)
+            if monthly_spend >= monthly_limit_usd:
+                return (
+                    False,
+                    f"Monthly budget exhausted: ${monthly_spend:.4f} of "
+                    f"${monthly_limit_usd:.2f} spent in the last 30 days",
+                )
+
+        return (True, "")
+
+    def summary(
+        self,
+        daily_limit_usd: Optional[float] = None,
+        monthly_limit_usd: Optional[float] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict:
+        """
+        Summarize spend, token usage and per-request distributions.
+
+        Covers the rolling 30-day window, with the last 24 hours broken out.
+
+        Args:
+            daily_limit_usd: Daily cap to report against
+            monthly_limit_usd: Monthly cap to report against
+            now: Reference time (default: current UTC time)
+
+        Returns:
+            Summary dictionary with daily/monthly totals, latency and cost
+            percentiles, and a per-model breakdown
+        """
+        now = now or datetime.utcnow()
+        monthly_entries = self.load_entries(now - MONTHLY_WINDOW)
+        daily_cutoff = (now - DAILY_WINDOW).isoformat()
+        daily_entries = [e for e in monthly_entries if e["timestamp"] >= daily_cutoff]
+
+        successful = [e for e in monthly_entries if e.get("status") == "ok"]
+        latencies = [e.get("latency_seconds", 0.0) for e in successful]
+        costs = [e.get("cost_usd", 0.0) for e in successful]
+
+        by_model: Dict[str, Dict] = {}
+        for entry in monthly_entries:
+            model_stats = by_model.setdefault(
+                entry.get("model", "unknown"),
+                {"requests": 0, "cost_usd": 0.0, "input_tokens": 0, "output_tokens": 0},
+            )
+            model_stats["requests"] += 1
+            model_stats["cost_usd"] += entry.get("cost_usd", 0.0)
+            model_stats["input_tokens"] += entry.get("input_tokens", 0)
+            model_stats["output_tokens"] += entry.get("output_tokens", 0)
+
+        return {
+            "daily": self._window_totals(daily_entries, daily_limit_usd),
+            "monthly": self._window_totals(monthly_entries, monthly_limit_usd),
+            "runs": len({e.get("run_id") for e in monthly_entries}),
+            "failed_requests": len(monthly_entries) - len(successful),
+            "latency_seconds": {
+                f"p{p}": round(calculate_percentile(latencies, p), 3)
+                for p in SUMMARY_PERCENTILES
+            },
+            "cost_per_request_usd": {
+                f"p{p}": round(calculate_percentile(costs, p), 6)
+                for p in SUMMARY_PERCENTILES
+            },
+            "by_model": by_model,
+        }
+
+    def _window_totals(self, entries: List[Dict], limit_usd: Optional[float]) -> Dict:
+        """Aggregate totals for one budget window."""
+        spend = sum(e.get("cost_usd", 0.0) for e in entries)
+        return {
+            "requests": len(entries),
+            "cost_usd": round(spend, 6),
+            "limit_usd": limit_usd,
+            "remaining_usd": (
+                round(max(0.0, limit_usd - spend), 6) if limit_usd is not None else None
+            ),
+            "input_tokens": sum(e.get("input_tokens", 0) for e in entries),
+            "output_tokens": sum(e.get("output_tokens", 0) for e in entries),
+            "cache_creation_input_tokens": sum(
+                e.get("cache_creation_input_tokens", 0) for e in entries
+            ),
+            "cache_read_input_tokens": sum(
+                e.get("cache_read_input_tokens", 0) for e in entries
+            ),
+        }
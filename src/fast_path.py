@@ -0,0 +1,218 @@
+"""Immediate analysis and Slack alerts for urgent tweets while the fetch runs."""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from utils import calculate_percentile
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALERT_CATEGORIES = ["CRITICAL_FUD", "AFFILIATE_VIOLATION"]
+
+
+class FastPathAlerter:
+    """
+    Analyzes urgent tweets one at a time as soon as their page is fetched.
+
+    A tweet takes the fast path when it contains an urgent keyword or its
+    author has at least influencer_followers followers. It is analyzed in a
+    dedicated single-tweet request on a background worker, and if Claude
+    rates it HIGH urgency or puts it in one of alert_categories, an alert is
+    posted through SlackNotifier straight away, before the bulk analysis
+    and the daily report. Tweets whose cached analysis will be reused as is
+    were handled by an earlier run and are skipped; cached tweets that are
+    due for re-analysis (e.g. engagement took off) still take the fast path.
+    """
+
+    def __init__(
+        self,
+        analyzer: Any,
+        notifier: Any,
+        urgent_keywords: Optional[List[str]] = None,
+        influencer_followers: int = 50000,
+        alert_categories: Optional[List[str]] = None,
+        max_tweets: int = 10,
+        max_workers: int = 2,
+        dry_run: bool = False,
+        skip_tweet: Optional[Callable[[Dict], bool]] = None,
+    ):
+        """
+        Initialize fast path alerter.
+
+        Args:
+            analyzer: SentimentAnalyzer used for single-tweet requests
+            notifier: SlackNotifier used for alerts
+            urgent_keywords: Keywords that send a tweet down the fast path
+            influencer_followers: Follower count that sends a tweet down the
+                fast path
+            alert_categories: Strategic categories that trigger an alert
+            max_tweets: Most tweets analyzed on the fast path per run
+            max_workers: Concurrent fast path requests
+            dry_run: Log alerts instead of posting them
+            skip_tweet: Predicate for tweets not to fast-path (e.g. those
+                with a current cache entry)
+        """
+        self.analyzer = analyzer
+        self.notifier = notifier
+        self.urgent_keywords = [keyword.lower() for keyword in urgent_keywords or []]
+        self.influencer_followers = influencer_followers
+        self.alert_categories = alert_categories or DEFAULT_ALERT_CATEGORIES
+        self.max_tweets = max_tweets
+        self.dry_run = dry_run
+        self.alerts: List[Dict] = []
+        self.alert_latencies: List[float] = []
+        self.skip_tweet = skip_tweet
+        self._seen: Set[str] = set()
+        self._submitted = 0
+        self._futures = []
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="fast-path"
+        )
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls, config: Dict, analyzer: Any, notifier: Any, dry_run: bool = False
+    ) -> Optional["FastPathAlerter"]:
+        """
+        Build an alerter from the monitoring.fast_path section of config.yaml.
+
+        Args:
+            config: Full configuration dictionary
+            analyzer: SentimentAnalyzer used for single-tweet requests
+            notifier: SlackNotifier used for alerts
+            dry_run: Log alerts instead of posting them
+
+        Returns:
+            Configured FastPathAlerter, or None if the fast path is disabled
+        """
+        fast_path = config.get("monitoring", {}).get("fast_path", {})
+        if not fast_path.get("enabled", False):
+            return None
+
+        sentiment = config.get("sentiment", {})
+        return cls(
+            analyzer,
+            notifier,
+            urgent_keywords=sentiment.get("urgent_keywords", []),
+            influencer_followers=sentiment.get("thresholds", {}).get(
+                "influencer_followers", 50000
+            ),
+            alert_categories=fast_path.get("alert_categories"),
+            max_tweets=fast_path.get("max_tweets_per_run", 10),
+            max_workers=fast_path.get("max_workers", 2),
+            dry_run=dry_run,
+            skip_tweet=analyzer.cache_reuse_check(),
+        )
+
+    def qualifies(self, tweet: Dict) -> bool:
+        """Whether a tweet should be analyzed on the fast path."""
+        if (tweet.get("author_followers", 0) or 0) >= self.influencer_followers:
+            return True
+        text = tweet.get("text", "").lower()
+        return any(keyword in text for keyword in self.urgent_keywords)
+
+    def should_alert(self, result: Dict) -> bool:
+        """Whether an analyzed tweet warrants an immediate alert."""
+        analysis = result.get("analysis", {})
+        return (
+            analysis.get("urgency") == "HIGH"
+            or analysis.get("strategic_category") in self.alert_categories
+        )
+
+    def submit(self, tweets: List[Dict]) -> int:
+        """
+        Queue qualifying tweets from a fetched page (search_mentions on_page).
+
+        Args:
+            tweets: Tweets from one page
+
+        Returns:
+            Number of tweets queued
+        """
+        fetched_at = time.monotonic()
+        queued = 0
+
+        for tweet in tweets:
+            tweet_id = tweet.get("tweet_id")
+            with self._lock:
+                if tweet_id in self._seen or not self.qualifies(tweet):
+                    continue
+                if self.skip_tweet and self.skip_tweet(tweet):
+                    self._seen.add(tweet_id)
+                    continue
+                if self._submitted >= self.max_tweets:
+                    logger.debug("Fast path limit reached; tweet left for the batch")
+                    continue
+                self._seen.add(tweet_id)
+                self._submitted += 1
+                self._futures.append(
+                    self._executor.submit(self._process, tweet, fetched_at)
+                )
+            queued += 1
+
+        if queued:
+            logger.info(f"⚡ Fast path: {queued} urgent tweets queued for analysis")
+        return queued
+
+    def wait(self, timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Wait for queued fast path work to finish and stop the workers.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits for all)
+
+        Returns:
+            Results that triggered an alert
+        """
+        with self._lock:
+            futures = list(self._futures)
+        done, pending = wait(futures, timeout=timeout)
+        if pending:
+            logger.warning(f"⚡ {len(pending)} fast path requests still running")
+        self._executor.shutdown(wait=False)
+        return list(self.alerts)
+
+    def summary(self) -> Dict:
+        """Counts and alert latency (seconds from page fetch to alert)."""
+        with self._lock:
+            return {
+                "tweets_analyzed": self._submitted,
+                "alerts_sent": len(self.alerts),
+                "alert_latency_seconds": {
+                    f"p{p}": round(calculate_percentile(self.alert_latencies, p), 2)
+                    for p in (50, 95)
+                },
+            }
+
+    def _process(self, tweet: Dict, fetched_at: float) -> None:
+        """Analyze one tweet and alert if it qualifies."""
+        try:
+            result = self.analyzer.analyze_urgent_tweet(tweet)
+            if result is None or not self.should_alert(result):
+                return
+
+            if self.dry_run:
+                logger.info(
+                    f"⚡ [DRY RUN] Would alert on @{tweet.get('author_username')}: "
+                    f"{result['analysis'].get('summary', '')[:80]}"
+                )
+                sent = True
+            else:
+                sent = self.notifier.send_urgent_alert(result)
+
+            if sent:
+                latency = time.monotonic() - fetched_at
+                with self._lock:
+                    self.alerts.append(result)
+                    self.alert_latencies.append(latency)
+                logger.warning(
+                    f"⚡ Urgent alert for tweet {tweet.get('tweet_id')} "
+                    f"{latency:.1f}s after fetch"
+                )
+        except Exception as e:
+            logger.error(f"Fast path failed for tweet {tweet.get('tweet_id')}: {e}")
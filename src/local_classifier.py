@@ -0,0 +1,379 @@
+"""Lightweight local sentiment classifier distilled from Claude labels."""
+
+import glob
+import json
+import logging
+import math
+import random
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from pathlib import Path
+
+from utils import remove_urls
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Labels the classifier learns from Claude's analyses
+LABEL_FIELDS = ["sentiment", "strategic_category"]
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9$#@']+")
+
+MODEL_VERSION = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split tweet text into lowercase unigram and bigram features.
+
+    Args:
+        text: Raw tweet text
+
+    Returns:
+        List of feature strings
+
+    Example:
+        >>> tokenize("Nansen is a SCAM https://t.co/x")
+        ['nansen', 'is', 'a', 'scam', 'nansen is', 'is a', 'a scam']
+    """
+    words = TOKEN_PATTERN.findall(remove_urls(text or "").lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class NaiveBayesModel:
+    """
+    Multinomial Naive Bayes over token counts with Laplace smoothing.
+
+    Log-probabilities are precomputed per token as a list aligned with
+    self.labels, so classifying a tweet is a handful of dict lookups and
+    list additions.
+    """
+
+    def __init__(
+        self,
+        labels: List[str],
+        log_priors: List[float],
+        token_log_probs: Dict[str, List[float]],
+        unknown_log_probs: List[float],
+    ):
+        """
+        Initialize a fitted model.
+
+        Args:
+            labels: Class labels
+            log_priors: Log prior per label
+            token_log_probs: Log P(token | label) per label, keyed by token
+            unknown_log_probs: Log probability per label for unseen tokens
+        """
+        self.labels = labels
+        self.log_priors = log_priors
+        self.token_log_probs = token_log_probs
+        self.unknown_log_probs = unknown_log_probs
+
+    @classmethod
+    def fit(
+        cls, documents: List[List[str]], labels: List[str], alpha: float = 1.0
+    ) -> "NaiveBayesModel":
+        """
+        Fit the model on tokenized documents.
+
+        Args:
+            documents: Token lists, one per example
+            labels: Label per example
+            alpha: Laplace smoothing parameter
+
+        Returns:
+            Fitted NaiveBayesModel
+        """
+        classes = sorted(set(labels))
+        class_docs = Counter(labels)
+        token_counts = {label: Counter() for label in classes}
+        for tokens, label in zip(documents, labels):
+            token_counts[label].update(tokens)
+
+        vocabulary = set()
+        for counts in token_counts.values():
+            vocabulary.update(counts)
+        vocab_size = len(vocabulary) + 1  # +1 for unseen tokens
+
+        totals = {label: sum(token_counts[label].values()) for label in classes}
+        denominators = [
+            math.log(totals[label] + alpha * vocab_size) for label in classes
+        ]
+
+        token_log_probs = {
+            token: [
+                math.log(token_counts[label][token] + alpha) - denominator
+                for label, denominator in zip(classes, denominators)
+            ]
+            for token in vocabulary
+        }
+
+        return cls(
+            labels=classes,
+            log_priors=[math.log(class_docs[label] / len(labels)) for label in classes],
+            token_log_probs=token_log_probs,
+            unknown_log_probs=[math.log(alpha) - d for d in denominators],
+        )
+
+    def predict(self, tokens: List[str]) -> Tuple[str, float]:
+        """
+        Predict the most likely label.
+
+        Args:
+            tokens: Tokenized tweet
+
+        Returns:
+            Tuple of (label, posterior probability 0-1)
+        """
+        scores = list(self.log_priors)
+        n_labels = len(scores)
+
+        for token in tokens:
+            log_probs = self.token_log_probs.get(token, self.unknown_log_probs)
+            for i in range(n_labels):
+                scores[i] += log_probs[i]
+
+        best = max(range(n_labels), key=scores.__getitem__)
+        top = scores[best]
+        normalizer = sum(math.exp(score - top) for score in scores)
+        return self.labels[best], 1.0 / normalizer
+
+    def to_dict(self) -> Dict:
+        """Serialize the model to a JSON-compatible dictionary."""
+        return {
+            "labels": self.labels,
+            "log_priors": self.log_priors,
+            "token_log_probs": self.token_log_probs,
+            "unknown_log_probs": self.unknown_log_probs,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "NaiveBayesModel":
+        """Load a model serialized with to_dict()."""
+        return cls(
+            labels=data["labels"],
+            log_priors=data["log_priors"],
+            token_log_probs=data["token_log_probs"],
+            unknown_log_probs=data["unknown_log_probs"],
+        )
+
+
+class LocalClassifier:
+    """
+    Predicts sentiment and strategic_category without calling Claude.
+
+    Trained from Claude's own labels in the sentiment cache and the
+    tweets_analyzed_*.json files. Confidence is the lower of the two
+    models' posterior probabilities, on Claude's 0-100 scale.
+    """
+
+    def __init__(
+        self, models: Dict[str, NaiveBayesModel], metadata: Optional[Dict] = None
+    ):
+        """
+        Initialize local classifier.
+
+        Args:
+            models: Fitted model per label field
+            metadata: Training metadata (examples, holdout accuracy, ...)
+        """
+        self.models = models
+        self.metadata = metadata or {}
+
+    def classify(self, text: str) -> Dict:
+        """
+        Classify a single tweet text.
+
+        Args:
+            text: Tweet text
+
+        Returns:
+            Partial analysis dictionary with the predicted labels and a
+            0-100 confidence
+        """
+        tokens = tokenize(text)
+        analysis = {}
+        confidence = 1.0
+
+        for field, model in self.models.items():
+            label, probability = model.predict(tokens)
+            analysis[field] = label
+            confidence = min(confidence, probability)
+
+        analysis["confidence"] = int(confidence * 100)
+        return analysis
+
+    def save(self, model_file: str) -> None:
+        """
+        Save the classifier as JSON.
+
+        Args:
+            model_file: Output path
+        """
+        path = Path(model_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "version": MODEL_VERSION,
+                    "metadata": self.metadata,
+                    "models": {
+                        field: model.to_dict() for field, model in self.models.items()
+                    },
+                },
+                f,
+                separators=(",", ":"),
+            )
+        logger.info(f"💾 Saved local classifier to {model_file}")
+
+    @classmethod
+    def load(cls, model_file: str) -> Optional["LocalClassifier"]:
+        """
+        Load a classifier saved with save().
+
+        Args:
+            model_file: Path to the model file
+
+        Returns:
+            LocalClassifier, or None if the file is missing or incompatible
+        """
+        path = Path(model_file)
+        if not path.exists():
+            logger.warning(f"Local classifier not found: {model_file}")
+            return None
+
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load local classifier: {e}")
+            return None
+
+        if data.get("version") != MODEL_VERSION:
+            logger.warning(
+                f"Ignoring local classifier {model_file}: version "
+                f"{data.get('version')} != {MODEL_VERSION}"
+            )
+            return None
+
+        return cls(
+            models={
+                field: NaiveBayesModel.from_dict(model)
+                for field, model in data["models"].items()
+            },
+            metadata=data.get("metadata", {}),
+        )
+
+
+def load_training_examples(logs_dir: str = "logs") -> List[Tuple[str, Dict]]:
+    """
+    Collect (text, analysis) pairs labelled by Claude.
+
+    tweets_analyzed_*.json files carry text and analysis together; cache
+    entries only carry the analysis, so their text is looked up by tweet ID
+    in tweets_raw_*.json. Analyses produced by the local classifier itself
+    are skipped. Newer labels win for duplicate tweet IDs.
+
+    Args:
+        logs_dir: Directory with the cache and run outputs
+
+    Returns:
+        List of (tweet text, analysis) tuples
+    """
+    texts: Dict[str, str] = {}
+    labelled: Dict[str, Dict] = {}
+
+    for raw_file in sorted(glob.glob(str(Path(logs_dir) / "tweets_raw_*.json"))):
+        try:
+            with open(raw_file, "r") as f:
+                for tweet in json.load(f):
+                    texts[tweet.get("tweet_id")] = tweet.get("text", "")
+        except Exception as e:
+            logger.warning(f"Skipping {raw_file}: {e}")
+
+    cache_file = Path(logs_dir) / "sentiment_cache.json"
+    if cache_file.exists():
+        try:
+            with open(cache_file, "r") as f:
+                for tweet_id, entry in json.load(f).items():
+                    labelled[tweet_id] = entry.get("analysis", {})
+        except Exception as e:
+            logger.warning(f"Skipping {cache_file}: {e}")
+
+    analyzed_files = sorted(glob.glob(str(Path(logs_dir) / "tweets_analyzed_*.json")))
+    for analyzed_file in analyzed_files:
+        try:
+            with open(analyzed_file, "r") as f:
+                for result in json.load(f):
+                    tweet_id = result.get("tweet_id")
+                    texts[tweet_id] = result.get("original_tweet", {}).get("text", "")
+                    labelled[tweet_id] = result.get("analysis", {})
+        except Exception as e:
+            logger.warning(f"Skipping {analyzed_file}: {e}")
+
+    examples = []
+    for tweet_id, analysis in labelled.items():
+        if analysis.get("analyzed_by", "claude") != "claude":
+            continue
+        if not texts.get(tweet_id) or not all(analysis.get(f) for f in LABEL_FIELDS):
+            continue
+        examples.append((texts[tweet_id], analysis))
+
+    return examples
+
+
+def train_classifier(
+    examples: List[Tuple[str, Dict]], holdout_fraction: float = 0.2, seed: int = 42
+) -> LocalClassifier:
+    """
+    Fit a LocalClassifier and measure holdout accuracy.
+
+    The holdout split is only used for the reported accuracy; the returned
+    classifier is refit on all examples.
+
+    Args:
+        examples: (text, analysis) pairs from load_training_examples()
+        holdout_fraction: Share of examples held out for evaluation
+        seed: Random seed for the split
+
+    Returns:
+        Fitted LocalClassifier with training metadata
+
+    Raises:
+        ValueError: If there are no examples
+    """
+    if not examples:
+        raise ValueError("No Claude-labelled tweets found to train on")
+
+    documents = [tokenize(text) for text, _ in examples]
+    order = list(range(len(examples)))
+    random.Random(seed).shuffle(order)
+    n_holdout = int(len(order) * holdout_fraction)
+    holdout, train = order[:n_holdout], order[n_holdout:]
+
+    metadata = {
+        "trained_at": datetime.utcnow().isoformat(),
+        "examples": len(examples),
+        "holdout_examples": n_holdout,
+        "holdout_accuracy": {},
+        "label_counts": {},
+    }
+
+    models = {}
+    for field in LABEL_FIELDS:
+        labels = [analysis[field] for _, analysis in examples]
+        metadata["label_counts"][field] = dict(Counter(labels))
+
+        if holdout:
+            model = NaiveBayesModel.fit(
+                [documents[i] for i in train], [labels[i] for i in train]
+            )
+            correct = sum(model.predict(documents[i])[0] == labels[i] for i in holdout)
+            metadata["holdout_accuracy"][field] = round(correct / len(holdout), 4)
+
+        models[field] = NaiveBayesModel.fit(documents, labels)
+
+    return LocalClassifier(models, metadata)
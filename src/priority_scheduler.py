@@ -0,0 +1,165 @@
+"""Priority ordering of uncached tweets so the riskiest are analyzed first."""
+
+import logging
+import math
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class PriorityScheduler:
+    """
+    Scores tweets by reputational risk and orders the analysis queue.
+
+    The score adds up urgent keyword hits, author reach, engagement,
+    verification and recency (halving every recency_half_life_hours).
+    Tweets scoring at least urgent_score are analyzed first, in small
+    batches of urgent_batch_size, so they come back quickly and survive a
+    run cut short by the budget or an API outage. Recency is measured from
+    the current time unless now is pinned (e.g. to replay an archive).
+    """
+
+    def __init__(
+        self,
+        urgent_keywords: Optional[List[str]] = None,
+        keyword_weight: float = 10.0,
+        followers_weight: float = 1.0,
+        engagement_weight: float = 1.0,
+        verified_weight: float = 1.0,
+        recency_weight: float = 1.0,
+        recency_half_life_hours: float = 6.0,
+        urgent_score: float = 10.0,
+        urgent_batch_size: int = 3,
+    ):
+        """
+        Initialize priority scheduler.
+
+        Args:
+            urgent_keywords: Lowercase keywords from sentiment.urgent_keywords
+            keyword_weight: Score per urgent keyword hit
+            followers_weight: Score per order of magnitude of author followers
+            engagement_weight: Score per order of magnitude of engagement
+            verified_weight: Score for a verified author
+            recency_weight: Score for a tweet posted just now
+            recency_half_life_hours: Age at which the recency score halves
+            urgent_score: Score from which a tweet is treated as urgent
+            urgent_batch_size: Batch size for urgent tweets (0 disables
+                separate urgent batches)
+        """
+        self.urgent_keywords = [keyword.lower() for keyword in urgent_keywords or []]
+        self.keyword_weight = keyword_weight
+        self.followers_weight = followers_weight
+        self.engagement_weight = engagement_weight
+        self.verified_weight = verified_weight
+        self.recency_weight = recency_weight
+        self.recency_half_life_hours = recency_half_life_hours
+        self.urgent_score = urgent_score
+        self.urgent_batch_size = urgent_batch_size
+        self.now: Optional[datetime] = None
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "PriorityScheduler":
+        """
+        Build a scheduler from the claude.priority section of config.yaml.
+
+        Args:
+            config: Full configuration dictionary
+
+        Returns:
+            Configured PriorityScheduler
+        """
+        priority = config.get("claude", {}).get("priority", {})
+        return cls(
+            urgent_keywords=config.get("sentiment", {}).get("urgent_keywords", []),
+            keyword_weight=priority.get("keyword_weight", 10.0),
+            followers_weight=priority.get("followers_weight", 1.0),
+            engagement_weight=priority.get("engagement_weight", 1.0),
+            verified_weight=priority.get("verified_weight", 1.0),
+            recency_weight=priority.get("recency_weight", 1.0),
+            recency_half_life_hours=priority.get("recency_half_life_hours", 6.0),
+            urgent_score=priority.get("urgent_score", 10.0),
+            urgent_batch_size=priority.get("urgent_batch_size", 3),
+        )
+
+    def score(self, tweet: Dict, now: Optional[datetime] = None) -> float:
+        """
+        Score a tweet's reputational risk.
+
+        Args:
+            tweet: Tweet dictionary
+            now: Reference time for recency (defaults to the current time)
+
+        Returns:
+            Priority score (higher is analyzed first)
+        """
+        text = tweet.get("text", "").lower()
+        keyword_hits = sum(1 for keyword in self.urgent_keywords if keyword in text)
+        followers = tweet.get("author_followers", 0) or 0
+        engagement = tweet.get("engagement", {}).get("total", 0) or 0
+        verified = 1.0 if tweet.get("is_verified", False) else 0.0
+
+        return (
+            keyword_hits * self.keyword_weight
+            + math.log10(1 + followers) * self.followers_weight
+            + math.log10(1 + engagement) * self.engagement_weight
+            + verified * self.verified_weight
+            + self._recency(tweet, now) * self.recency_weight
+        )
+
+    def order(self, tweets: List[Dict]) -> List[Dict]:
+        """
+        Order tweets by descending priority.
+
+        The sort is stable, so ties keep fetch order.
+
+        Args:
+            tweets: List of tweet dictionaries
+
+        Returns:
+            New list sorted by descending priority
+        """
+        now = self.now or datetime.now(timezone.utc)
+        return sorted(tweets, key=lambda tweet: self.score(tweet, now), reverse=True)
+
+    def split_urgent(self, tweets: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Separate urgent tweets, keeping the order of both parts.
+
+        Args:
+            tweets: List of tweet dictionaries, in priority order
+
+        Returns:
+            Tuple of (urgent tweets, remaining tweets)
+        """
+        if not self.urgent_batch_size:
+            return [], list(tweets)
+
+        now = self.now or datetime.now(timezone.utc)
+        urgent, rest = [], []
+        for tweet in tweets:
+            if self.score(tweet, now) >= self.urgent_score:
+                urgent.append(tweet)
+            else:
+                rest.append(tweet)
+        return urgent, rest
+
+    def _recency(self, tweet: Dict, now: Optional[datetime]) -> float:
+        """Recency score from 1 (just posted) towards 0, halving per half-life."""
+        created_at = tweet.get("created_at")
+        if not created_at or self.recency_half_life_hours <= 0:
+            return 0.0
+
+        try:
+            created = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        except (AttributeError, ValueError):
+            logger.debug(f"Unparseable created_at: {created_at}")
+            return 0.0
+        if created.tzinfo is None:
+            created = created.replace(tzinfo=timezone.utc)
+
+        age_hours = max(
+            0.0, ((now or datetime.now(timezone.utc)) - created).total_seconds() / 3600
+        )
+        return 0.5 ** (age_hours / self.recency_half_life_hours)
@@ -0,0 +1,547 @@
+"""Offline evaluation of prompt variants over saved tweet archives."""
+
+import importlib
+import json
+import logging
+import re
+import threading
+import types
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+from pathlib import Path
+
+from anthropic import Anthropic
+
+from sentiment_analyzer import SentimentAnalyzer, request_key
+from shadow_eval import COMPARED_FIELDS
+from utils import (
+    calculate_percentile,
+    estimate_tokens,
+    merge_dicts,
+    parse_created_at,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Variants compared when config.yaml defines none (overrides for `claude:`)
+DEFAULT_VARIANTS = {
+    "compact": {"prompt_layout": "compact"},
+    "full": {"prompt_layout": "full"},
+}
+
+# Variant keys that replace a SentimentAnalyzer prompt method instead of
+# overriding config: a callable or a "module:function" path, called with the
+# analyzer like the method it replaces
+PROMPT_HOOKS = {
+    "build_user_prompt": "_build_user_prompt",
+    "format_tweets_for_prompt": "_format_tweets_for_prompt",
+}
+
+# Analysis fields computed locally after Claude answers, never sent by Claude
+LOCAL_FIELDS = [
+    "analyzed_at",
+    "analyzed_by",
+    "is_viral",
+    "is_influencer",
+    "content_urgency",
+    "content_actionable",
+]
+
+TWEET_BLOCK_PATTERN = re.compile(
+    r"^Tweet (\d+):\nText: (.*?)\n(?:Author|Engagement): ", re.MULTILINE | re.DOTALL
+)
+
+
+class FakeAnthropicServer:
+    """
+    Local HTTP server answering POST /v1/messages like the Anthropic API.
+
+    Each request body is passed to responder, which returns the response
+    text and token usage. Point an Anthropic client at url to use it.
+    """
+
+    def __init__(self, responder: Callable[[Dict], Dict]):
+        """
+        Initialize fake server.
+
+        Args:
+            responder: Called with the request body; returns a dictionary
+                with "text" and "usage" (input_tokens, output_tokens)
+        """
+        self.responder = responder
+        self.requests = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeAnthropicServer":
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if not self.path.startswith("/v1/messages"):
+                    self.send_error(404)
+                    return
+
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                fake.requests += 1
+                answer = fake.responder(body)
+
+                payload = json.dumps(
+                    {
+                        "id": f"msg_eval_{fake.requests}",
+                        "type": "message",
+                        "role": "assistant",
+                        "model": body.get("model", ""),
+                        "content": [{"type": "text", "text": answer["text"]}],
+                        "stop_reason": "end_turn",
+                        "stop_sequence": None,
+                        "usage": answer["usage"],
+                    }
+                ).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                logger.debug("fake anthropic: " + format % args)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-anthropic", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+class ReplayResponder:
+    """
+    Answers replayed requests from recordings, or from reference labels.
+
+    A request whose prompt was recorded earlier gets the recorded response
+    and usage back. Any other request is answered with the reference
+    analysis of each tweet in the prompt (NEUTRAL defaults for tweets
+    without one), with usage estimated from the prompt and answer sizes.
+    IDs of tweets answered from recordings are kept in recorded_ids, as
+    only those measure agreement; synthesized answers echo the reference.
+    """
+
+    def __init__(
+        self,
+        analyzer: SentimentAnalyzer,
+        tweets: List[Dict],
+        reference: Dict[str, Dict],
+        recordings: Dict[str, Dict],
+    ):
+        """
+        Initialize responder.
+
+        Args:
+            analyzer: Analyzer of the variant being replayed (for its layout)
+            tweets: Replayed tweets
+            reference: Reference analyses by tweet ID
+            recordings: Recorded responses by request_key()
+        """
+        self.reference = reference
+        self.recordings = recordings
+        self.recorded = 0
+        self.synthesized = 0
+        self.recorded_ids: Set[str] = set()
+        self.recorded_latencies: List[float] = []
+        self._lock = threading.Lock()
+        self._ids_by_text: Dict[str, str] = {}
+        for tweet in tweets:
+            text = analyzer._format_text(tweet.get("text", ""))
+            self._ids_by_text.setdefault(text, tweet.get("tweet_id"))
+
+    def __call__(self, body: Dict) -> Dict:
+        """Build the answer to one messages.create request body."""
+        system = body.get("system", "")
+        user_prompt = body["messages"][0]["content"]
+        recording = self.recordings.get(
+            request_key(body.get("model", ""), system, user_prompt)
+        )
+
+        if recording is not None:
+            with self._lock:
+                self.recorded += 1
+                self.recorded_ids.update(
+                    self._ids_by_text[text]
+                    for _, text in TWEET_BLOCK_PATTERN.findall(user_prompt)
+                    if text in self._ids_by_text
+                )
+                self.recorded_latencies.append(recording.get("latency_seconds", 0.0))
+            return {"text": recording["text"], "usage": recording["usage"]}
+
+        analyses = []
+        for number, text in TWEET_BLOCK_PATTERN.findall(user_prompt):
+            reference = self.reference.get(self._ids_by_text.get(text), {})
+            analysis = {
+                "tweet_number": int(number),
+                "sentiment": "NEUTRAL",
+                "strategic_category": "NEUTRAL_MENTION",
+                "urgency": "LOW",
+                **{k: v for k, v in reference.items() if k not in LOCAL_FIELDS},
+            }
+            if "content_urgency" in reference:
+                analysis["urgency"] = reference["content_urgency"]
+            analyses.append(analysis)
+
+        text = json.dumps(analyses, indent=2)
+        with self._lock:
+            self.synthesized += 1
+        return {
+            "text": text,
+            "usage": {
+                "input_tokens": estimate_tokens(system) + estimate_tokens(user_prompt),
+                "output_tokens": estimate_tokens(text),
+            },
+        }
+
+
+def variants_from_config(config: Dict) -> Dict[str, Dict]:
+    """
+    Prompt variants from the claude.eval section of config.yaml.
+
+    A variant overrides the claude section (model, prompt_layout, ...) and
+    may also change the prompt itself: system_prompt replaces the system
+    prompt, and build_user_prompt / format_tweets_for_prompt name
+    functions that replace those analyzer methods (see PROMPT_HOOKS).
+
+    Args:
+        config: Full configuration dictionary
+
+    Returns:
+        Variant name -> claude section overrides (DEFAULT_VARIANTS if none)
+    """
+    variants = config.get("claude", {}).get("eval", {}).get("variants")
+    return variants or DEFAULT_VARIANTS
+
+
+def reference_file_for(raw_file: str) -> Optional[str]:
+    """
+    Default reference for a raw archive: the analyzed file of the same run.
+
+    Args:
+        raw_file: Path to a tweets_raw_*.json file
+
+    Returns:
+        Path to the matching tweets_analyzed_*.json file, or None if missing
+    """
+    path = Path(raw_file)
+    reference = path.with_name(path.name.replace("tweets_raw_", "tweets_analyzed_", 1))
+    return str(reference) if reference != path and reference.exists() else None
+
+
+def archive_time(tweets: List[Dict]) -> Optional[datetime]:
+    """
+    Reference time of an archive: its newest created_at.
+
+    Batches are ordered and split by recency, so replays and recordings pin
+    the scheduler to this time to build the same batches (and request
+    keys) however long after the run they happen.
+
+    Args:
+        tweets: Archived tweets
+
+    Returns:
+        Newest creation time (UTC), or None if no tweet has a valid one
+    """
+    times = [parse_created_at(tweet.get("created_at", "")) for tweet in tweets]
+    times = [created for created in times if created is not None]
+    return max(times).replace(tzinfo=timezone.utc) if times else None
+
+
+def load_reference(reference_file: Optional[str]) -> Dict[str, Dict]:
+    """
+    Load reference analyses from a tweets_analyzed_*.json file.
+
+    Args:
+        reference_file: Path to the file (None for no reference)
+
+    Returns:
+        Analysis dictionaries by tweet ID
+    """
+    if not reference_file or not Path(reference_file).exists():
+        return {}
+    with open(reference_file, "r") as f:
+        results = json.load(f)
+    return {result["tweet_id"]: result.get("analysis", {}) for result in results}
+
+
+def load_recordings(recordings_file: Optional[str]) -> Dict[str, Dict]:
+    """
+    Load recorded responses written by a recording run.
+
+    Args:
+        recordings_file: Path to the recordings file
+
+    Returns:
+        Recorded responses by request_key()
+    """
+    if not recordings_file or not Path(recordings_file).exists():
+        return {}
+    with open(recordings_file, "r") as f:
+        return json.load(f)
+
+
+def load_prompt_hook(hook: Union[str, Callable]) -> Callable:
+    """
+    Resolve a variant's prompt hook.
+
+    Args:
+        hook: Callable, or "module:function" path to one
+
+    Returns:
+        The callable
+
+    Raises:
+        ValueError: If the path is malformed or does not name a callable
+    """
+    if callable(hook):
+        return hook
+    module_name, _, attribute = str(hook).partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Prompt hook must be 'module:function', got {hook!r}")
+    try:
+        function = getattr(importlib.import_module(module_name), attribute)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"Cannot load prompt hook {hook!r}: {e}") from e
+    if not callable(function):
+        raise ValueError(f"Prompt hook {hook!r} is not callable")
+    return function
+
+
+def build_variant_analyzer(
+    config: Dict,
+    overrides: Dict,
+    api_key: str = "eval",
+    live: bool = False,
+    now: Optional[datetime] = None,
+) -> SentimentAnalyzer:
+    """
+    Build an analyzer for one prompt variant.
+
+    Shadow evaluation, hedging and the local classifier are switched off so
+    every tweet goes through the variant's prompt; replays also lift the
+    run cost limit, as fake requests cost nothing. Prompt hooks are bound
+    onto the analyzer as methods, and system_prompt replaces its
+    SYSTEM_PROMPT, so every request and token estimate uses them.
+
+    Args:
+        config: Full configuration dictionary
+        overrides: Variant overrides for the claude section, plus optional
+            prompt hooks and system_prompt
+        api_key: Anthropic API key (only used for live recording)
+        live: Whether requests go to the real API
+        now: Time the scheduler measures recency from (see archive_time())
+
+    Returns:
+        SentimentAnalyzer for the variant
+    """
+    overrides = dict(overrides)
+    hooks = {
+        method: load_prompt_hook(overrides.pop(key))
+        for key, method in PROMPT_HOOKS.items()
+        if key in overrides
+    }
+    system_prompt = overrides.pop("system_prompt", None)
+
+    claude_overrides = {
+        "shadow": {"enabled": False},
+        "hedging": {"enabled": False},
+        "local_classifier": {"enabled": False},
+        **({} if live else {"cost_limits": {"max_per_run_usd": None}}),
+        **overrides,
+    }
+    variant_config = merge_dicts(config, {"claude": claude_overrides})
+    analyzer = SentimentAnalyzer(api_key=api_key, config=variant_config)
+    analyzer.scheduler.now = now
+
+    for method, function in hooks.items():
+        setattr(analyzer, method, types.MethodType(function, analyzer))
+    if system_prompt is not None:
+        analyzer.SYSTEM_PROMPT = system_prompt
+    if hooks or system_prompt is not None:
+        analyzer.prompt_fingerprint = analyzer._prompt_fingerprint()
+    return analyzer
+
+
+def evaluate_variant(
+    analyzer: SentimentAnalyzer,
+    tweets: List[Dict],
+    reference: Dict[str, Dict],
+    batch_size: int,
+    compared_ids: Optional[Set[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Run tweets through an analyzer and measure the outcome.
+
+    Args:
+        analyzer: Analyzer whose client points at the fake or real API
+        tweets: Replayed tweets
+        reference: Reference analyses by tweet ID
+        batch_size: Tweets per batch
+        compared_ids: Only measure agreement on these tweets (all if None),
+            read after the tweets are analyzed
+
+    Returns:
+        Tokens per tweet, cost per tweet, parse failure rate and agreement
+    """
+    results = analyzer.analyze_tweets(tweets, batch_size=batch_size, use_cache=False)
+    requests = analyzer.total_requests
+    analyzed = max(len(results), 1)
+
+    compared = 0
+    agreements = {field: 0 for field in COMPARED_FIELDS}
+    for result in results:
+        expected = reference.get(result["tweet_id"])
+        if not expected or (
+            compared_ids is not None and result["tweet_id"] not in compared_ids
+        ):
+            continue
+        compared += 1
+        for field in COMPARED_FIELDS:
+            if result["analysis"].get(field) == expected.get(field):
+                agreements[field] += 1
+
+    return {
+        "tweets": len(tweets),
+        "tweets_analyzed": len(results),
+        "requests": requests,
+        "input_tokens_per_tweet": round(analyzer.total_input_tokens / analyzed, 1),
+        "output_tokens_per_tweet": round(analyzer.total_output_tokens / analyzed, 1),
+        "cost_per_tweet_usd": round(analyzer.total_cost / analyzed, 6),
+        "parse_failure_rate": (
+            round(analyzer.parse_failures / requests, 4) if requests else 0.0
+        ),
+        "reference_tweets": compared,
+        "agreement": {
+            field: round(count / compared, 4) if compared else None
+            for field, count in agreements.items()
+        },
+    }
+
+
+def run_eval(
+    config: Dict,
+    raw_file: str,
+    reference_file: Optional[str] = None,
+    recordings_file: Optional[str] = None,
+    variants: Optional[Dict[str, Dict]] = None,
+    batch_size: Optional[int] = None,
+) -> Dict[str, Dict]:
+    """
+    Replay a tweets_raw_*.json file through each prompt variant offline.
+
+    Requests go to a local FakeAnthropicServer answering from recordings
+    where available and from the reference labels otherwise. Agreement is
+    measured on tweets answered from recordings only.
+
+    Args:
+        config: Full configuration dictionary
+        raw_file: Saved tweets to replay
+        reference_file: tweets_analyzed_*.json file to measure agreement with
+        recordings_file: Recorded responses (see record_responses())
+        variants: Variant name -> claude section overrides
+        batch_size: Tweets per batch (defaults to claude.batch_size)
+
+    Returns:
+        Evaluation results by variant name
+    """
+    with open(raw_file, "r") as f:
+        tweets = json.load(f)
+    reference = load_reference(reference_file)
+    recordings = load_recordings(recordings_file)
+    batch_size = batch_size or config.get("claude", {}).get("batch_size", 15)
+    now = archive_time(tweets)
+
+    report = {}
+    for name, overrides in (variants or DEFAULT_VARIANTS).items():
+        analyzer = build_variant_analyzer(config, overrides, now=now)
+        responder = ReplayResponder(analyzer, tweets, reference, recordings)
+
+        with FakeAnthropicServer(responder) as server:
+            analyzer.client = Anthropic(
+                api_key="eval", base_url=server.url, max_retries=0
+            )
+            result = evaluate_variant(
+                analyzer, tweets, reference, batch_size, responder.recorded_ids
+            )
+
+        result["responses"] = {
+            "recorded": responder.recorded,
+            "synthesized": responder.synthesized,
+        }
+        result["recorded_latency_seconds"] = (
+            {
+                f"p{p}": round(calculate_percentile(responder.recorded_latencies, p), 3)
+                for p in (50, 95)
+            }
+            if responder.recorded_latencies
+            else None
+        )
+        report[name] = result
+
+    return report
+
+
+def record_responses(
+    config: Dict,
+    raw_file: str,
+    recordings_file: str,
+    api_key: str,
+    variants: Optional[Dict[str, Dict]] = None,
+    batch_size: Optional[int] = None,
+) -> int:
+    """
+    Run variants against the real API and save every response for replay.
+
+    Args:
+        config: Full configuration dictionary
+        raw_file: Saved tweets to analyze
+        recordings_file: File the recordings are merged into
+        api_key: Anthropic API key
+        variants: Variant name -> claude section overrides
+        batch_size: Tweets per batch (defaults to claude.batch_size)
+
+    Returns:
+        Number of responses recorded
+    """
+    with open(raw_file, "r") as f:
+        tweets = json.load(f)
+    recordings = load_recordings(recordings_file)
+    batch_size = batch_size or config.get("claude", {}).get("batch_size", 15)
+    now = archive_time(tweets)
+
+    recorded = 0
+    for name, overrides in (variants or DEFAULT_VARIANTS).items():
+        analyzer = build_variant_analyzer(
+            config, overrides, api_key=api_key, live=True, now=now
+        )
+        analyzer.response_log = {}
+        analyzer.analyze_tweets(tweets, batch_size=batch_size, use_cache=False)
+        recordings.update(analyzer.response_log)
+        recorded += len(analyzer.response_log)
+        logger.info(f"🎙️ Recorded {len(analyzer.response_log)} responses ({name})")
+
+    path = Path(recordings_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(recordings, f, indent=2)
+    return recorded
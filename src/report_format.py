@@ -0,0 +1,206 @@
+"""Normalized on-disk report format: one tweet table, sections reference IDs."""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Marks a normalized report file; denormalized (legacy) reports have no key
+REPORT_FORMAT = "normalized"
+REPORT_FORMAT_VERSION = 1
+
+# Tweet fields shown in each denormalized section, in report order
+ALL_POSITIVE_FIELDS = ["url", "username", "text", "engagement"]
+ALL_NEGATIVE_FIELDS = ["url", "username", "text", "themes", "urgency"]
+POSITIVE_EXAMPLE_FIELDS = ["url", "username", "text"]
+NEGATIVE_EXAMPLE_FIELDS = ["url", "username", "text", "urgency"]
+
+# Fields of a negative phrase that come from its tweet
+PHRASE_TWEET_FIELDS = ["username", "url", "urgency"]
+
+# URLs built by TwitterClient; table entries omit a URL that matches it
+TWEET_URL_FORMAT = "https://twitter.com/{username}/status/{tweet_id}"
+
+
+def tweet_key(tweet: Dict) -> str:
+    """
+    Tweet table key for a report tweet entry.
+
+    Args:
+        tweet: Tweet entry with a "url" (".../status/<id>")
+
+    Returns:
+        Tweet ID from the URL, or the URL itself if it has no status ID
+    """
+    url = tweet["url"]
+    if "/status/" in url:
+        return url.rsplit("/status/", 1)[1]
+    return url
+
+
+def normalize_report(report: Dict) -> Dict:
+    """
+    Store every tweet once and replace tweet copies with their IDs.
+
+    all_positive_tweets, all_negative_tweets, each theme's example_tweets
+    and negative_phrase_analysis hold IDs into a top-level "tweets" table,
+    whose entries keep the union of the fields those sections show (the
+    URL only if TwitterClient would not build it from username and ID).
+    The other sections (summary, counts, messages, metadata) are unchanged.
+
+    Args:
+        report: Report dictionary from SentimentAggregator
+
+    Returns:
+        Normalized report dictionary (the input is not modified)
+    """
+    raw_data = report["raw_data"]
+    tweets: Dict[str, Dict] = {}
+
+    def ref(tweet: Dict, fields: List[str]) -> str:
+        """Add a tweet's fields to the table and return its key."""
+        key = tweet_key(tweet)
+        entry = tweets.get(key)
+        if entry is None:
+            entry = tweets[key] = {}
+            url = TWEET_URL_FORMAT.format(username=tweet["username"], tweet_id=key)
+            if tweet["url"] != url:
+                entry["url"] = tweet["url"]
+        for field in fields:
+            if field != "url":
+                entry.setdefault(field, tweet[field])
+        return key
+
+    normalized_raw = dict(raw_data)
+    normalized_raw["all_positive_tweets"] = [
+        ref(t, ALL_POSITIVE_FIELDS) for t in raw_data.get("all_positive_tweets", [])
+    ]
+    normalized_raw["all_negative_tweets"] = [
+        ref(t, ALL_NEGATIVE_FIELDS) for t in raw_data.get("all_negative_tweets", [])
+    ]
+    for section, fields in (
+        ("positive_themes", POSITIVE_EXAMPLE_FIELDS),
+        ("negative_themes", NEGATIVE_EXAMPLE_FIELDS),
+    ):
+        normalized_raw[section] = [
+            {
+                **theme,
+                "example_tweets": [ref(t, fields) for t in theme["example_tweets"]],
+            }
+            for theme in raw_data.get(section, [])
+        ]
+    normalized_raw["negative_phrase_analysis"] = [
+        {
+            "phrase": phrase["phrase"],
+            "tweet": ref(phrase, PHRASE_TWEET_FIELDS),
+            "theme": phrase["theme"],
+            "category": phrase["category"],
+        }
+        for phrase in raw_data.get("negative_phrase_analysis", [])
+    ]
+
+    normalized = {key: value for key, value in report.items() if key != "raw_data"}
+    normalized["format"] = REPORT_FORMAT
+    normalized["format_version"] = REPORT_FORMAT_VERSION
+    normalized["tweets"] = tweets
+    normalized["raw_data"] = normalized_raw
+    return normalized
+
+
+def denormalize_report(normalized: Dict) -> Dict:
+    """
+    Rebuild the report shape SlackNotifier and SentimentAggregator use.
+
+    Args:
+        normalized: Report from normalize_report(); reports without the
+            normalized format marker are returned unchanged
+
+    Returns:
+        Report dictionary with tweet fields copied into every section
+    """
+    if normalized.get("format") != REPORT_FORMAT:
+        return normalized
+
+    tweets = normalized["tweets"]
+    raw_data = dict(normalized["raw_data"])
+
+    def rows(keys: List[str], fields: List[str]) -> List[Dict]:
+        """Copy the given fields of each referenced tweet."""
+        return [{field: tweet_field(key, field) for field in fields} for key in keys]
+
+    def tweet_field(key: str, field: str):
+        """One field of a referenced tweet, rebuilding an omitted URL."""
+        entry = tweets[key]
+        if field == "url" and "url" not in entry:
+            return TWEET_URL_FORMAT.format(username=entry["username"], tweet_id=key)
+        return entry[field]
+
+    for section, fields in (
+        ("positive_themes", POSITIVE_EXAMPLE_FIELDS),
+        ("negative_themes", NEGATIVE_EXAMPLE_FIELDS),
+    ):
+        raw_data[section] = [
+            {**theme, "example_tweets": rows(theme["example_tweets"], fields)}
+            for theme in raw_data.get(section, [])
+        ]
+
+    phrases = []
+    for phrase in raw_data.get("negative_phrase_analysis", []):
+        key = phrase["tweet"]
+        phrases.append(
+            {
+                "phrase": phrase["phrase"],
+                "username": tweet_field(key, "username"),
+                "theme": phrase["theme"],
+                "category": phrase["category"],
+                "url": tweet_field(key, "url"),
+                "urgency": tweet_field(key, "urgency"),
+            }
+        )
+    raw_data["negative_phrase_analysis"] = phrases
+    raw_data["all_positive_tweets"] = rows(
+        raw_data.get("all_positive_tweets", []), ALL_POSITIVE_FIELDS
+    )
+    raw_data["all_negative_tweets"] = rows(
+        raw_data.get("all_negative_tweets", []), ALL_NEGATIVE_FIELDS
+    )
+
+    report = {
+        key: value
+        for key, value in normalized.items()
+        if key not in ("format", "format_version", "tweets", "raw_data")
+    }
+    report["raw_data"] = raw_data
+    return report
+
+
+def save_report(report: Dict, report_file: str) -> None:
+    """
+    Write a report in the normalized format as compact JSON.
+
+    Args:
+        report: Report dictionary from SentimentAggregator
+        report_file: Output path
+    """
+    path = Path(report_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(normalize_report(report), f, separators=(",", ":"))
+    logger.debug(f"Saved normalized report to {report_file}")
+
+
+def load_report(report_file: str) -> Dict:
+    """
+    Load a report file, normalized or legacy, in the denormalized shape.
+
+    Args:
+        report_file: Path to a report_*.json file
+
+    Returns:
+        Report dictionary as returned by SentimentAggregator.aggregate()
+    """
+    with open(report_file, "r") as f:
+        return denormalize_report(json.load(f))
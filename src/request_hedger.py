@@ -0,0 +1,265 @@
+"""Opt-in request hedging to cut Claude tail latency."""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Callable, Dict, List, Optional
+
+from utils import calculate_percentile
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Percentiles reported for batch latency
+LATENCY_PERCENTILES = [50, 95, 99]
+
+
+class RequestHedger:
+    """
+    Fires a duplicate request when the first one is slower than usual.
+
+    The hedge delay is a percentile (p95 by default) of recently observed
+    request latencies. Whichever request returns first wins; the other is
+    abandoned. A blocking HTTP call cannot be interrupted, so an abandoned
+    request still runs to completion and is handed to on_loser so its cost
+    can be accounted for. Hedges are limited by a per-run USD budget.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        percentile: float = 95,
+        min_samples: int = 10,
+        history_size: int = 50,
+        budget_usd: float = 0.25,
+    ):
+        """
+        Initialize request hedger.
+
+        Args:
+            enabled: Whether to hedge at all (off by default)
+            percentile: Latency percentile used as the hedge delay
+            min_samples: Latencies needed before the delay is trusted
+            history_size: Number of recent latencies to learn from
+            budget_usd: Worst-case spend allowed on hedge requests per run
+        """
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.budget_usd = budget_usd
+        self.committed_usd = 0.0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.recent_latencies: deque = deque(maxlen=history_size)
+        self.batch_latencies: List[float] = []
+        self.primary_latencies: List[float] = []
+        self._pending_primaries: Dict[Future, float] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "RequestHedger":
+        """
+        Build a hedger from the claude.hedging section of config.yaml.
+
+        Args:
+            config: Full configuration dictionary
+
+        Returns:
+            Configured RequestHedger
+        """
+        hedging = config.get("claude", {}).get("hedging", {})
+        return cls(
+            enabled=hedging.get("enabled", False),
+            percentile=hedging.get("latency_percentile", 95),
+            min_samples=hedging.get("min_samples", 10),
+            history_size=hedging.get("history_size", 50),
+            budget_usd=hedging.get("budget_usd", 0.25),
+        )
+
+    def seed(self, latencies: List[float]) -> None:
+        """
+        Seed the latency history, e.g. from earlier runs in the cost ledger.
+
+        Args:
+            latencies: Request latencies in seconds, oldest first
+        """
+        with self._lock:
+            self.recent_latencies.extend(latencies)
+
+    def threshold_seconds(self) -> Optional[float]:
+        """Current hedge delay, or None until enough latencies are known."""
+        with self._lock:
+            if len(self.recent_latencies) < self.min_samples:
+                return None
+            return calculate_percentile(list(self.recent_latencies), self.percentile)
+
+    def call(
+        self,
+        operation: Callable[[], Any],
+        estimated_cost: float = 0.0,
+        reserve: Optional[Callable[[float], bool]] = None,
+        on_loser: Optional[Callable[[Future], None]] = None,
+    ) -> Any:
+        """
+        Run an operation, hedging it if it is slower than the threshold.
+
+        The operation must return a (result, latency_seconds) tuple.
+
+        Args:
+            operation: Zero-argument callable making one request
+            estimated_cost: Worst-case cost of one extra request
+            reserve: Optional extra gate for a hedge (e.g. the run's cost
+                governor); called with estimated_cost
+            on_loser: Called with the losing request's future once it
+                finishes (or fails, or is cancelled)
+
+        Returns:
+            The winning operation's (result, latency_seconds) tuple
+
+        Raises:
+            Exception: The primary request's error if no request succeeded
+        """
+        start = time.monotonic()
+
+        if not self.enabled:
+            result = operation()
+            self._record_latencies(time.monotonic() - start, result[1])
+            return result
+
+        executor = self._get_executor()
+        primary = executor.submit(operation)
+        threshold = self.threshold_seconds()
+
+        done, _ = wait([primary], timeout=threshold)
+        if done or not self._take_hedge(estimated_cost, reserve):
+            result = primary.result()
+            self._record_latencies(time.monotonic() - start, result[1])
+            return result
+
+        logger.info(
+            f"🏁 Request slower than p{self.percentile:g} ({threshold:.1f}s): "
+            f"sending hedge request"
+        )
+        hedge = executor.submit(operation)
+
+        winner = None
+        pending = {primary, hedge}
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and winner is None:
+                    winner = future
+
+        if winner is None:
+            if on_loser:
+                on_loser(hedge)
+            raise primary.exception()
+
+        loser = primary if winner is hedge else hedge
+        loser.cancel()
+
+        with self._lock:
+            if winner is hedge:
+                self.hedges_won += 1
+                self._pending_primaries[primary] = start
+        if winner is hedge:
+            primary.add_done_callback(self._record_primary_latency)
+        if on_loser:
+            loser.add_done_callback(on_loser)
+
+        result = winner.result()
+        with self._lock:
+            self.batch_latencies.append(time.monotonic() - start)
+            self.recent_latencies.append(result[1])
+            if winner is primary:
+                self.primary_latencies.append(result[1])
+        return result
+
+    def settle(self, estimated_cost: float, actual_cost: float) -> None:
+        """
+        Replace a hedge's worst-case reservation with its actual cost.
+
+        Args:
+            estimated_cost: Amount committed when the hedge was fired
+            actual_cost: Cost of the abandoned request (0 if it failed)
+        """
+        with self._lock:
+            self.committed_usd = max(0.0, self.committed_usd - estimated_cost)
+            self.committed_usd += actual_cost
+
+    def latency_summary(self) -> Dict:
+        """
+        Summarize batch latency with and without hedging.
+
+        "Without hedging" uses the latency of each batch's first request;
+        abandoned first requests still in flight count at their elapsed time.
+
+        Returns:
+            Dictionary with hedge counts and p50/p95/p99 latencies in seconds
+        """
+        now = time.monotonic()
+        with self._lock:
+            primaries = self.primary_latencies + [
+                now - start for start in self._pending_primaries.values()
+            ]
+            return {
+                "hedging_enabled": self.enabled,
+                "hedges_fired": self.hedges_fired,
+                "hedges_won": self.hedges_won,
+                "hedge_cost_usd": round(self.committed_usd, 6),
+                "with_hedging": self._percentiles(self.batch_latencies),
+                "without_hedging": self._percentiles(primaries),
+            }
+
+    def _take_hedge(
+        self, estimated_cost: float, reserve: Optional[Callable[[float], bool]]
+    ) -> bool:
+        """Check the hedge budget and reserve room for one hedge."""
+        with self._lock:
+            if self.committed_usd + estimated_cost > self.budget_usd:
+                logger.debug("Hedge budget exhausted; waiting on original request")
+                return False
+            if reserve is not None and not reserve(estimated_cost):
+                return False
+            self.committed_usd += estimated_cost
+            self.hedges_fired += 1
+            return True
+
+    def _record_latencies(self, batch_latency: float, request_latency: float) -> None:
+        """Record an unhedged batch."""
+        with self._lock:
+            self.batch_latencies.append(batch_latency)
+            self.primary_latencies.append(request_latency)
+            self.recent_latencies.append(request_latency)
+
+    def _record_primary_latency(self, future: Future) -> None:
+        """Record an abandoned first request's latency once it finishes."""
+        with self._lock:
+            start = self._pending_primaries.pop(future, None)
+            if start is None or future.cancelled() or future.exception() is not None:
+                return
+            self.primary_latencies.append(time.monotonic() - start)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the worker pool shared by all hedged calls."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=4, thread_name_prefix="claude-hedge"
+                )
+            return self._executor
+
+    def _percentiles(self, latencies: List[float]) -> Dict[str, float]:
+        """p50/p95/p99 of a list of latencies."""
+        return {
+            f"p{p}": round(calculate_percentile(latencies, p), 3)
+            for p in LATENCY_PERCENTILES
+        }
@@ -0,0 +1,316 @@
+"""Shared retry policy and circuit breaker for Claude API calls."""
+
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime, timezone
+
+import anthropic
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying besides 429 and 5xx (request timeout, lock conflict)
+RETRYABLE_STATUS_CODES = {408, 409}
+
+# Never wait longer than this for a single retry, whatever retry-after says
+MAX_RETRY_AFTER_SECONDS = 60.0
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Stops all Claude calls once the API is clearly down.
+
+    After failure_threshold consecutive outage failures (5xx, overload or
+    connection errors) the circuit opens and every call is refused. Once
+    reset_timeout_seconds have passed a single trial call is let through
+    (half-open); success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_seconds: float = 60.0):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive outage failures that open the circuit
+            reset_timeout_seconds: Time to wait before allowing a trial call
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls are being refused."""
+        with self._lock:
+            return self.opened_at is not None and not self._reset_timeout_elapsed()
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may be made now.
+
+        Returns:
+            True if the circuit is closed, or half-open with no trial in flight
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._reset_timeout_elapsed() and not self._trial_in_flight:
+                self._trial_in_flight = True
+                logger.info("🔌 Circuit half-open: allowing one trial request")
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info("🔌 Circuit closed: Claude API is responding again")
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count an outage failure and open the circuit at the threshold."""
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+
+            if self.opened_at is not None or (
+                self.consecutive_failures >= self.failure_threshold
+            ):
+                if self.opened_at is None:
+                    logger.error(
+                        f"🔌 Circuit open after {self.consecutive_failures} "
+                        f"consecutive failures: pausing Claude calls for "
+                        f"{self.reset_timeout_seconds:.0f}s"
+                    )
+                self.opened_at = time.monotonic()
+
+    def _reset_timeout_elapsed(self) -> bool:
+        """Whether the open circuit may move to half-open."""
+        return time.monotonic() - self.opened_at >= self.reset_timeout_seconds
+
+
+class RetryPolicy:
+    """
+    Retries Claude calls on transient errors using the SDK's typed exceptions.
+
+    Rate limits (429), overload/server errors (5xx), request timeouts and
+    connection errors are retried; authentication, permission and invalid
+    request errors are raised immediately. Waits use full jitter on top of
+    the configured backoff schedule and honour the server's retry-after
+    header. Retries are drawn from a budget shared by every batch in the
+    run, and a circuit breaker refuses calls once the API is clearly down.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        retry_backoff: Optional[List[float]] = None,
+        retry_budget: Optional[int] = 20,
+        breaker: Optional[CircuitBreaker] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize retry policy.
+
+        Args:
+            max_retries: Retries allowed per call after the first attempt
+            retry_backoff: Backoff caps in seconds for each retry (the last
+                value is reused for later retries)
+            retry_budget: Total retries allowed across the run (None = unlimited)
+            breaker: Circuit breaker shared by all calls
+            sleep: Sleep function (injectable for tests)
+        """
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff or [1, 2, 4, 8, 16]
+        self.retry_budget = retry_budget
+        self.breaker = breaker or CircuitBreaker()
+        self.retries_used = 0
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "RetryPolicy":
+        """
+        Build a retry policy from the claude section of config.yaml.
+
+        Args:
+            config: Full configuration dictionary
+
+        Returns:
+            Configured RetryPolicy
+        """
+        claude_config = config.get("claude", {})
+        breaker_config = claude_config.get("circuit_breaker", {})
+        return cls(
+            max_retries=claude_config.get("max_retries", 5),
+            retry_backoff=claude_config.get("retry_backoff", [1, 2, 4, 8, 16]),
+            retry_budget=claude_config.get("retry_budget_per_run", 20),
+            breaker=CircuitBreaker(
+                failure_threshold=breaker_config.get("failure_threshold", 5),
+                reset_timeout_seconds=breaker_config.get("reset_timeout_seconds", 60),
+            ),
+        )
+
+    def call(self, operation: Callable[[], Any], description: str = "request") -> Any:
+        """
+        Run an operation, retrying transient failures.
+
+        Args:
+            operation: Zero-argument callable making one API request
+            description: Label used in log messages
+
+        Returns:
+            The operation's result
+
+        Raises:
+            CircuitOpenError: If the circuit breaker refuses the call
+            Exception: The last error if it is not retryable, or if retries
+                or the run's retry budget are exhausted
+        """
+        attempt = 0
+
+        while True:
+            if not self.breaker.allow_request():
+                raise CircuitOpenError(
+                    f"Circuit open after {self.breaker.consecutive_failures} "
+                    f"consecutive failures; {description} not sent"
+                )
+
+            try:
+                result = operation()
+            except Exception as e:
+                # Only outage errors count towards the breaker; anything else
+                # (e.g. a 429) means the API is up and answering
+                if self.is_outage_error(e):
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+
+                if not self.is_retryable(e):
+                    logger.error(f"✗ {description} failed ({type(e).__name__}): {e}")
+                    raise
+
+                if attempt >= self.max_retries:
+                    logger.error(
+                        f"✗ Max retries ({self.max_retries}) exceeded for {description}"
+                    )
+                    raise
+
+                if not self._take_retry():
+                    logger.error(
+                        f"✗ Retry budget ({self.retry_budget}) exhausted; "
+                        f"giving up on {description}"
+                    )
+                    raise
+
+                attempt += 1
+                wait_time = self.backoff_seconds(attempt, e)
+                logger.warning(
+                    f"⏳ {description} failed ({type(e).__name__}). "
+                    f"Retry {attempt}/{self.max_retries}. Waiting {wait_time:.1f}s..."
+                )
+                self._sleep(wait_time)
+                continue
+
+            self.breaker.record_success()
+            return result
+
+    def backoff_seconds(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """
+        Get the wait before a retry.
+
+        Full jitter: a uniform random wait between 0 and the configured
+        backoff for this attempt. A retry-after header from the server sets
+        the minimum wait.
+
+        Args:
+            attempt: 1-based retry number
+            error: Error that triggered the retry
+
+        Returns:
+            Seconds to wait
+        """
+        cap = self.retry_backoff[min(attempt, len(self.retry_backoff)) - 1]
+        wait_time = random.uniform(0, cap)
+
+        retry_after = self.retry_after_seconds(error) if error is not None else None
+        if retry_after is not None:
+            wait_time = max(wait_time, min(retry_after, MAX_RETRY_AFTER_SECONDS))
+
+        return wait_time
+
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        """Whether an error is transient and worth retrying."""
+        if isinstance(error, anthropic.APIConnectionError):
+            return True
+        if isinstance(error, anthropic.APIStatusError):
+            status = error.status_code
+            return status == 429 or status >= 500 or status in RETRYABLE_STATUS_CODES
+        return False
+
+    @staticmethod
+    def is_outage_error(error: Exception) -> bool:
+        """Whether an error suggests the API is down (counts towards the breaker)."""
+        if isinstance(error, anthropic.APIConnectionError):
+            return True
+        return isinstance(error, anthropic.APIStatusError) and error.status_code >= 500
+
+    @staticmethod
+    def retry_after_seconds(error: Exception) -> Optional[float]:
+        """
+        Read the server's retry-after hint from an API error.
+
+        Args:
+            error: Error raised by the SDK
+
+        Returns:
+            Seconds to wait, or None if the response carried no hint
+        """
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            try:
+                return max(0.0, float(retry_after_ms) / 1000)
+            except ValueError:
+                pass
+
+        retry_after = headers.get("retry-after")
+        if not retry_after:
+            return None
+
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def _take_retry(self) -> bool:
+        """Draw one retry from the run's budget."""
+        with self._lock:
+            if self.retry_budget is not None and self.retries_used >= self.retry_budget:
+                return False
+            self.retries_used += 1
+            return True
@@ -0,0 +1,366 @@
+"""Hourly and daily rollups of analyzed tweets, keyed on tweet creation time."""
+
+import json
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from aggregator import SENTIMENT_BASE_SCORES, STRATEGIC_CATEGORY_COUNTERS
+from utils import parse_created_at
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+# Bucket key formats (UTC); keys sort chronologically as strings
+HOUR_KEY_FORMAT = "%Y-%m-%dT%H"
+DAY_KEY_FORMAT = "%Y-%m-%d"
+
+# Bumped when the rollup file layout changes
+ROLLUP_VERSION = 1
+
+
+class RollupBucket:
+    """
+    Counters for the tweets created in one hour or one day.
+
+    Unlike AggregateState, a bucket keeps no tweet text or examples, only
+    counts and score sums, so buckets stay a few hundred bytes and add up
+    exactly: merging two buckets gives the bucket of both sets of tweets.
+    """
+
+    def __init__(self):
+        """Initialize empty bucket."""
+        self.tweets = 0
+        self.sentiment_counts: Dict[str, int] = {}
+        self.weighted_score = 0.0
+        self.total_weight = 0.0
+        self.product_mentions: Dict[str, int] = {}
+        self.category_counts: Dict[str, int] = {}
+        self.theme_counts: Dict[str, int] = {}
+
+    def add(self, analysis: Dict) -> None:
+        """
+        Count one tweet's analysis.
+
+        Args:
+            analysis: The "analysis" dictionary of an analyzed tweet
+        """
+        sentiment = analysis["sentiment"]
+        confidence = analysis["confidence"] / 100.0
+
+        self.tweets += 1
+        self.sentiment_counts[sentiment] = self.sentiment_counts.get(sentiment, 0) + 1
+        self.weighted_score += SENTIMENT_BASE_SCORES.get(sentiment, 0.0) * confidence
+        self.total_weight += confidence
+
+        for product in analysis.get("product_mentions", []):
+            self.product_mentions[product] = self.product_mentions.get(product, 0) + 1
+        category = analysis.get("strategic_category")
+        if category:
+            self.category_counts[category] = self.category_counts.get(category, 0) + 1
+        for theme in analysis.get("themes", []) or ["general"]:
+            self.theme_counts[theme] = self.theme_counts.get(theme, 0) + 1
+
+    def merge(self, other: "RollupBucket") -> None:
+        """Add another bucket's counts to this one."""
+        self.tweets += other.tweets
+        self.weighted_score += other.weighted_score
+        self.total_weight += other.total_weight
+        for mine, theirs in (
+            (self.sentiment_counts, other.sentiment_counts),
+            (self.product_mentions, other.product_mentions),
+            (self.category_counts, other.category_counts),
+            (self.theme_counts, other.theme_counts),
+        ):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+
+    @property
+    def negative_share(self) -> float:
+        """Fraction of tweets that are NEGATIVE (0.0 for an empty bucket)."""
+        if not self.tweets:
+            return 0.0
+        return self.sentiment_counts.get("NEGATIVE", 0) / self.tweets
+
+    @property
+    def sentiment_score(self) -> float:
+        """Confidence-weighted sentiment score from -100 to +100."""
+        if self.total_weight > 0:
+            return self.weighted_score / self.total_weight * 100
+        return 0.0
+
+    @property
+    def critical_fud(self) -> int:
+        """Number of CRITICAL_FUD tweets."""
+        return self.category_counts.get("CRITICAL_FUD", 0)
+
+    def top_themes(self, n: int = 5) -> List[Tuple[str, int]]:
+        """Most frequent themes, ties in first-seen order."""
+        return sorted(self.theme_counts.items(), key=lambda x: x[1], reverse=True)[:n]
+
+    def summary(self) -> Dict:
+        """Headline numbers, with categories named as in strategic_highlights."""
+        return {
+            "tweets": self.tweets,
+            "negative_share": round(self.negative_share, 3),
+            "sentiment_score": round(self.sentiment_score, 1),
+            **{
+                counter: self.category_counts.get(category, 0)
+                for category, counter in STRATEGIC_CATEGORY_COUNTERS.items()
+            },
+            "top_themes": self.top_themes(),
+        }
+
+    def to_dict(self) -> Dict:
+        """Serialize the bucket to a JSON-compatible dictionary."""
+        return {
+            "tweets": self.tweets,
+            "sentiment_counts": self.sentiment_counts,
+            "weighted_score": self.weighted_score,
+            "total_weight": self.total_weight,
+            "product_mentions": self.product_mentions,
+            "category_counts": self.category_counts,
+            "theme_counts": self.theme_counts,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RollupBucket":
+        """Load a bucket serialized with to_dict()."""
+        bucket = cls()
+        for field, value in data.items():
+            setattr(bucket, field, value)
+        return bucket
+
+
+class RollupStore:
+    """
+    Hourly buckets for recent tweets, daily buckets for older ones.
+
+    Tweets are filed by created_at, so a tweet fetched again in a later,
+    overlapping run lands in the same bucket; hourly buckets remember their
+    tweet IDs and count it once. Once a whole day is older than
+    hourly_days, its hourly buckets are merged into one daily bucket and
+    the IDs dropped (the search window never reaches back that far), and
+    daily buckets older than daily_days are discarded. Range queries look
+    up only the bucket keys inside the range.
+    """
+
+    def __init__(
+        self,
+        rollup_file: str = "logs/rollups.json",
+        hourly_days: int = 30,
+        daily_days: int = 400,
+    ):
+        """
+        Initialize rollup store, loading any saved buckets.
+
+        Args:
+            rollup_file: Path to the JSON rollup file
+            hourly_days: Days of hourly resolution before downsampling
+            daily_days: Days of daily buckets to keep
+        """
+        self.rollup_file = Path(rollup_file)
+        self.hourly_days = hourly_days
+        self.daily_days = daily_days
+        self.hourly: Dict[str, RollupBucket] = {}
+        self.daily: Dict[str, RollupBucket] = {}
+        self.tweet_ids: Dict[str, Set[str]] = {}
+        self._load()
+
+    def add(self, analyzed_tweet: Dict) -> bool:
+        """
+        File one analyzed tweet under the bucket of its creation time.
+
+        Args:
+            analyzed_tweet: Analyzed tweet dictionary from SentimentAnalyzer
+
+        Returns:
+            True if counted, False if already counted or without created_at
+        """
+        original = analyzed_tweet.get("original_tweet", {})
+        created = parse_created_at(original.get("created_at", ""))
+        if created is None:
+            return False
+
+        day_key = created.strftime(DAY_KEY_FORMAT)
+        if day_key in self.daily:
+            # Day already downsampled: no IDs left to deduplicate against
+            self.daily[day_key].add(analyzed_tweet["analysis"])
+            return True
+
+        hour_key = created.strftime(HOUR_KEY_FORMAT)
+        tweet_id = analyzed_tweet.get("tweet_id") or original.get("tweet_id")
+        seen = self.tweet_ids.setdefault(hour_key, set())
+        if tweet_id in seen:
+            return False
+        if tweet_id:
+            seen.add(tweet_id)
+
+        bucket = self.hourly.get(hour_key)
+        if bucket is None:
+            bucket = self.hourly[hour_key] = RollupBucket()
+        bucket.add(analyzed_tweet["analysis"])
+        return True
+
+    def add_tweets(self, analyzed_tweets: Iterable[Dict]) -> int:
+        """
+        File analyzed tweets.
+
+        Args:
+            analyzed_tweets: Analyzed tweet dictionaries
+
+        Returns:
+            Number of tweets counted (duplicates and undated tweets skipped)
+        """
+        return sum(self.add(tweet) for tweet in analyzed_tweets)
+
+    def downsample(self, now: Optional[datetime] = None) -> int:
+        """
+        Merge hourly buckets of days past hourly_days into daily buckets.
+
+        Args:
+            now: Reference UTC time (default: current UTC time)
+
+        Returns:
+            Number of days downsampled
+        """
+        now = now or datetime.utcnow()
+        hourly_cutoff = (now - timedelta(days=self.hourly_days)).strftime(
+            DAY_KEY_FORMAT
+        )
+        daily_cutoff = (now - timedelta(days=self.daily_days)).strftime(DAY_KEY_FORMAT)
+
+        days = set()
+        for hour_key in [k for k in self.hourly if k[:10] < hourly_cutoff]:
+            day_key = hour_key[:10]
+            days.add(day_key)
+            self.daily.setdefault(day_key, RollupBucket()).merge(
+                self.hourly.pop(hour_key)
+            )
+            self.tweet_ids.pop(hour_key, None)
+
+        for day_key in [k for k in self.daily if k < daily_cutoff]:
+            del self.daily[day_key]
+
+        if days:
+            logger.info(f"Downsampled {len(days)} days of hourly rollups")
+        return len(days)
+
+    def buckets(
+        self, start: datetime, end: datetime, resolution: str = "hour"
+    ) -> List[Tuple[datetime, RollupBucket]]:
+        """
+        Get the non-empty buckets starting in [start, end).
+
+        Hourly resolution covers the last hourly_days only. Daily buckets
+        of recent days are built from their hourly buckets.
+
+        Args:
+            start: Range start (UTC), rounded down to the bucket
+            end: Range end (UTC), exclusive
+            resolution: "hour" or "day"
+
+        Returns:
+            List of (bucket start, bucket) in chronological order
+
+        Raises:
+            ValueError: If resolution is not "hour" or "day"
+        """
+        if resolution == "hour":
+            step, key_format = HOUR, HOUR_KEY_FORMAT
+            current = start.replace(minute=0, second=0, microsecond=0)
+        elif resolution == "day":
+            step, key_format = DAY, DAY_KEY_FORMAT
+            current = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        else:
+            raise ValueError(f"Unknown rollup resolution: {resolution}")
+
+        result = []
+        while current < end:
+            if resolution == "hour":
+                bucket = self.hourly.get(current.strftime(key_format))
+            else:
+                bucket = self._day_bucket(current)
+            if bucket is not None:
+                result.append((current, bucket))
+            current += step
+        return result
+
+    def total(self, start: datetime, end: datetime) -> RollupBucket:
+        """
+        Merge every bucket starting in [start, end) into one.
+
+        Hourly buckets are used where they exist, whole daily buckets for
+        downsampled days.
+
+        Args:
+            start: Range start (UTC)
+            end: Range end (UTC), exclusive
+
+        Returns:
+            RollupBucket with the range's counts
+        """
+        total = RollupBucket()
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day < end:
+            daily = self.daily.get(day.strftime(DAY_KEY_FORMAT))
+            if daily is not None:
+                if day >= start:
+                    total.merge(daily)
+            else:
+                hours = self.buckets(max(day, start), min(day + DAY, end))
+                for _, bucket in hours:
+                    total.merge(bucket)
+            day += DAY
+        return total
+
+    def save(self) -> None:
+        """Write all buckets to the rollup file."""
+        data = {
+            "version": ROLLUP_VERSION,
+            "hourly": {k: b.to_dict() for k, b in sorted(self.hourly.items())},
+            "daily": {k: b.to_dict() for k, b in sorted(self.daily.items())},
+            "tweet_ids": {k: sorted(ids) for k, ids in sorted(self.tweet_ids.items())},
+        }
+        try:
+            self.rollup_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.rollup_file, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+        except Exception as e:
+            logger.error(f"Failed to save rollups: {e}")
+
+    def _day_bucket(self, day: datetime) -> Optional[RollupBucket]:
+        """Daily bucket for a day, merged from hourly buckets if not downsampled."""
+        daily = self.daily.get(day.strftime(DAY_KEY_FORMAT))
+        if daily is not None:
+            return daily
+
+        hours = self.buckets(day, day + DAY)
+        if not hours:
+            return None
+        bucket = RollupBucket()
+        for _, hour in hours:
+            bucket.merge(hour)
+        return bucket
+
+    def _load(self) -> None:
+        """Load saved buckets, starting empty if the file is missing or stale."""
+        if not self.rollup_file.exists():
+            return
+        try:
+            with open(self.rollup_file, "r") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load rollups, starting empty: {e}")
+            return
+        if data.get("version") != ROLLUP_VERSION:
+            logger.warning(f"Ignoring rollups with version {data.get('version')}")
+            return
+
+        self.hourly = {k: RollupBucket.from_dict(v) for k, v in data["hourly"].items()}
+        self.daily = {k: RollupBucket.from_dict(v) for k, v in data["daily"].items()}
+        self.tweet_ids = {k: set(ids) for k, ids in data["tweet_ids"].items()}
@@ -1,19 +1,44 @@
 """Comprehensive Claude API sentiment analysis for Nansen brand monitoring."""
 
 import os
+import gzip
+import hashlib
 import json
 import logging
+import threading
 import time
 import re
-from typing import List, Dict, Optional, Any, Union
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 from pathlib import Path
 from anthropic import Anthropic
 
+from cost_governor import CostGovernor
+from cost_ledger import CostLedger
+from local_classifier import LocalClassifier
+from priority_scheduler import PriorityScheduler
+from request_hedger import RequestHedger
+from retry_policy import CircuitOpenError, RetryPolicy
+from shadow_eval import ShadowEvaluator
+from utils import (
+    apportion,
+    calculate_percentile,
+    calculate_total_engagement,
+    estimate_tokens,
+    format_number,
+    remove_urls,
+)
+
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Tweet block layouts: "full" sends every field, "compact" drops the URL and
+# timestamp, shortens counts and replaces t.co links with LINK_PLACEHOLDER
+PROMPT_LAYOUTS = ["full", "compact"]
+LINK_PLACEHOLDER = "[link]"
+
 # Constants for validation
 SENTIMENTS = ["POSITIVE", "NEGATIVE", "NEUTRAL", "MIXED"]
 INTENTS = [
@@ -52,6 +77,32 @@ STRATEGIC_CATEGORIES = [
 SONNET_4_5_INPUT_PRICE = 3.0  # $3/MTok
 SONNET_4_5_OUTPUT_PRICE = 15.0  # $15/MTok
 
+# (input, output) USD per million tokens; unknown models are priced as Sonnet 4.5
+MODEL_PRICING = {
+    "claude-sonnet-4-5-20250929": (SONNET_4_5_INPUT_PRICE, SONNET_4_5_OUTPUT_PRICE),
+    "claude-haiku-4-5-20251001": (1.0, 5.0),
+    "claude-opus-4-1-20250805": (15.0, 75.0),
+    "claude-3-5-haiku-20241022": (0.8, 4.0),
+}
+
+
+def request_key(model: str, system_prompt: str, user_prompt: str) -> str:
+    """
+    Identify a Claude request by its model and prompts.
+
+    Used to match recorded responses to requests in offline evaluation.
+
+    Args:
+        model: Claude model name
+        system_prompt: System prompt sent
+        user_prompt: User prompt sent
+
+    Returns:
+        Short hex digest
+    """
+    content = "\n".join([model, system_prompt, user_prompt])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:24]
+
 
 class SentimentAnalyzer:
     """Comprehensive sentiment analyzer for Nansen brand monitoring across all products."""
@@ -80,12 +131,20 @@ CRITICAL FUD PATTERNS:
 
 Your mission: Identify strategic wins, adoption signals, and critical reputation risks across all products."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        config: Optional[Dict] = None,
+        ledger: Optional[CostLedger] = None,
+    ):
         """
         Initialize sentiment analyzer with Anthropic API.
 
         Args:
             api_key: Anthropic API key. If not provided, reads from ANTHROPIC_API_KEY env var.
+            config: Optional configuration dictionary (config/config.yaml)
+            ledger: Optional persistent cost ledger; every request is recorded and
+                the run limit is capped by the remaining daily/monthly budget
 
         Raises:
             ValueError: If API key is not provided or empty
@@ -97,12 +156,96 @@ Your mission: Identify strategic wins, adoption signals, and critical reputation
             logger.error(error_msg)
             raise ValueError(error_msg)
 
-        self.client = Anthropic(api_key=self.api_key)
-        self.model = "claude-sonnet-4-5-20250929"
+        self.config = config or {}
+        claude_config = self.config.get("claude", {})
+
+        # Retries are handled by RetryPolicy, not the SDK's built-in retries
+        self.client = Anthropic(api_key=self.api_key, max_retries=0)
+        self.model = claude_config.get("model", "claude-sonnet-4-5-20250929")
+        self.max_tokens = claude_config.get("max_tokens", 8192)
+        self.group_conversations = claude_config.get("group_conversations", True)
+        self.prompt_layout = claude_config.get("prompt_layout", "compact")
+        if self.prompt_layout not in PROMPT_LAYOUTS:
+            logger.warning(
+                f"Unknown prompt_layout: {self.prompt_layout}, defaulting to compact"
+            )
+            self.prompt_layout = "compact"
+        self.urgent_keywords = [
+            keyword.lower()
+            for keyword in self.config.get("sentiment", {}).get("urgent_keywords", [])
+        ]
+        self.thresholds = {
+            "high_engagement": 100,
+            "high_reach_followers": 10000,
+            "influencer_followers": 50000,
+            **self.config.get("sentiment", {}).get("thresholds", {}),
+        }
+        self.cost_governor = CostGovernor.from_config(self.config)
+        self.scheduler = PriorityScheduler.from_config(self.config)
+        self.retry_policy = RetryPolicy.from_config(self.config)
+        self.request_hedger = RequestHedger.from_config(self.config)
+        self.unanalyzed_tweets: List[Dict] = []
+        self.fast_path_results: Dict[str, Dict] = {}
+        self.parse_failures = 0
+        # When set to a dict, every response is recorded in it (see prompt_eval)
+        self.response_log: Optional[Dict[str, Dict]] = None
+        self.ledger = ledger
+        self.run_id = os.getenv("GITHUB_RUN_ID") or datetime.utcnow().strftime(
+            "%Y%m%dT%H%M%S"
+        )
+
+        if self.ledger:
+            cost_limits = claude_config.get("cost_limits", {})
+            self.cost_governor.limit_to(
+                self.ledger.remaining_budget(
+                    cost_limits.get("max_per_day_usd"),
+                    cost_limits.get("max_per_month_usd"),
+                )
+            )
+
+            # Learn the hedge delay from recent runs, not just this one, using
+            # only this model's batch requests (not shadow or fast path ones)
+            if self.request_hedger.enabled:
+                self.request_hedger.seed(
+                    [
+                        entry.get("latency_seconds", 0.0)
+                        for entry in self.ledger.load_entries(
+                            datetime.utcnow() - timedelta(days=7)
+                        )
+                        if entry.get("status") == "ok"
+                        and entry.get("model") == self.model
+                        and entry.get("request_type", "batch") == "batch"
+                    ]
+                )
+        cache_config = self.config.get("sentiment", {}).get("cache", {})
+        revalidation = cache_config.get("revalidation", {})
+        self.cache_max_age_days = cache_config.get("max_age_days", 7)
+        self.cache_cleanup_days = cache_config.get("cleanup_days", 30)
+        self.engagement_growth_factor = revalidation.get(
+            "engagement_growth_factor", 2.0
+        )
+        self.min_engagement_increase = revalidation.get("min_engagement_increase", 50)
+        self.prompt_fingerprint = self._prompt_fingerprint()
+        self.cache_revalidations: Dict[str, int] = {}
+        local_config = claude_config.get("local_classifier", {})
+        self.local_classifier: Optional[LocalClassifier] = None
+        self.local_confidence_threshold = local_config.get("confidence_threshold", 90)
+        self.local_degraded_mode = local_config.get("degraded_mode", True)
+        self.local_stats = {"local": 0, "degraded": 0}
+        if local_config.get("enabled", False):
+            self.local_classifier = LocalClassifier.load(
+                local_config.get("model_file", "logs/local_classifier.json")
+            )
+
         self.cache_file = Path("logs/sentiment_cache.json")
+        self._usage_lock = threading.Lock()
         self.total_cost = 0.0
         self.total_input_tokens = 0
         self.total_output_tokens = 0
+        self.total_requests = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.shadow = ShadowEvaluator.from_config(self.config, self)
 
         # Ensure cache directory exists
         self.cache_file.parent.mkdir(parents=True, exist_ok=True)
@@ -121,7 +264,9 @@ Your mission: Identify strategic wins, adoption signals, and critical reputation
             use_cache: Whether to use cached results (default: True)
 
         Returns:
-            List of analyzed tweet dictionaries with sentiment, intent, themes, and strategic categorization
+            List of analyzed tweet dictionaries with sentiment, intent, themes, and strategic categorization.
+            Tweets that could not be analyzed (cost limit reached or batch failed) are
+            left out and listed in self.unanalyzed_tweets instead.
 
         Example:
             >>> analyzer = SentimentAnalyzer()
@@ -130,6 +275,8 @@ Your mission: Identify strategic wins, adoption signals, and critical reputation
             >>> print(results[0]['analysis']['sentiment'])
             'POSITIVE'
         """
+        self.unanalyzed_tweets = []
+
         if not tweets:
             logger.warning("No tweets provided for analysis")
             return []
@@ -146,15 +293,29 @@ Your mission: Identify strategic wins, adoption signals, and critical reputation
         uncached_tweets = []
         results = []
 
+        # Tweets the alert fast path already analyzed during the fetch
+        with self._usage_lock:
+            fast_path = {
+                tweet_id: self.fast_path_results.pop(tweet_id)
+                for tweet_id in [tweet.get("tweet_id") for tweet in tweets]
+                if tweet_id in self.fast_path_results
+            }
+
         for tweet in tweets:
             tweet_id = tweet.get("tweet_id")
-            if (
+            if tweet_id in fast_path:
+                results.append({**fast_path[tweet_id], "original_tweet": tweet})
+                if use_cache:
+                    cache[tweet_id] = self._new_cache_entry(
+                        fast_path[tweet_id]["analysis"], tweet
+                    )
+            elif (
                 use_cache
                 and tweet_id in cache
-                and self._is_cache_valid(cache[tweet_id])
+                and self._revalidate_cache_entry(cache[tweet_id], tweet)
             ):
                 # Use cached result
-                cached_analysis = cache[tweet_id]["analysis"]
+                cached_analysis = {**cache[tweet_id]["analysis"]}
                 results.append(
                     {
                         "tweet_id": tweet_id,
@@ -171,16 +332,34 @@ Your mission: Identify strategic wins, adoption signals, and critical reputation
             else:
                 uncached_tweets.append(tweet)
 
+        if use_cache:
+            self.cache_hits += cache_hits
+            self.cache_misses += len(uncached_tweets)
+
         if cache_hits > 0:
             saved_cost = cache_hits * 0.015  # Rough estimate per tweet
             logger.info(f"✓ Cache hits: {cache_hits} tweets (saved ~${saved_cost:.2f})")
 
+        # Reach and engagement may have changed since the analysis was cached
+        self._apply_engagement_signals(results)
+
+        # Confident, low-risk tweets are labelled locally instead of by Claude
+        if self.local_classifier and uncached_tweets:
+            local_results, uncached_tweets = self._classify_locally(uncached_tweets)
+            results.extend(local_results)
+
         if not uncached_tweets:
-            logger.info("All tweets found in cache")
+            logger.info("No tweets left for Claude (all cached or classified locally)")
+            if use_cache and (cache_hits or fast_path):
+                self._save_cache(cache)
             return results
 
-        # Process uncached tweets in batches
-        num_batches = (len(uncached_tweets) + batch_size - 1) // batch_size
+        # Riskiest tweets go first so a budget cut-off drops the least important ones
+        uncached_tweets = self.scheduler.order(uncached_tweets)
+
+        # Process uncached tweets in batches (threads kept together)
+        batches = self._build_batches(uncached_tweets, batch_size)
+        num_batches = len(batches)
         logger.info(
             f"Processing {len(uncached_tweets)} uncached tweets in {num_batches} batches"
         )
@@ -190,15 +369,40 @@ Your mission: Identify strategic wins, adoption signals, and critical reputation
         critical_fuds = 0
         affiliate_violations = 0
 
-        for i in range(0, len(uncached_tweets), batch_size):
-            batch = uncached_tweets[i : i + batch_size]
-            batch_num = (i // batch_size) + 1
-
+        for batch_num, batch in enumerate(batches, 1):
             logger.info(
                 f"Analyzing batch {batch_num}/{num_batches} ({len(batch)} tweets)..."
             )
+            remaining = [tweet for rest in batches[batch_num - 1 :] for tweet in rest]
+
+            # Don't pile more requests onto an API that is down
+            if self.retry_policy.breaker.is_open:
+                self.unanalyzed_tweets.extend(remaining)
+                logger.error(
+                    f"⛔ Circuit breaker open, stopping before batch "
+                    f"{batch_num}/{num_batches}: "
+                    f"{len(remaining)} tweets left unanalyzed"
+                )
+                break
+
+            # Reserve worst-case cost before dispatching the batch
+            estimated_cost = self._estimate_batch_cost(batch)
+            if not self.cost_governor.reserve(estimated_cost):
+                self.unanalyzed_tweets.extend(remaining)
+                logger.warning(
+                    f"⛔ Stopping before batch {batch_num}/{num_batches}: "
+                    f"{len(remaining)} tweets left unanalyzed"
+                )
+                break
 
             batch_analysis = self._analyze_batch(batch)
+            batch_cost = sum(
+                r["api_cost"]["estimated_cost_usd"] for r in batch_analysis
+            )
+            self.cost_governor.settle(estimated_cost, batch_cost)
+
+            if not batch_analysis:
+                self.unanalyzed_tweets.extend(batch)
 
             if batch_analysis:
                 batch_results.extend(batch_analysis)
@@ -206,10 +410,9 @@ Your mission: Identify strategic wins, adoption signals, and critical reputation
                 # Update cache
                 if use_cache:
                     for result in batch_analysis:
-                        cache[result["tweet_id"]] = {
-                            "analysis": result["analysis"],
-                            "cached_at": datetime.utcnow().isoformat(),
-                        }
+                        cache[result["tweet_id"]] = self._new_cache_entry(
+                            result["analysis"], result["original_tweet"]
+                        )
 
                 # Track strategic alerts
                 for result in batch_analysis:
@@ -243,19 +446,58 @@ Your mission: Identify strategic wins, adoption signals, and critical reputation
         # Combine cached and new results
         results.extend(batch_results)
 
-        # Save updated cache
-        if use_cache and batch_results:
+        # Degraded mode: label what Claude could not (budget, outage) locally
+        if (
+            self.local_classifier
+            and self.local_degraded_mode
+            and self.unanalyzed_tweets
+        ):
+            logger.warning(
+                f"🪫 Degraded mode: classifying {len(self.unanalyzed_tweets)} "
+                f"tweets with the local classifier"
+            )
+            results.extend(self._local_results(self.unanalyzed_tweets, degraded=True))
+            self.unanalyzed_tweets = []
+
+        # Save updated cache (hits extend entry lifetimes, so save those too)
+        if use_cache and (batch_results or cache_hits or fast_path):
             self._save_cache(cache)
-            self._clean_old_cache()
+            self._clean_old_cache(self.cache_cleanup_days)
 
         # Log summary
         logger.info(f"\n{'='*60}")
         logger.info(f"Analysis Complete:")
         logger.info(f"  Total tweets analyzed: {len(results)}")
         logger.info(f"  Total cost: ${self.total_cost:.4f}")
+        if use_cache:
+            logger.info(
+                f"  Cache hit rate: {self.get_cache_stats()['hit_rate']:.1%}"
+            )
         logger.info(
             f"  Total tokens: {self.total_input_tokens:,} in / {self.total_output_tokens:,} out"
         )
+        if batch_results:
+            tweet_tokens = [
+                r["api_cost"]["input_tokens"] + r["api_cost"]["output_tokens"]
+                for r in batch_results
+            ]
+            logger.info(
+                f"  Tokens per analyzed tweet: "
+                f"p50 {calculate_percentile(tweet_tokens, 50):,.0f} / "
+                f"p95 {calculate_percentile(tweet_tokens, 95):,.0f} / "
+                f"max {max(tweet_tokens):,}"
+            )
+        if self.request_hedger.enabled:
+            latency = self.request_hedger.latency_summary()
+            logger.info(
+                f"  Batch latency p50/p95/p99: "
+                f"{'/'.join(f'{v:.1f}' for v in latency['with_hedging'].values())}s "
+                f"(without hedging: "
+                f"{'/'.join(f'{v:.1f}' for v in latency['without_hedging'].values())}s, "
+                f"{latency['hedges_fired']} hedges, {latency['hedges_won']} won)"
+            )
+        if self.unanalyzed_tweets:
+            logger.warning(f"  Unanalyzed tweets: {len(self.unanalyzed_tweets)}")
         logger.info(f"  Strategic Wins: {strategic_wins}")
         logger.info(f"  Critical FUDs: {critical_fuds}")
         logger.info(f"  Affiliate Violations: {affiliate_violations}")
@@ -263,12 +505,69 @@ Your mission: Identify strategic wins, adoption signals, and critical reputation
 
         return results
 
-    def _analyze_batch(self, tweets: List[Dict]) -> List[Dict]:
+    def analyze_urgent_tweet(self, tweet: Dict) -> Optional[Dict]:
+        """
+        Analyze one tweet immediately in its own request (alert fast path).
+
+        Goes through the same cost governor, retry policy and ledger as a
+        batch. The result is kept and reused by the next analyze_tweets()
+        call, so the tweet is not paid for twice.
+
+        Args:
+            tweet: Tweet dictionary
+
+        Returns:
+            Analyzed result, or None if the budget or the API refused it
+        """
+        estimated_cost = self._estimate_batch_cost([tweet])
+        if not self.cost_governor.reserve(estimated_cost):
+            logger.warning(
+                f"⛔ Fast path skipped for tweet {tweet.get('tweet_id')}: budget"
+            )
+            return None
+
+        results = self._analyze_batch([tweet], request_type="fast_path")
+        self.cost_governor.settle(
+            estimated_cost, sum(r["api_cost"]["estimated_cost_usd"] for r in results)
+        )
+        if not results:
+            return None
+
+        with self._usage_lock:
+            self.fast_path_results[tweet.get("tweet_id")] = results[0]
+        return results[0]
+
+    def cache_reuse_check(self) -> Callable[[Dict], bool]:
+        """
+        Predicate telling whether a tweet's cached analysis would be reused.
+
+        The cache is read once; the predicate applies the same checks as
+        analyze_tweets (prompt fingerprint, engagement growth, age) without
+        updating the entry, so tweets that will be re-analyzed return False.
+
+        Returns:
+            Function of a fetched tweet, True if its cache entry is current
+        """
+        cache = self._load_cache()
+
+        def reusable(tweet: Dict) -> bool:
+            cache_item = cache.get(tweet.get("tweet_id"))
+            return (
+                cache_item is not None
+                and self._revalidation_reason(cache_item, tweet) is None
+            )
+
+        return reusable
+
+    def _analyze_batch(
+        self, tweets: List[Dict], request_type: str = "batch"
+    ) -> List[Dict]:
         """
         Analyze a batch of tweets using Claude API.
 
         Args:
             tweets: List of tweet dictionaries
+            request_type: Request type recorded in the cost ledger
 
         Returns:
             List of analyzed results with all fields
@@ -276,99 +575,518 @@ Your mission: Identify strategic wins, adoption signals, and critical reputation
         formatted_tweets = self._format_tweets_for_prompt(tweets)
         user_prompt = self._build_user_prompt(len(tweets), formatted_tweets)
 
-        max_retries = 5
-        retry_count = 0
+        hedge_cost = self._estimate_batch_cost(tweets)
 
-        while retry_count < max_retries:
-            try:
-                response = self.client.messages.create(
+        # Sampled batches also go to the shadow model/prompt, concurrently
+        shadow_future = self.shadow.submit(tweets) if self.shadow else None
+
+        def send_batch():
+            return self.request_hedger.call(
+                lambda: self._send_request(user_prompt, request_type),
+                estimated_cost=hedge_cost,
+                reserve=self.cost_governor.reserve,
+                on_loser=lambda future: self._settle_hedge_loser(
+                    future, hedge_cost, request_type
+                ),
+            )
+
+        try:
+            response, latency = self.retry_policy.call(
+                send_batch, description=f"Claude batch of {len(tweets)} tweets"
+            )
+        except CircuitOpenError as e:
+            logger.error(f"✗ {e}. Skipping batch.")
+            return []
+        except Exception as e:
+            logger.error(f"✗ Batch failed ({type(e).__name__}): {e}. Skipping.")
+            return []
+
+        # Extract tokens and calculate cost
+        input_tokens = response.usage.input_tokens
+        output_tokens = response.usage.output_tokens
+        cost = self._record_usage(response, latency, request_type)
+
+        logger.info(
+            f"✅ Batch analyzed: {input_tokens:,} input tokens, "
+            f"{output_tokens:,} output tokens (${cost:.4f})"
+        )
+
+        # Parse response and line analyses up with the batch's tweets
+        parsed = self._parse_response(response.content[0].text)
+        analyses = self._match_analyses(parsed, len(tweets))
+        if len(parsed) != len(tweets) or not all(analyses):
+            with self._usage_lock:
+                self.parse_failures += 1
+            logger.warning(
+                f"Parsed {len(parsed)} analyses for a batch of {len(tweets)} tweets"
+            )
+
+        # Attribute the batch's billed tokens to individual tweets
+        tweet_input_tokens, tweet_output_tokens = self._attribute_tokens(
+            tweets, user_prompt, analyses, input_tokens, output_tokens
+        )
+
+        # Validate and merge with original tweets
+        results = []
+        for i, tweet in enumerate(tweets):
+            validated_analysis = self._validate_analysis(analyses[i], tweet)
+
+            results.append(
+                {
+                    "tweet_id": tweet.get("tweet_id"),
+                    "original_tweet": tweet,
+                    "analysis": {
+                        **validated_analysis,
+                        "analyzed_at": datetime.utcnow().isoformat(),
+                    },
+                    "api_cost": {
+                        "input_tokens": tweet_input_tokens[i],
+                        "output_tokens": tweet_output_tokens[i],
+                        "estimated_cost_usd": self._calculate_cost(
+                            tweet_input_tokens[i], tweet_output_tokens[i]
+                        ),
+                    },
+                }
+            )
+
+        self._apply_engagement_signals(results)
+
+        if shadow_future:
+            self.shadow.compare_when_done(shadow_future, results, latency, cost)
+
+        return results
+
+    def _send_request(
+        self, user_prompt: str, request_type: str = "batch"
+    ) -> Tuple[Any, float]:
+        """
+        Send one messages.create request.
+
+        Failed requests are recorded in the cost ledger before re-raising.
+
+        Args:
+            user_prompt: User prompt for the batch
+            request_type: Request type recorded in the cost ledger
+
+        Returns:
+            Tuple of (response, latency in seconds)
+        """
+        request_start = time.monotonic()
+        try:
+            response = self.client.messages.create(
+                model=self.model,
+                max_tokens=self.max_tokens,
+                temperature=0.15,
+                system=self.SYSTEM_PROMPT,
+                messages=[{"role": "user", "content": user_prompt}],
+            )
+        except Exception as e:
+            if self.ledger:
+                self.ledger.record(
+                    run_id=self.run_id,
                     model=self.model,
-                    max_tokens=8192,
-                    temperature=0.15,
-                    system=self.SYSTEM_PROMPT,
-                    messages=[{"role": "user", "content": user_prompt}],
+                    input_tokens=0,
+                    output_tokens=0,
+                    latency_seconds=time.monotonic() - request_start,
+                    cost_usd=0.0,
+                    status=f"error:{type(e).__name__}",
+                    request_type=request_type,
                 )
+            raise
+
+        latency = time.monotonic() - request_start
+        if self.response_log is not None:
+            key = request_key(self.model, self.SYSTEM_PROMPT, user_prompt)
+            self.response_log[key] = {
+                "text": response.content[0].text,
+                "usage": {
+                    "input_tokens": response.usage.input_tokens,
+                    "output_tokens": response.usage.output_tokens,
+                },
+                "latency_seconds": round(latency, 3),
+            }
+        return response, latency
 
-                # Extract tokens and calculate cost
-                input_tokens = response.usage.input_tokens
-                output_tokens = response.usage.output_tokens
-                cost = self._calculate_cost(input_tokens, output_tokens)
+    def _record_usage(
+        self, response: Any, latency: float, request_type: str = "batch"
+    ) -> float:
+        """
+        Add a response's usage to the run totals and the cost ledger.
 
-                self.total_input_tokens += input_tokens
-                self.total_output_tokens += output_tokens
-                self.total_cost += cost
+        Thread-safe, as abandoned hedge requests finish in the background.
 
-                logger.info(
-                    f"✅ Batch analyzed: {input_tokens:,} input tokens, "
-                    f"{output_tokens:,} output tokens (${cost:.4f})"
-                )
+        Args:
+            response: Claude API response
+            latency: Request latency in seconds
+            request_type: Request type recorded in the cost ledger
 
-                # Parse response
-                analyses = self._parse_response(response.content[0].text)
-
-                # Validate and merge with original tweets
-                results = []
-                for i, tweet in enumerate(tweets):
-                    analysis = analyses[i] if i < len(analyses) else {}
-                    validated_analysis = self._validate_analysis(analysis, tweet)
-
-                    results.append(
-                        {
-                            "tweet_id": tweet.get("tweet_id"),
-                            "original_tweet": tweet,
-                            "analysis": {
-                                **validated_analysis,
-                                "analyzed_at": datetime.utcnow().isoformat(),
-                            },
-                            "api_cost": {
-                                "input_tokens": input_tokens // len(tweets),
-                                "output_tokens": output_tokens // len(tweets),
-                                "estimated_cost_usd": cost / len(tweets),
-                            },
-                        }
-                    )
+        Returns:
+            Cost of the request in USD
+        """
+        input_tokens = response.usage.input_tokens
+        output_tokens = response.usage.output_tokens
+        cost = self._calculate_cost(input_tokens, output_tokens)
+
+        with self._usage_lock:
+            self.total_input_tokens += input_tokens
+            self.total_output_tokens += output_tokens
+            self.total_cost += cost
+            self.total_requests += 1
+
+        if self.ledger:
+            self.ledger.record(
+                run_id=self.run_id,
+                model=self.model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                latency_seconds=latency,
+                cost_usd=cost,
+                cache_creation_input_tokens=self._usage_tokens(
+                    response.usage, "cache_creation_input_tokens"
+                ),
+                cache_read_input_tokens=self._usage_tokens(
+                    response.usage, "cache_read_input_tokens"
+                ),
+                request_type=request_type,
+            )
 
-                return results
+        return cost
 
-            except Exception as e:
-                retry_count += 1
-                error_type = type(e).__name__
+    def _settle_hedge_loser(
+        self, future: Future, estimated_cost: float, request_type: str = "batch"
+    ) -> None:
+        """
+        Account for the abandoned request of a hedged pair once it finishes.
 
-                # Check for rate limit (429)
-                if "429" in str(e) or "rate_limit" in str(e).lower():
-                    wait_time = min(2**retry_count, 60)  # Exponential backoff, max 60s
-                    logger.warning(
-                        f"⏳ Rate limit exceeded. Retry {retry_count}/{max_retries}. "
-                        f"Waiting {wait_time}s..."
-                    )
-                    time.sleep(wait_time)
-                    continue
-
-                # Check for server errors (500, 502, 503)
-                if any(code in str(e) for code in ["500", "502", "503"]):
-                    wait_time = 2**retry_count  # Exponential backoff
-                    logger.warning(
-                        f"⏳ Server error ({error_type}). Retry {retry_count}/{max_retries}. "
-                        f"Waiting {wait_time}s..."
-                    )
-                    time.sleep(wait_time)
-                    continue
+        Args:
+            future: Future of the losing request
+            estimated_cost: Worst-case cost reserved for the hedge
+            request_type: Request type recorded in the cost ledger
+        """
+        actual_cost = 0.0
+        if not future.cancelled() and future.exception() is None:
+            response, latency = future.result()
+            actual_cost = self._record_usage(response, latency, request_type)
+            logger.debug(f"Abandoned hedge request finished (${actual_cost:.4f})")
+
+        self.cost_governor.settle(estimated_cost, actual_cost)
+        self.request_hedger.settle(estimated_cost, actual_cost)
+
+    def _attribute_tokens(
+        self,
+        tweets: List[Dict],
+        user_prompt: str,
+        analyses: List[Dict],
+        input_tokens: int,
+        output_tokens: int,
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Split a batch's billed tokens across its tweets.
 
-                # Check for auth errors (401, 403) - don't retry
-                if any(code in str(e) for code in ["401", "403"]):
-                    logger.error(f"✗ Authentication error: {e}")
-                    return []
+        Input tokens are weighted by each tweet's formatted prompt block, its
+        share of any thread/author header it sits under, and an equal share
+        of the fixed overhead (system prompt and instructions);
+        output tokens are weighted by the length of each tweet's JSON object.
+        Shares are apportioned so they sum exactly to response.usage.
 
-                # Other errors - retry with backoff
-                wait_time = 2**retry_count
-                logger.warning(
-                    f"⚠️ Error analyzing batch ({error_type}): {e}. "
-                    f"Retry {retry_count}/{max_retries}. Waiting {wait_time}s..."
+        Args:
+            tweets: Tweets in the batch, in prompt order
+            user_prompt: User prompt that was sent
+            analyses: Analyses matched to the tweets (see _match_analyses)
+            input_tokens: Billed input tokens for the batch
+            output_tokens: Billed output tokens for the batch
+
+        Returns:
+            Tuple of (input tokens per tweet, output tokens per tweet)
+        """
+        block_tokens = [0.0] * len(tweets)
+        for text, members in self._prompt_sections(tweets):
+            section_share = estimate_tokens(text) / len(members)
+            for index in members:
+                block_tokens[index] += section_share
+        overhead_tokens = max(
+            0,
+            estimate_tokens(self.SYSTEM_PROMPT)
+            + estimate_tokens(user_prompt)
+            - sum(block_tokens),
+        )
+        overhead_share = overhead_tokens / len(tweets)
+        input_weights = [tokens + overhead_share for tokens in block_tokens]
+
+        output_weights = [
+            (
+                estimate_tokens(json.dumps(analyses[i], ensure_ascii=False))
+                if i < len(analyses) and analyses[i]
+                else 0
+            )
+            for i in range(len(tweets))
+        ]
+
+        return (
+            apportion(input_tokens, input_weights),
+            apportion(output_tokens, output_weights),
+        )
+
+    def _classify_locally(self, tweets: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Label confident, low-risk tweets with the local classifier.
+
+        Tweets containing urgent keywords always go to Claude, as do tweets
+        the classifier is less than local_confidence_threshold sure about.
+
+        Args:
+            tweets: Uncached tweets
+
+        Returns:
+            Tuple of (local results, tweets still needing Claude)
+        """
+        local_tweets = []
+        predictions = []
+        claude_tweets = []
+
+        for tweet in tweets:
+            text = tweet.get("text", "")
+            if self._has_urgent_keyword(text):
+                claude_tweets.append(tweet)
+                continue
+
+            prediction = self.local_classifier.classify(text)
+            if prediction["confidence"] >= self.local_confidence_threshold:
+                local_tweets.append(tweet)
+                predictions.append(prediction)
+            else:
+                claude_tweets.append(tweet)
+
+        if local_tweets:
+            logger.info(
+                f"🧮 Local classifier handled {len(local_tweets)}/{len(tweets)} "
+                f"uncached tweets"
+            )
+        local_results = self._local_results(
+            local_tweets, degraded=False, predictions=predictions
+        )
+        return local_results, claude_tweets
+
+    def _local_results(
+        self,
+        tweets: List[Dict],
+        degraded: bool,
+        predictions: Optional[List[Dict]] = None,
+    ) -> List[Dict]:
+        """
+        Build analysis results from local classifier predictions.
+
+        Fields the classifier does not predict take _validate_analysis
+        defaults; in degraded mode urgent keywords mark a tweet HIGH urgency
+        and actionable. Local results are never cached, so Claude labels the
+        tweets once it is available again.
+
+        Args:
+            tweets: Tweets to classify
+            degraded: Whether Claude was unavailable for these tweets
+            predictions: classify() output for each tweet, if already
+                computed (classified here otherwise)
+
+        Returns:
+            List of analyzed results with zero API cost
+        """
+        results = []
+        for i, tweet in enumerate(tweets):
+            text = tweet.get("text", "")
+            prediction = (
+                predictions[i]
+                if predictions is not None
+                else self.local_classifier.classify(text)
+            )
+            prediction["analyzed_by"] = "local"
+            prediction["degraded"] = degraded
+            if degraded and self._has_urgent_keyword(text):
+                prediction["urgency"] = "HIGH"
+                prediction["actionable"] = True
+
+            results.append(
+                {
+                    "tweet_id": tweet.get("tweet_id"),
+                    "original_tweet": tweet,
+                    "analysis": {
+                        **self._validate_analysis(prediction, tweet),
+                        "analyzed_at": datetime.utcnow().isoformat(),
+                    },
+                    "api_cost": {
+                        "input_tokens": 0,
+                        "output_tokens": 0,
+                        "estimated_cost_usd": 0.0,
+                    },
+                }
+            )
+
+        self.local_stats["degraded" if degraded else "local"] += len(results)
+        self._apply_engagement_signals(results)
+        return results
+
+    def _has_urgent_keyword(self, text: str) -> bool:
+        """Whether text contains any sentiment.urgent_keywords entry."""
+        text = text.lower()
+        return any(keyword in text for keyword in self.urgent_keywords)
+
+    def _apply_engagement_signals(self, results: List[Dict]) -> None:
+        """
+        Derive is_viral, is_influencer and engagement-driven urgency locally.
+
+        These are deterministic functions of the tweet's current reach and
+        engagement (thresholds from sentiment.thresholds), so they are not
+        requested from Claude and are recomputed whenever a cached analysis is
+        reused. Claude's content-only urgency and actionability are kept in
+        content_urgency / content_actionable; a viral negative tweet is
+        escalated to HIGH urgency and actionable on top of them.
+
+        Args:
+            results: Analyzed tweet results, updated in place
+        """
+        if not results:
+            return
+
+        tweets = [result["original_tweet"] for result in results]
+        followers = [tweet.get("author_followers", 0) or 0 for tweet in tweets]
+        engagement = [self._engagement_total(tweet) for tweet in tweets]
+        verified = [bool(tweet.get("is_verified", False)) for tweet in tweets]
+
+        is_viral = [
+            total > self.thresholds["high_engagement"]
+            or count > self.thresholds["high_reach_followers"]
+            for total, count in zip(engagement, followers)
+        ]
+        is_influencer = [
+            count > self.thresholds["influencer_followers"] or badge
+            for count, badge in zip(followers, verified)
+        ]
+
+        for result, viral, influencer in zip(results, is_viral, is_influencer):
+            analysis = result["analysis"]
+            content_urgency = analysis.setdefault(
+                "content_urgency", analysis.get("urgency", "LOW")
+            )
+            content_actionable = analysis.setdefault(
+                "content_actionable", analysis.get("actionable", False)
+            )
+            viral_negative = viral and analysis.get("sentiment") == "NEGATIVE"
+
+            analysis["is_viral"] = viral
+            analysis["is_influencer"] = influencer
+            analysis["urgency"] = "HIGH" if viral_negative else content_urgency
+            analysis["actionable"] = content_actionable or viral_negative
+
+    def _estimate_batch_cost(self, tweets: List[Dict]) -> float:
+        """
+        Estimate the worst-case cost of analyzing a batch.
+
+        Input tokens are estimated from the full prompt; output is assumed to
+        use the whole max_tokens allowance so the estimate is an upper bound.
+
+        Args:
+            tweets: List of tweet dictionaries in the batch
+
+        Returns:
+            Estimated cost in USD
+        """
+        formatted_tweets = self._format_tweets_for_prompt(tweets)
+        user_prompt = self._build_user_prompt(len(tweets), formatted_tweets)
+        input_tokens = estimate_tokens(self.SYSTEM_PROMPT) + estimate_tokens(user_prompt)
+        return self._calculate_cost(input_tokens, self.max_tokens)
+
+    def _group_by_conversation(self, tweets: List[Dict]) -> List[List[Dict]]:
+        """
+        Group tweets by conversation, with each author's tweets adjacent.
+
+        Groups keep the order of their first tweet in the input (i.e. risk
+        order). Within a group the thread root comes first, then tweets are
+        ordered by author (root author first) and creation time, so shared
+        thread and author context can be written once per group.
+
+        Args:
+            tweets: List of tweet dictionaries, in priority order
+
+        Returns:
+            List of tweet groups
+        """
+        groups: Dict[str, List[Dict]] = {}
+        for tweet in tweets:
+            key = tweet.get("conversation_id") or tweet.get("tweet_id")
+            groups.setdefault(str(key), []).append(tweet)
+
+        ordered = []
+        for conversation_id, group in groups.items():
+            root_author = next(
+                (
+                    tweet.get("author_username")
+                    for tweet in group
+                    if tweet.get("tweet_id") == conversation_id
+                ),
+                None,
+            )
+            author_rank: Dict[str, int] = {}
+            for tweet in group:
+                author_rank.setdefault(tweet.get("author_username"), len(author_rank))
+            if root_author is not None:
+                author_rank[root_author] = -1
+
+            ordered.append(
+                sorted(
+                    group,
+                    key=lambda tweet: (
+                        author_rank[tweet.get("author_username")],
+                        tweet.get("tweet_id") != conversation_id,
+                        tweet.get("created_at") or "",
+                    ),
                 )
-                time.sleep(wait_time)
+            )
+
+        return ordered
+
+    def _build_batches(self, tweets: List[Dict], batch_size: int) -> List[List[Dict]]:
+        """
+        Split prioritized tweets into batches, keeping threads together.
 
-        logger.error(f"✗ Max retries ({max_retries}) exceeded for batch. Skipping.")
-        return []
+        Urgent tweets (see PriorityScheduler) come first, in batches of at
+        most claude.priority.urgent_batch_size. With group_conversations
+        enabled, a conversation group among the other tweets is never split
+        unless it is larger than batch_size; a group that does not fit in the
+        current batch starts the next one. Otherwise tweets are sliced in
+        order.
+
+        Args:
+            tweets: List of tweet dictionaries, in priority order
+            batch_size: Maximum tweets per batch
+
+        Returns:
+            List of batches
+        """
+        urgent, tweets = self.scheduler.split_urgent(tweets)
+        urgent_size = min(self.scheduler.urgent_batch_size or batch_size, batch_size)
+        batches = [
+            urgent[i : i + urgent_size] for i in range(0, len(urgent), urgent_size)
+        ]
+
+        if not self.group_conversations:
+            return batches + [
+                tweets[i : i + batch_size] for i in range(0, len(tweets), batch_size)
+            ]
+
+        current: List[Dict] = []
+        for group in self._group_by_conversation(tweets):
+            if current and len(current) + len(group) > batch_size:
+                batches.append(current)
+                current = []
+            for i in range(0, len(group), batch_size):
+                chunk = group[i : i + batch_size]
+                if len(current) + len(chunk) > batch_size:
+                    batches.append(current)
+                    current = []
+                current.extend(chunk)
+        if current:
+            batches.append(current)
+
+        return batches
 
     def _build_user_prompt(self, batch_size: int, formatted_tweets: str) -> str:
         """Build comprehensive user prompt for batch analysis."""
@@ -482,23 +1200,23 @@ For EACH tweet, provide detailed multi-product classification:
    - Extract phrases matching: airdrop, farm, farming, token, TGE, scam, rugpull, ponzi, fraud, slippage, front-run, guaranteed profits, financial advice
 
 === URGENCY & ACTIONABILITY ===
+Judge urgency and actionability from the tweet's content only; reach and engagement are applied separately.
+
 8. urgency: LOW, MEDIUM, HIGH
-   - HIGH: Scam accusations, platform failures preventing use, viral negative, affiliate violations
+   - HIGH: Scam accusations, platform failures preventing use, affiliate violations
    - MEDIUM: Execution failures, fee complaints, subscription cancellations
    - LOW: Feature requests, minor bugs, general questions
 
 9. actionable: true/false
-   - true: Requires immediate team response (scam claims, platform failures, affiliate violations, viral negative)
+   - true: Requires immediate team response (scam claims, platform failures, affiliate violations)
    - false: Routine monitoring
 
 === ADDITIONAL CONTEXT ===
 10. summary: One clear sentence capturing the tweet's essence
 11. competitive_mentions: Array of competitors mentioned (Arkham, Dune, Etherscan, 1inch, 0x, Uniswap, etc.)
-12. is_viral: true/false (engagement > 100 OR author followers > 10k)
-13. is_influencer: true/false (author followers > 50k OR verified account)
 
 === STRATEGIC CATEGORIZATION ===
-14. strategic_category: Executive-level classification:
+12. strategic_category: Executive-level classification:
    - "STRATEGIC_WIN" - Major validation, viral praise, competitive advantage
    - "ADOPTION_SIGNAL" - New users, app downloads, first trades
    - "CRITICAL_FUD" - Scam accusations, platform failures, viral negative
@@ -525,8 +1243,6 @@ Example structure:
     "actionable": true,
     "summary": "User complaining about high slippage on Nansen Trading execution",
     "competitive_mentions": [],
-    "is_viral": false,
-    "is_influencer": false,
     "strategic_category": "EXECUTION_ISSUE"
   }}
 ]
@@ -546,25 +1262,149 @@ NO MARKDOWN. PURE JSON ARRAY ONLY."""
         Returns:
             Formatted string with all tweet details
         """
-        formatted = []
+        return "\n".join(text for text, _ in self._prompt_sections(tweets))
+
+    def _prompt_sections(self, tweets: List[Dict]) -> List[Tuple[str, List[int]]]:
+        """
+        Lay out a batch as prompt sections.
+
+        Consecutive tweets from one conversation share a thread header (with
+        the root tweet's text when it is known but not in the batch), and
+        consecutive tweets by one author in that thread share an author line,
+        so this context is written once per group instead of once per tweet.
+        Tweet numbering is unchanged: "Tweet N" is the tweet's position in
+        the batch.
+
+        Args:
+            tweets: List of tweet dictionaries, in prompt order
+
+        Returns:
+            List of (section text, indices of the tweets it belongs to)
+        """
+        sections: List[Tuple[str, List[int]]] = []
+        batch_ids = {tweet.get("tweet_id") for tweet in tweets}
+
+        start = 0
+        while start < len(tweets):
+            conversation_id = tweets[start].get("conversation_id")
+            end = start + 1
+            while (
+                conversation_id
+                and end < len(tweets)
+                and tweets[end].get("conversation_id") == conversation_id
+            ):
+                end += 1
+
+            root_text = tweets[start].get("conversation_root_text")
+            show_root = bool(root_text) and conversation_id not in batch_ids
+            if self.group_conversations and (end - start > 1 or show_root):
+                header = (
+                    f"--- Thread: Tweets {start + 1}-{end} (context only, "
+                    f"not a tweet to analyze) ---"
+                    if end - start > 1
+                    else f"--- Thread of Tweet {start + 1} (context only, "
+                    f"not a tweet to analyze) ---"
+                )
+                if show_root:
+                    root_author = tweets[start].get("conversation_root_author")
+                    header += (
+                        f"\nRoot tweet by @{root_author or 'unknown'}: "
+                        f"{self._format_text(root_text)}"
+                    )
+                sections.append((header, list(range(start, end))))
+
+            author_start = start
+            while author_start < end:
+                author = tweets[author_start].get("author_username")
+                author_end = author_start + 1
+                while (
+                    author_end < end
+                    and tweets[author_end].get("author_username") == author
+                ):
+                    author_end += 1
+
+                shared_author = (
+                    self.group_conversations and author_end - author_start > 1
+                )
+                if shared_author:
+                    sections.append(
+                        (
+                            f"Author of Tweets {author_start + 1}-{author_end}: "
+                            f"{self._format_author(tweets[author_start])}",
+                            list(range(author_start, author_end)),
+                        )
+                    )
+                for i in range(author_start, author_end):
+                    sections.append(
+                        (
+                            self._format_tweet_block(
+                                i + 1, tweets[i], include_author=not shared_author
+                            ),
+                            [i],
+                        )
+                    )
+                author_start = author_end
+
+            start = end
+
+        return sections
+
+    def _format_author(self, tweet: Dict) -> str:
+        """Format a tweet's author with reach and verification badge."""
+        followers = tweet.get("author_followers", 0) or 0
+        verified_badge = "✓" if tweet.get("is_verified", False) else ""
+        username = tweet.get("author_username", "unknown")
+
+        if self.prompt_layout == "compact":
+            return (
+                f"@{username} ({format_number(followers)} followers) "
+                f"{verified_badge}"
+            ).rstrip()
+        return f"@{username} ({followers:,} followers) {verified_badge}"
+
+    def _format_text(self, text: str) -> str:
+        """Tweet or root text as sent to Claude under the current layout."""
+        if self.prompt_layout == "compact":
+            return " ".join(remove_urls(text or "", f" {LINK_PLACEHOLDER} ").split())
+        return text
+
+    def _format_tweet_block(
+        self, number: int, tweet: Dict, include_author: bool = True
+    ) -> str:
+        """
+        Format a single tweet's block in the prompt.
+
+        Args:
+            number: 1-based position of the tweet in the batch
+            tweet: Tweet dictionary
+            include_author: Whether to include the author line (omitted when
+                a shared author line precedes the block)
+
+        Returns:
+            Formatted tweet block
+        """
+        engagement = tweet.get("engagement", {})
+        total_engagement = engagement.get("total", 0)
+        author_line = (
+            f"Author: {self._format_author(tweet)}\n" if include_author else ""
+        )
 
-        for i, tweet in enumerate(tweets, 1):
-            engagement = tweet.get("engagement", {})
-            total_engagement = engagement.get("total", 0)
-            followers = tweet.get("author_followers", 0)
-            verified_badge = "✓" if tweet.get("is_verified", False) else ""
+        if self.prompt_layout == "compact":
+            return (
+                f"Tweet {number}:\n"
+                f"Text: {self._format_text(tweet.get('text', ''))}\n"
+                f"{author_line}"
+                f"Engagement: {engagement.get('likes', 0)} likes, "
+                f"{engagement.get('retweets', 0)} RTs, "
+                f"{engagement.get('replies', 0)} replies\n"
+            )
 
-            formatted.append(
-                f"""Tweet {i}:
+        return f"""Tweet {number}:
 Text: {tweet.get('text', '')}
-Author: @{tweet.get('author_username', 'unknown')} ({followers:,} followers) {verified_badge}
-Engagement: {engagement.get('likes', 0)} likes, {engagement.get('retweets', 0)} RTs, {engagement.get('replies', 0)} replies (Total: {total_engagement})
+{author_line}Engagement: {engagement.get('likes', 0)} likes, {engagement.get('retweets', 0)} RTs, {engagement.get('replies', 0)} replies (Total: {total_engagement})
 URL: {tweet.get('url', '')}
 Created: {tweet.get('created_at', '')}
 """
-            )
-
-        return "\n".join(formatted)
 
     def _parse_response(self, response_text: str) -> List[Dict]:
         """
@@ -598,6 +1438,46 @@ Created: {tweet.get('created_at', '')}
             logger.debug(f"Response text: {response_text[:500]}...")
             return []
 
+    def _match_analyses(self, analyses: List[Dict], count: int) -> List[Dict]:
+        """
+        Line parsed analyses up with the tweets of a batch.
+
+        Objects are placed by their "tweet_number"; objects without a usable
+        number fill the remaining slots by response position. Numbers outside
+        the batch (e.g. an object for a "context only" thread root) and
+        repeated numbers are dropped, so one stray object cannot shift the
+        labels of the tweets after it.
+
+        Args:
+            analyses: Parsed analyses, in response order
+            count: Number of tweets in the batch
+
+        Returns:
+            One analysis per tweet, in prompt order ({} where none was returned)
+        """
+        matched: List[Optional[Dict]] = [None] * count
+        unnumbered = []
+        for position, analysis in enumerate(analyses):
+            if not isinstance(analysis, dict):
+                continue
+            number = analysis.get("tweet_number")
+            if isinstance(number, bool) or not isinstance(number, (int, str)):
+                unnumbered.append((position, analysis))
+                continue
+            try:
+                index = int(number) - 1
+            except ValueError:
+                unnumbered.append((position, analysis))
+                continue
+            if 0 <= index < count and matched[index] is None:
+                matched[index] = analysis
+
+        for position, analysis in unnumbered:
+            if position < count and matched[position] is None:
+                matched[position] = analysis
+
+        return [analysis if analysis is not None else {} for analysis in matched]
+
     def _validate_analysis(self, analysis: Dict, tweet: Dict) -> Dict:
         """
         Validate and apply defaults to analysis results.
@@ -685,7 +1565,7 @@ Created: {tweet.get('created_at', '')}
 
     def _calculate_cost(self, input_tokens: int, output_tokens: int) -> float:
         """
-        Calculate API cost for token usage.
+        Calculate API cost for token usage at self.model's pricing.
 
         Args:
             input_tokens: Number of input tokens
@@ -694,10 +1574,168 @@ Created: {tweet.get('created_at', '')}
         Returns:
             Estimated cost in USD
         """
-        input_cost = (input_tokens / 1_000_000) * SONNET_4_5_INPUT_PRICE
-        output_cost = (output_tokens / 1_000_000) * SONNET_4_5_OUTPUT_PRICE
+        input_price, output_price = MODEL_PRICING.get(
+            self.model, (SONNET_4_5_INPUT_PRICE, SONNET_4_5_OUTPUT_PRICE)
+        )
+        input_cost = (input_tokens / 1_000_000) * input_price
+        output_cost = (output_tokens / 1_000_000) * output_price
         return input_cost + output_cost
 
+    def measure_prompt_tokens(
+        self, tweets: List[Dict], batch_size: int = 15
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Estimate prompt tokens per tweet under each prompt layout.
+
+        Batches are built exactly as analyze_tweets would build them; no
+        requests are sent.
+
+        Args:
+            tweets: List of tweet dictionaries (e.g. a tweets_raw_*.json file)
+            batch_size: Tweets per batch
+
+        Returns:
+            Per layout: estimated input tokens per tweet for the whole prompt
+            ("prompt") and for the tweet blocks and headers only ("tweets")
+        """
+        batches = self._build_batches(self.scheduler.order(tweets), batch_size)
+        fixed_tokens = estimate_tokens(self.SYSTEM_PROMPT)
+        configured_layout = self.prompt_layout
+        stats = {}
+
+        try:
+            for layout in PROMPT_LAYOUTS:
+                self.prompt_layout = layout
+                prompt_tokens = 0
+                tweet_tokens = 0
+                for batch in batches:
+                    formatted = self._format_tweets_for_prompt(batch)
+                    tweet_tokens += estimate_tokens(formatted)
+                    prompt_tokens += fixed_tokens + estimate_tokens(
+                        self._build_user_prompt(len(batch), formatted)
+                    )
+                stats[layout] = {
+                    "prompt": round(prompt_tokens / max(len(tweets), 1), 1),
+                    "tweets": round(tweet_tokens / max(len(tweets), 1), 1),
+                }
+        finally:
+            self.prompt_layout = configured_layout
+
+        return stats
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get cache hit/miss counters accumulated by analyze_tweets.
+
+        Returns:
+            Dictionary with hits, misses and hit_rate (0-1)
+        """
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / lookups, 4) if lookups else 0.0,
+            "revalidations": dict(self.cache_revalidations),
+        }
+
+    def export_cache(self, snapshot_path: str, max_days: int = 7) -> int:
+        """
+        Export still-valid cache entries to a compressed snapshot.
+
+        The snapshot is gzip-compressed compact JSON so it can be stored as a
+        CI artifact or cache entry and restored on a fresh runner.
+
+        Args:
+            snapshot_path: Destination path (e.g. logs/sentiment_cache.json.gz)
+            max_days: Only entries cached within this many days are exported
+
+        Returns:
+            Number of entries exported
+
+        Example:
+            >>> analyzer.export_cache("logs/sentiment_cache.json.gz")
+            412
+        """
+        cache = self._load_cache()
+        entries = {
+            tweet_id: item
+            for tweet_id, item in cache.items()
+            if self._is_cache_valid(item, max_days)
+        }
+
+        snapshot = {
+            "version": 1,
+            "exported_at": datetime.utcnow().isoformat(),
+            "max_age_days": max_days,
+            "entries": entries,
+        }
+
+        path = Path(snapshot_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+
+        logger.info(
+            f"💾 Exported {len(entries)}/{len(cache)} cache entries to {snapshot_path}"
+        )
+        return len(entries)
+
+    def import_cache(self, snapshot_path: str, max_days: int = 7) -> int:
+        """
+        Merge a compressed cache snapshot into the local cache file.
+
+        Entries that have expired since export are dropped. When a tweet exists
+        both locally and in the snapshot, the more recently validated entry wins.
+
+        Args:
+            snapshot_path: Path to a snapshot written by export_cache
+            max_days: Maximum entry age in days
+
+        Returns:
+            Number of entries imported (0 if the snapshot is missing or invalid)
+        """
+        path = Path(snapshot_path)
+        if not path.exists():
+            logger.info(f"No cache snapshot found at {snapshot_path}")
+            return 0
+
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            entries = snapshot.get("entries", {})
+        except Exception as e:
+            logger.warning(f"Failed to read cache snapshot {snapshot_path}: {e}")
+            return 0
+
+        cache = self._load_cache()
+        imported = 0
+
+        for tweet_id, item in entries.items():
+            if not self._is_cache_valid(item, max_days):
+                continue
+
+            existing = cache.get(tweet_id)
+            validated = self._last_validated(item)
+            if existing and self._last_validated(existing) >= validated:
+                continue
+
+            cache[tweet_id] = item
+            imported += 1
+
+        if imported:
+            self._save_cache(cache)
+
+        logger.info(
+            f"✓ Imported {imported} cache entries from {snapshot_path} "
+            f"({len(cache)} entries in cache)"
+        )
+        return imported
+
+    def _usage_tokens(self, usage: Any, field: str) -> int:
+        """Read an optional integer token counter from response.usage."""
+        value = getattr(usage, field, 0)
+        return value if isinstance(value, int) else 0
+
     def _load_cache(self) -> Dict:
         """Load sentiment cache from file."""
         if not self.cache_file.exists():
@@ -721,10 +1759,114 @@ Created: {tweet.get('created_at', '')}
         except Exception as e:
             logger.error(f"Failed to save cache: {e}")
 
+    def _new_cache_entry(self, analysis: Dict, tweet: Dict) -> Dict:
+        """
+        Build a cache entry with the snapshot needed to revalidate it later.
+
+        Args:
+            analysis: Validated analysis for the tweet
+            tweet: Tweet as it was when analyzed
+
+        Returns:
+            Cache entry dictionary
+        """
+        now = datetime.utcnow().isoformat()
+        return {
+            "analysis": analysis,
+            "cached_at": now,
+            "validated_at": now,
+            "engagement_total": self._engagement_total(tweet),
+            "prompt_fingerprint": self.prompt_fingerprint,
+        }
+
+    def _revalidation_reason(self, cache_item: Dict, tweet: Dict) -> Optional[str]:
+        """
+        Why a cached analysis must be re-analyzed for the tweet, if at all.
+
+        An entry is re-analyzed when the prompt fingerprint changed, when
+        engagement grew by at least engagement_growth_factor and by at least
+        min_engagement_increase since the snapshot, or when it has not been
+        revalidated for max_age_days.
+
+        Args:
+            cache_item: Cached entry
+            tweet: Tweet as fetched in this run
+
+        Returns:
+            "prompt_changed", "engagement_growth" or "expired", or None if
+            the cached analysis can be used
+        """
+        current_total = self._engagement_total(tweet)
+        snapshot_total = cache_item.get("engagement_total")
+        fingerprint = cache_item.get("prompt_fingerprint")
+
+        if fingerprint is not None and fingerprint != self.prompt_fingerprint:
+            return "prompt_changed"
+        if (
+            snapshot_total is not None
+            and current_total - snapshot_total >= self.min_engagement_increase
+            and current_total >= snapshot_total * self.engagement_growth_factor
+        ):
+            return "engagement_growth"
+        if not self._is_cache_valid(cache_item, self.cache_max_age_days):
+            return "expired"
+        return None
+
+    def _revalidate_cache_entry(self, cache_item: Dict, tweet: Dict) -> bool:
+        """
+        Decide whether a cached analysis can be reused for the tweet.
+
+        Reused entries have their life extended (see _revalidation_reason).
+        Entries from before snapshots were stored are accepted and stamped.
+
+        Args:
+            cache_item: Cached entry (updated in place when extended)
+            tweet: Tweet as fetched in this run
+
+        Returns:
+            True if the cached analysis can be used
+        """
+        reason = self._revalidation_reason(cache_item, tweet)
+        if reason:
+            self.cache_revalidations[reason] = (
+                self.cache_revalidations.get(reason, 0) + 1
+            )
+            logger.debug(f"Re-analyzing cached tweet {tweet.get('tweet_id')}: {reason}")
+            return False
+
+        cache_item["validated_at"] = datetime.utcnow().isoformat()
+        cache_item.setdefault("prompt_fingerprint", self.prompt_fingerprint)
+        if cache_item.get("engagement_total") is None:
+            cache_item["engagement_total"] = self._engagement_total(tweet)
+        return True
+
+    def _engagement_total(self, tweet: Dict) -> int:
+        """Total engagement of a tweet as fetched."""
+        return tweet.get("engagement", {}).get(
+            "total", calculate_total_engagement(tweet)
+        )
+
+    def _prompt_fingerprint(self) -> str:
+        """Short hash of the model, prompt template and layout used for analyses."""
+        template = (
+            self.model
+            + self.SYSTEM_PROMPT
+            + self._build_user_prompt(0, "")
+            + self.prompt_layout
+        )
+        return hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+    def _last_validated(self, cache_item: Dict) -> str:
+        """ISO timestamp an entry's age counts from (last revalidation)."""
+        return cache_item.get("validated_at") or cache_item.get("cached_at", "")
+
     def _is_cache_valid(self, cache_item: Dict, max_days: int = 7) -> bool:
         """
         Check if cached item is still valid.
 
+        Age counts from the last revalidation, so entries that keep being
+        confirmed on cache hits live on.
+
         Args:
             cache_item: Cached item dictionary
             max_days: Maximum age in days (default: 7)
@@ -733,7 +1875,7 @@ Created: {tweet.get('created_at', '')}
             True if cache is valid, False otherwise
         """
         try:
-            cached_at = datetime.fromisoformat(cache_item.get("cached_at", ""))
+            cached_at = datetime.fromisoformat(self._last_validated(cache_item))
             age = datetime.utcnow() - cached_at
             return age.days < max_days
         except Exception:
@@ -0,0 +1,319 @@
+"""Shadow evaluation of an alternate Claude model or prompt layout."""
+
+import copy
+import json
+import logging
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from pathlib import Path
+
+from utils import calculate_percentile
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Labels compared between the production and shadow analyses
+COMPARED_FIELDS = ["sentiment", "strategic_category", "urgency"]
+
+# Run summaries kept in the summary file
+MAX_SUMMARIES = 100
+
+
+class ShadowEvaluator:
+    """
+    Sends a sample of batches to an alternate model or prompt layout.
+
+    The shadow request for a batch is sent concurrently with the production
+    request and never changes the production results, the cache or the
+    report. Once both have answered, their labels are compared per tweet.
+    Shadow requests are billed, so they are recorded in the cost ledger
+    and reserved against the run's cost governor like production batches,
+    with budget_usd as a further cap on shadow spend alone. Their cost is
+    kept in stats["shadow_cost_usd"], apart from the production analyzer's
+    totals. Agreement, latency and cost per tweet for both sides are
+    written to a summary file at the end of the run.
+    """
+
+    def __init__(
+        self,
+        analyzer: Any,
+        model: Optional[str] = None,
+        prompt_layout: Optional[str] = None,
+        sample_rate: float = 0.2,
+        budget_usd: float = 0.5,
+        summary_file: str = "logs/shadow_eval.json",
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize shadow evaluator.
+
+        Args:
+            analyzer: Production SentimentAnalyzer
+            model: Shadow model (defaults to the production model)
+            prompt_layout: Shadow prompt layout (defaults to the production one)
+            sample_rate: Share of batches that are shadowed (0-1)
+            budget_usd: Worst-case spend allowed on shadow requests per run
+                (within the run's cost governor limit)
+            summary_file: JSON file the run summaries are appended to
+            seed: Random seed for batch sampling
+        """
+        # A shallow copy shares the client and ledger but formats prompts
+        # and prices tokens with the shadow model and layout
+        self.shadow = copy.copy(analyzer)
+        self.shadow.model = model or analyzer.model
+        self.shadow.prompt_layout = prompt_layout or analyzer.prompt_layout
+        self.shadow.shadow = None
+        self.production_model = analyzer.model
+        self.production_layout = analyzer.prompt_layout
+        self.sample_rate = sample_rate
+        self.budget_usd = budget_usd
+        self.summary_file = Path(summary_file)
+        self.committed_usd = 0.0
+        self.stats = {
+            "batches_shadowed": 0,
+            "batches_skipped_budget": 0,
+            "shadow_errors": 0,
+            "shadow_parse_failures": 0,
+            "tweets_compared": 0,
+            "production_tweets": 0,
+            "shadow_tweets": 0,
+            "agreements": {field: 0 for field in COMPARED_FIELDS},
+            "production_cost_usd": 0.0,
+            "shadow_cost_usd": 0.0,
+        }
+        self.production_latencies: List[float] = []
+        self.shadow_latencies: List[float] = []
+        self._futures: List[Future] = []
+        self._random = random.Random(seed)
+        self._executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="claude-shadow"
+        )
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict, analyzer: Any) -> Optional["ShadowEvaluator"]:
+        """
+        Build an evaluator from the claude.shadow section of config.yaml.
+
+        Args:
+            config: Full configuration dictionary
+            analyzer: Production SentimentAnalyzer
+
+        Returns:
+            Configured ShadowEvaluator, or None if shadow mode is disabled
+        """
+        shadow = config.get("claude", {}).get("shadow", {})
+        if not shadow.get("enabled", False):
+            return None
+
+        return cls(
+            analyzer,
+            model=shadow.get("model"),
+            prompt_layout=shadow.get("prompt_layout"),
+            sample_rate=shadow.get("sample_rate", 0.2),
+            budget_usd=shadow.get("budget_usd", 0.5),
+            summary_file=shadow.get("summary_file", "logs/shadow_eval.json"),
+        )
+
+    def submit(self, tweets: List[Dict]) -> Optional[Future]:
+        """
+        Maybe send a batch to the shadow model.
+
+        Args:
+            tweets: Tweets in the production batch, in prompt order
+
+        Returns:
+            Future resolving to the shadow results (None if the request
+            failed), or None if the batch was not sampled or the shadow
+            budget or the run's cost limit is spent
+        """
+        if self._random.random() >= self.sample_rate:
+            return None
+
+        estimated_cost = self.shadow._estimate_batch_cost(tweets)
+        with self._lock:
+            if self.committed_usd + estimated_cost > self.budget_usd:
+                self.stats["batches_skipped_budget"] += 1
+                return None
+            if not self.shadow.cost_governor.reserve(estimated_cost):
+                self.stats["batches_skipped_budget"] += 1
+                return None
+            self.committed_usd += estimated_cost
+            self.stats["batches_shadowed"] += 1
+
+        future = self._executor.submit(self._run, tweets, estimated_cost)
+        with self._lock:
+            self._futures.append(future)
+        return future
+
+    def compare_when_done(
+        self,
+        future: Future,
+        results: List[Dict],
+        latency: float,
+        cost: float,
+    ) -> None:
+        """
+        Compare production results with the shadow's once it has answered.
+
+        Args:
+            future: Future returned by submit()
+            results: Production results for the batch
+            latency: Production request latency in seconds
+            cost: Production cost of the batch in USD
+        """
+        with self._lock:
+            self.production_latencies.append(latency)
+            self.stats["production_tweets"] += len(results)
+            self.stats["production_cost_usd"] += cost
+        future.add_done_callback(lambda done: self._compare(done, results))
+
+    def finish(self, timeout: Optional[float] = 120) -> Dict:
+        """
+        Wait for outstanding shadow requests and write the run summary.
+
+        Args:
+            timeout: Maximum seconds to wait for shadow requests
+
+        Returns:
+            Run summary dictionary
+        """
+        with self._lock:
+            futures = list(self._futures)
+        _, pending = wait(futures, timeout=timeout)
+        if pending:
+            logger.warning(f"👥 {len(pending)} shadow requests still running")
+        # Workers also run the comparison callbacks, so let them finish
+        self._executor.shutdown(wait=not pending)
+
+        summary = self.summary()
+        self._write_summary(summary)
+        return summary
+
+    def summary(self) -> Dict:
+        """Agreement, latency and cost comparison for this run."""
+        with self._lock:
+            stats = copy.deepcopy(self.stats)
+            production_latencies = list(self.production_latencies)
+            shadow_latencies = list(self.shadow_latencies)
+
+        compared = stats["tweets_compared"]
+        agreement = {
+            field: round(count / compared, 4) if compared else None
+            for field, count in stats.pop("agreements").items()
+        }
+        production_per_tweet = stats["production_cost_usd"] / max(
+            stats["production_tweets"], 1
+        )
+        shadow_per_tweet = stats["shadow_cost_usd"] / max(stats["shadow_tweets"], 1)
+
+        def percentiles(latencies: List[float]) -> Dict[str, float]:
+            return {
+                f"p{p}": round(calculate_percentile(latencies, p), 3) for p in (50, 95)
+            }
+
+        production_latency = percentiles(production_latencies)
+        shadow_latency = percentiles(shadow_latencies)
+
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "production": {
+                "model": self.production_model,
+                "prompt_layout": self.production_layout,
+            },
+            "shadow": {
+                "model": self.shadow.model,
+                "prompt_layout": self.shadow.prompt_layout,
+            },
+            **stats,
+            "agreement": agreement,
+            "latency_seconds": {
+                "production": production_latency,
+                "shadow": shadow_latency,
+                "delta_p50": round(
+                    shadow_latency["p50"] - production_latency["p50"], 3
+                ),
+            },
+            "cost_per_tweet_usd": {
+                "production": round(production_per_tweet, 6),
+                "shadow": round(shadow_per_tweet, 6),
+                "delta_pct": (
+                    round((shadow_per_tweet / production_per_tweet - 1) * 100, 1)
+                    if production_per_tweet
+                    else None
+                ),
+            },
+        }
+
+    def _run(self, tweets: List[Dict], estimated_cost: float) -> Optional[List[Dict]]:
+        """Send the shadow request for a batch (runs on a worker thread)."""
+        user_prompt = self.shadow._build_user_prompt(
+            len(tweets), self.shadow._format_tweets_for_prompt(tweets)
+        )
+        try:
+            response, latency = self.shadow._send_request(user_prompt, "shadow")
+        except Exception as e:
+            logger.warning(f"👥 Shadow request failed ({type(e).__name__}): {e}")
+            self.shadow.cost_governor.settle(estimated_cost, 0.0)
+            with self._lock:
+                self.committed_usd -= estimated_cost
+                self.stats["shadow_errors"] += 1
+            return None
+
+        cost = self.shadow._record_usage(response, latency, "shadow")
+        self.shadow.cost_governor.settle(estimated_cost, cost)
+        with self._lock:
+            self.committed_usd += cost - estimated_cost
+            self.stats["shadow_cost_usd"] += cost
+            self.stats["shadow_tweets"] += len(tweets)
+            self.shadow_latencies.append(latency)
+
+        parsed = self.shadow._parse_response(response.content[0].text)
+        analyses = self.shadow._match_analyses(parsed, len(tweets))
+        if len(parsed) != len(tweets) or not all(analyses):
+            with self._lock:
+                self.stats["shadow_parse_failures"] += 1
+
+        results = [
+            {
+                "original_tweet": tweet,
+                "analysis": self.shadow._validate_analysis(analyses[i], tweet),
+            }
+            for i, tweet in enumerate(tweets)
+        ]
+        self.shadow._apply_engagement_signals(results)
+        return results
+
+    def _compare(self, future: Future, production: List[Dict]) -> None:
+        """Count label agreement between production and shadow results."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        shadow = future.result()
+        if not shadow or not production:
+            return
+
+        with self._lock:
+            for ours, theirs in zip(production, shadow):
+                self.stats["tweets_compared"] += 1
+                for field in COMPARED_FIELDS:
+                    if ours["analysis"].get(field) == theirs["analysis"].get(field):
+                        self.stats["agreements"][field] += 1
+
+    def _write_summary(self, summary: Dict) -> None:
+        """Append the run summary to the summary file."""
+        history = []
+        if self.summary_file.exists():
+            try:
+                with open(self.summary_file, "r") as f:
+                    history = json.load(f)
+            except Exception as e:
+                logger.warning(f"Starting a new shadow summary file: {e}")
+
+        history = (history + [summary])[-MAX_SUMMARIES:]
+        self.summary_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.summary_file, "w") as f:
+            json.dump(history, f, indent=2)
+        logger.info(f"👥 Shadow evaluation summary written to {self.summary_file}")
@@ -198,6 +198,54 @@ Please check logs for more details."""
             logger.error(f"Error sending error notification: {e}")
             return False
 
+    def send_urgent_alert(self, result: Dict) -> bool:
+        """
+        Send an immediate alert for a single analyzed tweet.
+
+        Used by the fast path, before the daily report is ready.
+
+        Args:
+            result: Analyzed tweet from SentimentAnalyzer
+
+        Returns:
+            True if sent successfully
+        """
+        if self.method == "none":
+            logger.warning("No Slack credentials configured. Skipping urgent alert.")
+            return False
+
+        tweet = result.get("original_tweet", {})
+        analysis = result.get("analysis", {})
+        text = tweet.get("text", "")
+        if len(text) > 280:
+            text = text[:280] + "..."
+        verified_badge = " ✓" if tweet.get("is_verified", False) else ""
+
+        message = f"""🚨 Urgent Nansen mention: {analysis.get('strategic_category', 'UNKNOWN')} ({analysis.get('urgency', 'LOW')} urgency)
+━━━━━━━━━━
+@{tweet.get('author_username', 'unknown')}{verified_badge} · {tweet.get('author_followers', 0):,} followers · {tweet.get('engagement', {}).get('total', 0):,} engagement
+> {text}
+
+{analysis.get('summary', '')}
+<{tweet.get('url', '')}|View tweet>"""
+
+        if self.mention_user_id:
+            message = self._add_team_mention(
+                message, analysis.get("strategic_category", "urgent mention")
+            )
+
+        try:
+            if self.method == "webhook":
+                return self._post_with_webhook(message)
+            elif self.method == "bot":
+                posted = self._post_with_bot(message)
+                return posted is not None
+            return False
+
+        except Exception as e:
+            logger.error(f"Error sending urgent alert: {e}")
+            return False
+
     def _format_message_1(self, report: Dict) -> str:
         """
         Format summary message (Message 1).
@@ -359,7 +407,10 @@ Overall Sentiment: {score:.0f}/100 {trend_emoji}"""
             "%Y-%m-%d %H:%M UTC"
         )
         cost = metadata.get("total_api_cost", 0.0)
-        sections.append(f"📊 Generated at {timestamp} | Cost: ${cost:.4f}")
+        hit_rate = metadata.get("cache_hit_rate", 0.0)
+        sections.append(
+            f"📊 Generated at {timestamp} | Cost: ${cost:.4f} | Cache hits: {hit_rate:.0%}"
+        )
 
         message = "\n".join(sections)
 
@@ -690,6 +741,11 @@ Overall Sentiment: {score:.0f}/100 {trend_emoji}"""
         strategic = report["raw_data"]["strategic_highlights"]
         negative_tweets = report["raw_data"].get("all_negative_tweets", [])
 
+        # Check spikes flagged by the rollup spike detector
+        anomalies = report["raw_data"].get("anomalies", [])
+        if anomalies:
+            return (True, anomalies[0]["message"])
+
         # Check critical FUD count
         critical_fud = strategic.get("critical_fud", 0)
         if critical_fud > 5:
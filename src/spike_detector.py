@@ -0,0 +1,255 @@
+"""Online spike detection on hourly rollups (negative share, critical FUD, volume)."""
+
+import json
+import logging
+import math
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from rollups import HOUR, HOUR_KEY_FORMAT, RollupBucket, RollupStore
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bucket metrics with a learned baseline, and the smallest standard
+# deviation assumed for each so a flat history does not turn noise into
+# huge z-scores (volume uses the Poisson sqrt(mean) when larger)
+METRIC_STD_FLOORS = {
+    "negative_share": 0.05,
+    "critical_fud_rate": 0.02,
+    "volume": 2.0,
+}
+
+METRIC_LABELS = {
+    "negative_share": "Negative share",
+    "critical_fud_rate": "Critical FUD rate",
+    "volume": "Mention volume",
+}
+
+# Bumped when the saved detector state layout changes
+DETECTOR_VERSION = 1
+
+
+class EwmaBaseline:
+    """
+    Exponentially weighted mean and variance of one metric.
+
+    Each update is O(1) and the state is three numbers, so the baseline can
+    follow months of buckets and drift with them.
+    """
+
+    def __init__(self, mean: float = 0.0, var: float = 0.0, count: int = 0):
+        """
+        Initialize baseline.
+
+        Args:
+            mean: Current weighted mean
+            var: Current weighted variance
+            count: Number of observations so far
+        """
+        self.mean = mean
+        self.var = var
+        self.count = count
+
+    def zscore(self, value: float, std_floor: float) -> float:
+        """Deviation of a value from the baseline, in standard deviations."""
+        return (value - self.mean) / max(math.sqrt(self.var), std_floor)
+
+    def update(self, value: float, alpha: float) -> None:
+        """
+        Fold one observation into the baseline.
+
+        Args:
+            value: Observed value
+            alpha: Weight of the new observation (0-1)
+        """
+        if not self.count:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            increment = alpha * diff
+            self.mean += increment
+            self.var = (1 - alpha) * (self.var + diff * increment)
+        self.count += 1
+
+
+class SpikeDetector:
+    """
+    Flags hourly buckets whose metrics jump above their learned baseline.
+
+    Consumes completed hourly rollup buckets in order, scores negative
+    share, critical FUD rate and mention volume against EWMA baselines,
+    then folds them in. A bucket is flagged when a metric is more than
+    z_threshold standard deviations above its baseline (after
+    warmup_buckets), or its negative share exceeds
+    monitoring.negative_spike_threshold, so a FUD wave is reported for
+    the first hour it shows up in. Shares are only scored for buckets with
+    at least min_bucket_tweets tweets. The state is saved between runs.
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Initialize spike detector, loading any saved state.
+
+        Args:
+            config: Monitoring configuration (monitoring section of config.yaml)
+        """
+        config = config or {}
+        detection = config.get("spike_detection", {})
+        self.alert_on_negative_spike = config.get("alert_on_negative_spike", True)
+        self.negative_spike_threshold = config.get("negative_spike_threshold", 0.5)
+        self.alpha = detection.get("alpha", 0.1)
+        self.z_threshold = detection.get("z_threshold", 3.0)
+        self.warmup_buckets = detection.get("warmup_buckets", 24)
+        self.min_bucket_tweets = detection.get("min_bucket_tweets", 5)
+        self.state_file = Path(detection.get("state_file", "logs/spike_detector.json"))
+
+        self.baselines = {metric: EwmaBaseline() for metric in METRIC_STD_FLOORS}
+        self.last_bucket: Optional[str] = None
+        self._load()
+
+    def update(self, bucket_start: datetime, bucket: RollupBucket) -> List[Dict]:
+        """
+        Score one hourly bucket, then add it to the baselines.
+
+        Args:
+            bucket_start: Start of the hour (UTC)
+            bucket: The hour's rollup (empty for an hour without tweets)
+
+        Returns:
+            List of alert dictionaries (empty if nothing stands out)
+        """
+        values = {"volume": float(bucket.tweets)}
+        if bucket.tweets >= self.min_bucket_tweets:
+            values["negative_share"] = bucket.negative_share
+            values["critical_fud_rate"] = bucket.critical_fud / bucket.tweets
+
+        alerts = []
+        for metric, value in values.items():
+            baseline = self.baselines[metric]
+            std_floor = METRIC_STD_FLOORS[metric]
+            if metric == "volume":
+                std_floor = max(std_floor, math.sqrt(max(baseline.mean, 0.0)))
+            zscore = baseline.zscore(value, std_floor)
+
+            reason = None
+            if baseline.count >= self.warmup_buckets and zscore >= self.z_threshold:
+                reason = f"{zscore:.1f}σ above baseline"
+            if metric == "negative_share":
+                if not self.alert_on_negative_spike:
+                    reason = None
+                elif value > self.negative_spike_threshold:
+                    reason = f"above {self.negative_spike_threshold:.0%}"
+
+            if reason:
+                alerts.append(
+                    self._alert(bucket_start, bucket, metric, value, zscore, reason)
+                )
+            baseline.update(value, self.alpha)
+
+        self.last_bucket = bucket_start.strftime(HOUR_KEY_FORMAT)
+        return alerts
+
+    def process(
+        self, rollups: RollupStore, now: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        Score every completed hour not seen yet, oldest first.
+
+        Hours without tweets count as zero volume. On the first run the
+        detector starts at the oldest hourly bucket.
+
+        Args:
+            rollups: Rollup store with the hourly buckets
+            now: Reference UTC time (default: current UTC time)
+
+        Returns:
+            Alerts from all processed hours
+        """
+        now = now or datetime.utcnow()
+        end = now.replace(minute=0, second=0, microsecond=0)
+        window_start = end - timedelta(days=rollups.hourly_days)
+
+        if self.last_bucket:
+            start = datetime.strptime(self.last_bucket, HOUR_KEY_FORMAT) + HOUR
+        else:
+            existing = rollups.buckets(window_start, end)
+            if not existing:
+                return []
+            start = existing[0][0]
+        start = max(start, window_start)
+
+        buckets = dict(rollups.buckets(start, end))
+        alerts = []
+        current = start
+        while current < end:
+            alerts.extend(self.update(current, buckets.get(current, RollupBucket())))
+            current += HOUR
+
+        for alert in alerts:
+            logger.warning(f"📈 {alert['message']}")
+        return alerts
+
+    def save(self) -> None:
+        """Write baselines and the last processed hour to the state file."""
+        data = {
+            "version": DETECTOR_VERSION,
+            "last_bucket": self.last_bucket,
+            "baselines": {
+                metric: {"mean": b.mean, "var": b.var, "count": b.count}
+                for metric, b in self.baselines.items()
+            },
+        }
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.state_file, "w") as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            logger.error(f"Failed to save spike detector state: {e}")
+
+    def _alert(
+        self,
+        bucket_start: datetime,
+        bucket: RollupBucket,
+        metric: str,
+        value: float,
+        zscore: float,
+        reason: str,
+    ) -> Dict:
+        """Build an alert dictionary with a one-line message."""
+        baseline = self.baselines[metric].mean
+        if metric == "volume":
+            shown = f"{value:.0f} tweets (baseline {baseline:.1f})"
+        else:
+            shown = f"{value:.0%} (baseline {baseline:.0%})"
+        return {
+            "bucket": bucket_start.strftime(HOUR_KEY_FORMAT),
+            "metric": metric,
+            "value": round(value, 4),
+            "baseline": round(baseline, 4),
+            "zscore": round(zscore, 2),
+            "tweets": bucket.tweets,
+            "message": (
+                f"{METRIC_LABELS[metric]} spike at "
+                f"{bucket_start.strftime('%b %d %H:00')} UTC: {shown}, {reason}"
+            ),
+        }
+
+    def _load(self) -> None:
+        """Load saved state, starting fresh if the file is missing or stale."""
+        if not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, "r") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load spike detector state: {e}")
+            return
+        if data.get("version") != DETECTOR_VERSION:
+            return
+
+        self.last_bucket = data.get("last_bucket")
+        for metric, saved in data.get("baselines", {}).items():
+            if metric in self.baselines:
+                self.baselines[metric] = EwmaBaseline(**saved)
@@ -0,0 +1,200 @@
+"""Append-only store of per-run summary metrics for sentiment trend queries."""
+
+import json
+import logging
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Report raw_data["summary"] fields kept per run
+SUMMARY_METRICS = [
+    "total_tweets",
+    "positive_count",
+    "negative_count",
+    "negative_pct",
+    "sentiment_score",
+]
+
+# Report raw_data["strategic_highlights"] fields kept per run
+HIGHLIGHT_METRICS = [
+    "strategic_wins",
+    "adoption_signals",
+    "critical_fud",
+    "affiliate_violations",
+    "influencer_mentions",
+]
+
+
+class TrendStore:
+    """
+    Time series of report summary metrics, one JSON line per run.
+
+    Each run appends a few numbers (counts, sentiment score, strategic
+    highlights) keyed by the report's generated_at timestamp, so rolling
+    windows over weeks of runs are answered from a small file instead of
+    re-opening every report_*.json. Entries are loaded once and kept
+    sorted, and window queries bisect on the timestamp.
+    """
+
+    def __init__(self, store_file: str = "logs/trend_store.jsonl"):
+        """
+        Initialize trend store.
+
+        Args:
+            store_file: Path to the JSON Lines store file
+        """
+        self.store_file = Path(store_file)
+        self.store_file.parent.mkdir(parents=True, exist_ok=True)
+        self._entries: Optional[List[Dict]] = None
+        self._timestamps: List[str] = []
+
+    def record(self, report: Dict) -> Optional[Dict]:
+        """
+        Append a report's summary metrics.
+
+        Args:
+            report: Report dictionary from SentimentAggregator
+
+        Returns:
+            The recorded entry, or None if the report has no timestamp or
+            tweets (an empty run's score of 0 would skew the average), or a
+            run with the same timestamp is already stored
+        """
+        entry = self._entry_from_report(report)
+        if entry is None or not entry.get("total_tweets"):
+            return None
+
+        self._load()
+        position = bisect_left(self._timestamps, entry["timestamp"])
+        if (
+            position < len(self._timestamps)
+            and self._timestamps[position] == entry["timestamp"]
+        ):
+            return None
+
+        try:
+            with open(self.store_file, "a") as f:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        except Exception as e:
+            logger.error(f"Failed to write trend store entry: {e}")
+            return None
+
+        self._timestamps.insert(position, entry["timestamp"])
+        self._entries.insert(position, entry)
+        return entry
+
+    def backfill(self, report_files: Iterable[str]) -> int:
+        """
+        Record saved report_*.json files, e.g. to seed a new store.
+
+        Reports already in the store are skipped, so backfilling is safe to
+        repeat.
+
+        Args:
+            report_files: Paths to report JSON files
+
+        Returns:
+            Number of reports added
+        """
+        added = 0
+        for report_file in report_files:
+            try:
+                with open(report_file, "r") as f:
+                    report = json.load(f)
+            except Exception as e:
+                logger.warning(f"Skipping {report_file}: {e}")
+                continue
+            if self.record(report):
+                added += 1
+
+        if added:
+            logger.info(f"Backfilled {added} reports into {self.store_file}")
+        return added
+
+    def entries(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        Get stored runs, oldest first, optionally limited to a time range.
+
+        Args:
+            since: Only return runs at or after this UTC time
+            until: Only return runs before this UTC time
+
+        Returns:
+            List of entry dictionaries
+        """
+        self._load()
+        start = bisect_left(self._timestamps, since.isoformat()) if since else 0
+        end = (
+            bisect_left(self._timestamps, until.isoformat())
+            if until
+            else len(self._timestamps)
+        )
+        return self._entries[start:end]
+
+    def values(
+        self, metric: str, days: float, now: Optional[datetime] = None
+    ) -> List[float]:
+        """
+        Get one metric over a rolling window.
+
+        Args:
+            metric: Entry field, e.g. "sentiment_score" or "critical_fud"
+            days: Window length in days
+            now: End of the window (default: current UTC time)
+
+        Returns:
+            Metric values of the runs in the window, oldest first
+        """
+        now = now or datetime.utcnow()
+        return [
+            entry[metric]
+            for entry in self.entries(now - timedelta(days=days), now)
+            if metric in entry
+        ]
+
+    def _entry_from_report(self, report: Dict) -> Optional[Dict]:
+        """Extract the stored metrics from a report."""
+        timestamp = report.get("metadata", {}).get("generated_at")
+        if not timestamp:
+            return None
+
+        raw_data = report.get("raw_data", {})
+        summary = raw_data.get("summary", {})
+        highlights = raw_data.get("strategic_highlights", {})
+        entry = {"timestamp": timestamp}
+        entry.update({m: summary[m] for m in SUMMARY_METRICS if m in summary})
+        entry.update({m: highlights[m] for m in HIGHLIGHT_METRICS if m in highlights})
+        return entry
+
+    def _load(self) -> None:
+        """Read the store file once and sort it by timestamp."""
+        if self._entries is not None:
+            return
+
+        entries = []
+        if self.store_file.exists():
+            with open(self.store_file, "r") as f:
+                for line_number, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(
+                            f"Skipping corrupt trend store line {line_number}"
+                        )
+                        continue
+                    if "timestamp" in entry:
+                        entries.append(entry)
+
+        # Keep one entry per run; concurrent runs may append out of order
+        by_timestamp = {entry["timestamp"]: entry for entry in entries}
+        self._timestamps = sorted(by_timestamp)
+        self._entries = [by_timestamp[t] for t in self._timestamps]
@@ -4,7 +4,7 @@ import os
 import logging
 import time
 import tweepy
-from typing import List, Dict, Optional, Any
+from typing import Callable, List, Dict, Optional, Any
 from datetime import datetime, timedelta
 
 
@@ -87,7 +87,11 @@ class TwitterClient:
             logger.error(f"✗ Unexpected error during authentication: {e}")
             return False
 
-    def search_mentions(self, hours: int = 24) -> List[Dict[str, Any]]:
+    def search_mentions(
+        self,
+        hours: int = 24,
+        on_page: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Search for tweets mentioning Nansen or related keywords.
 
@@ -95,6 +99,9 @@ class TwitterClient:
 
         Args:
             hours: Number of hours to look back (default: 24)
+            on_page: Optional callback receiving each page's tweets as soon as
+                the page is fetched (e.g. the alert fast path); errors it
+                raises are logged and do not stop the search
 
         Returns:
             List of tweet dictionaries with structured data including engagement metrics
@@ -139,8 +146,13 @@ class TwitterClient:
                                 "public_metrics",
                                 "entities",
                                 "conversation_id",
+                                "referenced_tweets",
+                            ],
+                            expansions=[
+                                "author_id",
+                                "referenced_tweets.id",
+                                "referenced_tweets.id.author_id",
                             ],
-                            expansions=["author_id"],
                             user_fields=[
                                 "username",
                                 "name",
@@ -204,6 +216,13 @@ class TwitterClient:
                 if response.includes and "users" in response.includes:
                     users = {user.id: user for user in response.includes["users"]}
 
+                # Referenced tweets (e.g. the thread root a reply answers)
+                included_tweets = {}
+                if response.includes and "tweets" in response.includes:
+                    included_tweets = {
+                        str(t.id): t for t in response.includes["tweets"]
+                    }
+
                 # Process tweets
                 page_tweets = []
                 for tweet in response.data:
@@ -236,6 +255,12 @@ class TwitterClient:
                     # Extract matched keywords
                     mentioned_keywords = self._extract_keywords(tweet.text)
 
+                    # Thread context: root tweet text when it was expanded
+                    conversation_id = getattr(tweet, "conversation_id", None)
+                    conversation_id = str(conversation_id or tweet.id)
+                    root = included_tweets.get(conversation_id)
+                    root_author = users.get(root.author_id) if root else None
+
                     tweet_data = {
                         "tweet_id": str(tweet.id),
                         "text": tweet.text,
@@ -257,11 +282,22 @@ class TwitterClient:
                         "is_verified": is_verified,
                         "author_followers": author_followers,
                         "mentioned_keywords": mentioned_keywords,
+                        "conversation_id": conversation_id,
+                        "conversation_root_text": root.text if root else None,
+                        "conversation_root_author": (
+                            root_author.username if root_author else None
+                        ),
                     }
 
                     page_tweets.append(tweet_data)
 
                 all_tweets.extend(page_tweets)
+
+                if on_page and page_tweets:
+                    try:
+                        on_page(page_tweets)
+                    except Exception as e:
+                        logger.error(f"on_page callback failed: {e}", exc_info=True)
                 logger.info(
                     f"✓ Page {page}: Retrieved {len(page_tweets)} tweets (Total: {len(all_tweets)})"
                 )
@@ -3,10 +3,11 @@
 import os
 import json
 import logging
+import math
 import re
 import yaml
 from typing import Dict, List, Tuple, Optional, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -232,6 +233,71 @@ def calculate_cost(input_tokens: int, output_tokens: int) -> float:
     return round(input_cost + output_cost, 4)
 
 
+def estimate_tokens(text: str) -> int:
+    """
+    Conservatively estimate the Claude token count of a piece of text.
+
+    Uses ~3 UTF-8 bytes per token, which over-counts typical English text
+    (~4 characters per token) and accounts for emoji and non-Latin scripts,
+    so budget checks built on it err on the side of caution.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Estimated token count
+
+    Example:
+        >>> estimate_tokens("Nansen Mobile is great")
+        8
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text.encode("utf-8")) / 3)
+
+
+def apportion(total: int, weights: List[float]) -> List[int]:
+    """
+    Split an integer total in proportion to weights, summing exactly to total.
+
+    Uses the largest-remainder method: every share is floored, and the units
+    lost to rounding go to the shares with the largest fractional parts
+    (earlier entries win ties). Zero or missing weights fall back to an even
+    split.
+
+    Args:
+        total: Integer amount to split (e.g. tokens from response.usage)
+        weights: Non-negative weight per share
+
+    Returns:
+        List of integer shares, one per weight
+
+    Example:
+        >>> apportion(10, [1, 1, 1])
+        [4, 3, 3]
+        >>> apportion(100, [30, 10])
+        [75, 25]
+    """
+    if not weights:
+        return []
+
+    weights = [max(0.0, float(w)) for w in weights]
+    weight_sum = sum(weights)
+    if weight_sum <= 0:
+        weights = [1.0] * len(weights)
+        weight_sum = float(len(weights))
+
+    exact = [total * w / weight_sum for w in weights]
+    shares = [int(math.floor(x)) for x in exact]
+    leftover = total - sum(shares)
+
+    by_remainder = sorted(range(len(weights)), key=lambda i: (shares[i] - exact[i], i))
+    for i in by_remainder[:leftover]:
+        shares[i] += 1
+
+    return shares
+
+
 # ============================================================================
 # Text Processing
 # ============================================================================
@@ -294,12 +360,13 @@ def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
     return truncated + suffix
 
 
-def remove_urls(text: str) -> str:
+def remove_urls(text: str, replacement: str = "") -> str:
     """
     Remove HTTP/HTTPS URLs from text.
 
     Args:
         text: Input text
+        replacement: String to put in place of each URL
 
     Returns:
         Text with URLs removed
@@ -307,8 +374,10 @@ def remove_urls(text: str) -> str:
     Example:
         >>> remove_urls("Check out https://example.com for more info")
         'Check out  for more info'
+        >>> remove_urls("Nansen https://t.co/abc", "[link]")
+        'Nansen [link]'
     """
-    return URL_PATTERN.sub("", text)
+    return URL_PATTERN.sub(replacement, text)
 
 
 # ============================================================================
@@ -392,6 +461,31 @@ def parse_twitter_timestamp(timestamp: str) -> str:
         return timestamp
 
 
+def parse_created_at(created_at: str) -> Optional[datetime]:
+    """
+    Parse a tweet's created_at into a naive UTC datetime.
+
+    Args:
+        created_at: ISO 8601 timestamp, e.g. "2026-01-09T09:24:15+00:00"
+
+    Returns:
+        Naive UTC datetime, or None if missing or unparseable
+
+    Example:
+        >>> parse_created_at("2025-01-09T14:30:45.000Z")
+        datetime.datetime(2025, 1, 9, 14, 30, 45)
+    """
+    if not created_at:
+        return None
+    try:
+        parsed = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
 def get_time_range_string(hours: int) -> str:
     """
     Generate human-readable time range string.
@@ -836,6 +930,37 @@ def calculate_median(numbers: List[float]) -> float:
         return sorted_nums[n // 2]
 
 
+def calculate_percentile(numbers: List[float], percentile: float) -> float:
+    """
+    Calculate a percentile with linear interpolation between ranks.
+
+    Args:
+        numbers: List of numbers
+        percentile: Percentile between 0 and 100
+
+    Returns:
+        Percentile value or 0 if empty list
+
+    Example:
+        >>> calculate_percentile([1, 2, 3, 4, 5], 50)
+        3.0
+        >>> calculate_percentile([1, 2, 3, 4], 95)
+        3.85
+    """
+    if not numbers:
+        return 0.0
+
+    sorted_nums = sorted(numbers)
+    rank = (len(sorted_nums) - 1) * max(0.0, min(100.0, percentile)) / 100
+    lower = int(math.floor(rank))
+    upper = min(lower + 1, len(sorted_nums) - 1)
+    fraction = rank - lower
+
+    return float(
+        sorted_nums[lower] + (sorted_nums[upper] - sorted_nums[lower]) * fraction
+    )
+
+
 def calculate_weighted_average(values: List[float], weights: List[float]) -> float:
     """
     Calculate weighted average.
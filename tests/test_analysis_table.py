@@ -0,0 +1,95 @@
+"""Tests for the columnar analysis table."""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+
+def make_analyzed_tweets(n, seed=3):
+    """Random analyzed tweets, including unknown labels and repeated themes."""
+    rng = random.Random(seed)
+    themes = ["scam_accusations", "mobile_app_praise", "fee_complaints", "new_theme"]
+    products = ["nansen_mobile", "ai_insights", "nansen_points", "unknown_product"]
+    tweets = []
+    for i in range(n):
+        tweets.append(
+            {
+                "tweet_id": str(i),
+                "original_tweet": {
+                    "url": f"https://x.com/user/status/{i}",
+                    "author_username": f"user{i}",
+                    "text": f"tweet {i}",
+                    "engagement": {"total": rng.randint(0, 500)},
+                },
+                "analysis": {
+                    "sentiment": rng.choice(
+                        ["POSITIVE", "NEGATIVE", "NEUTRAL", "MIXED", "UNSURE"]
+                    ),
+                    "confidence": rng.randint(0, 100),
+                    "strategic_category": rng.choice(
+                        ["STRATEGIC_WIN", "CRITICAL_FUD", "ROUTINE_NEGATIVE", "OTHER"]
+                    ),
+                    "urgency": rng.choice(["HIGH", "MEDIUM", "LOW"]),
+                    "themes": rng.choices(themes, k=rng.randint(0, 3)),
+                    "product_mentions": rng.choices(products, k=rng.randint(0, 2)),
+                    "is_influencer": rng.random() < 0.2,
+                },
+            }
+        )
+    return tweets
+
+
+class TestAnalysisTable:
+    """Test cases for AnalysisTable."""
+
+    def test_matches_dict_aggregation(self):
+        """Test vectorized reductions match SentimentAggregator's results."""
+        from aggregator import AggregateState, SentimentAggregator
+        from analysis_table import AnalysisTable
+
+        tweets = make_analyzed_tweets(500)
+        table = AnalysisTable.from_tweets(tweets)
+        state = AggregateState.from_tweets(tweets)
+        report = SentimentAggregator().aggregate(tweets)["raw_data"]
+
+        assert len(table) == 500
+        assert table.sentiment_score() == pytest.approx(state.sentiment_score)
+        summary = dict(report["summary"])
+        summary.pop("trend")
+        assert table.summary() == summary
+        assert table.product_mentions() == state.product_mentions
+        assert table.strategic_highlights() == state.strategic_highlights
+        assert table.theme_counts(negative=False) == state.theme_counts["positive"]
+        assert table.theme_counts(negative=True) == state.theme_counts["negative"]
+
+    def test_from_files_counts_each_tweet_once(self, tmp_path):
+        """Test a tweet analyzed in two runs is counted once, latest wins."""
+        from aggregator import AggregateState
+        from analysis_table import AnalysisTable
+
+        first, second = make_analyzed_tweets(3), make_analyzed_tweets(3, seed=4)
+        (tmp_path / "a.json").write_text(json.dumps(first))
+        (tmp_path / "b.json").write_text(json.dumps(second[:1]))
+
+        table = AnalysisTable.from_files([tmp_path / "a.json", tmp_path / "b.json"])
+
+        assert len(table) == 3
+        assert table.sentiment_score() == pytest.approx(
+            AggregateState.from_tweets(second[:1] + first[1:]).sentiment_score
+        )
+
+    def test_empty_table(self):
+        """Test an empty table reduces to zeros."""
+        from analysis_table import AnalysisTable
+
+        table = AnalysisTable.from_tweets([])
+
+        assert table.sentiment_score() == 0.0
+        assert table.theme_counts(negative=True) == {}
+        assert table.product_mentions()["nansen_mobile"] == 0
@@ -0,0 +1,90 @@
+"""Tests for the in-run cost governor."""
+
+import json
+import sys
+import threading
+import pytest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cost_governor import CostGovernor
+
+
+class TestCostGovernor:
+    """Test cases for CostGovernor."""
+
+    def test_from_config(self):
+        """Test limits are read from claude.cost_limits."""
+        config = {
+            "claude": {"cost_limits": {"max_per_run_usd": 1.5, "warn_threshold_usd": 1}}
+        }
+        governor = CostGovernor.from_config(config)
+
+        assert governor.max_per_run_usd == 1.5
+        assert governor.warn_threshold_usd == 1
+
+    def test_reserve_and_settle(self):
+        """Test reservations are replaced by actual spend."""
+        governor = CostGovernor(max_per_run_usd=1.0)
+
+        assert governor.reserve(0.6) is True
+        assert governor.reserve(0.6) is False
+        assert governor.rejected_batches == 1
+
+        governor.settle(0.6, 0.2)
+        assert governor.spent_usd == 0.2
+        assert governor.reserve(0.6) is True
+        assert governor.remaining_usd == pytest.approx(0.2)
+
+    def test_concurrent_reservations_never_exceed_limit(self):
+        """Test concurrent dispatchers cannot overcommit the budget."""
+        governor = CostGovernor(max_per_run_usd=1.0)
+        granted = []
+
+        def worker():
+            if governor.reserve(0.03):
+                granted.append(1)
+                governor.settle(0.03, 0.03)
+
+        threads = [threading.Thread(target=worker) for _ in range(100)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(granted) == 33
+        assert governor.spent_usd <= 1.0
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_analyzer_stops_at_budget(self, mock_anthropic, tmp_path):
+        """Test the analyzer stops dispatching and reports unanalyzed tweets."""
+        from sentiment_analyzer import SentimentAnalyzer
+
+        config = {
+            "claude": {"max_tokens": 1000, "cost_limits": {"max_per_run_usd": 0.03}},
+            "sentiment": {"urgent_keywords": ["scam"]},
+        }
+        analyzer = SentimentAnalyzer(api_key="test_api_key", config=config)
+        analyzer.cache_file = tmp_path / "cache.json"
+
+        response = Mock()
+        response.content = [Mock(text=json.dumps([{"sentiment": "NEGATIVE"}]))]
+        response.usage = Mock(input_tokens=2000, output_tokens=300)
+        analyzer.client.messages.create.return_value = response
+
+        tweets = [
+            {"tweet_id": "1", "text": "Nansen app looks nice"},
+            {"tweet_id": "2", "text": "Nansen is a scam"},
+            {"tweet_id": "3", "text": "Trying Nansen trading"},
+        ]
+
+        with patch("sentiment_analyzer.time.sleep"):
+            results = analyzer.analyze_tweets(tweets, batch_size=1, use_cache=False)
+
+        # Only the riskiest tweet fits in the budget
+        assert [r["tweet_id"] for r in results] == ["2"]
+        assert [t["tweet_id"] for t in analyzer.unanalyzed_tweets] == ["1", "3"]
+        assert analyzer.total_cost <= 0.03
@@ -0,0 +1,130 @@
+"""Tests for the persistent Claude cost ledger."""
+
+import json
+import sys
+import pytest
+from pathlib import Path
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cost_ledger import CostLedger
+
+
+def write_entries(ledger, entries):
+    """Write raw ledger entries with explicit timestamps."""
+    with open(ledger.ledger_file, "a") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+class TestCostLedger:
+    """Test cases for CostLedger."""
+
+    def test_record_and_load(self, tmp_path):
+        """Test entries are appended and read back in order."""
+        ledger = CostLedger(str(tmp_path / "ledger.jsonl"))
+        ledger.record("run-1", "claude", 1000, 200, 1.23456, 0.006)
+        ledger.record("run-1", "claude", 0, 0, 0.5, 0.0, status="error:APIError")
+
+        entries = ledger.load_entries()
+        assert len(entries) == 2
+        assert entries[0]["input_tokens"] == 1000
+        assert entries[0]["latency_seconds"] == 1.235
+        assert entries[1]["status"] == "error:APIError"
+
+    def test_corrupt_lines_are_skipped(self, tmp_path):
+        """Test a truncated line does not break loading."""
+        ledger = CostLedger(str(tmp_path / "ledger.jsonl"))
+        ledger.record("run-1", "claude", 10, 10, 0.1, 0.01)
+        with open(ledger.ledger_file, "a") as f:
+            f.write('{"timestamp": "2025\n')
+
+        assert len(ledger.load_entries()) == 1
+
+    def test_check_budget_rolling_windows(self, tmp_path):
+        """Test daily and monthly caps use rolling windows."""
+        ledger = CostLedger(str(tmp_path / "ledger.jsonl"))
+        now = datetime(2025, 1, 31, 12, 0, 0)
+        write_entries(
+            ledger,
+            [
+                {"timestamp": (now - timedelta(days=40)).isoformat(), "cost_usd": 50.0},
+                {"timestamp": (now - timedelta(days=10)).isoformat(), "cost_usd": 8.0},
+                {"timestamp": (now - timedelta(hours=2)).isoformat(), "cost_usd": 3.0},
+            ],
+        )
+
+        assert ledger.check_budget(5.0, 20.0, now=now) == (True, "")
+
+        within, reason = ledger.check_budget(3.0, 20.0, now=now)
+        assert within is False
+        assert "Daily budget" in reason
+
+        within, reason = ledger.check_budget(5.0, 11.0, now=now)
+        assert within is False
+        assert "Monthly budget" in reason
+
+        assert ledger.remaining_budget(5.0, 20.0, now=now) == pytest.approx(2.0)
+        assert ledger.remaining_budget(None, None, now=now) is None
+
+    def test_summary_distributions(self, tmp_path):
+        """Test summary totals, percentiles and per-model breakdown."""
+        ledger = CostLedger(str(tmp_path / "ledger.jsonl"))
+        for i in range(1, 11):
+            ledger.record(f"run-{i % 2}", "claude", 100, 10, float(i), 0.01 * i)
+        ledger.record("run-1", "claude", 0, 0, 30.0, 0.0, status="error:Timeout")
+
+        summary = ledger.summary(daily_limit_usd=1.0, monthly_limit_usd=10.0)
+
+        assert summary["daily"]["requests"] == 11
+        assert summary["daily"]["cost_usd"] == pytest.approx(0.55)
+        assert summary["daily"]["remaining_usd"] == pytest.approx(0.45)
+        assert summary["monthly"]["input_tokens"] == 1000
+        assert summary["runs"] == 2
+        assert summary["failed_requests"] == 1
+        # Failed requests are excluded from the latency distribution
+        assert summary["latency_seconds"]["p50"] == pytest.approx(5.5)
+        assert summary["latency_seconds"]["p99"] == pytest.approx(9.91)
+        assert summary["by_model"]["claude"]["requests"] == 11
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_analyzer_records_requests(self, mock_anthropic, tmp_path):
+        """Test the analyzer records each request and honours remaining budget."""
+        from sentiment_analyzer import SentimentAnalyzer
+
+        ledger = CostLedger(str(tmp_path / "ledger.jsonl"))
+        ledger.record("earlier-run", "claude", 0, 0, 1.0, 9.5)
+
+        config = {
+            "claude": {"cost_limits": {"max_per_run_usd": 5.0, "max_per_day_usd": 10.0}}
+        }
+        analyzer = SentimentAnalyzer(
+            api_key="test_api_key", config=config, ledger=ledger
+        )
+        analyzer.cache_file = tmp_path / "cache.json"
+        assert analyzer.cost_governor.max_per_run_usd == pytest.approx(0.5)
+
+        response = Mock()
+        response.content = [Mock(text=json.dumps([{"sentiment": "POSITIVE"}]))]
+        response.usage = Mock(
+            input_tokens=1500,
+            output_tokens=100,
+            cache_creation_input_tokens=0,
+            cache_read_input_tokens=1200,
+        )
+        analyzer.client.messages.create.return_value = response
+
+        with patch("sentiment_analyzer.time.sleep"):
+            analyzer.analyze_tweets(
+                [{"tweet_id": "1", "text": "Nansen is great"}], use_cache=False
+            )
+
+        entries = ledger.load_entries()
+        assert len(entries) == 2
+        assert entries[1]["run_id"] == analyzer.run_id
+        assert entries[1]["input_tokens"] == 1500
+        assert entries[1]["cache_read_input_tokens"] == 1200
+        assert entries[1]["cost_usd"] == pytest.approx(analyzer.total_cost)
@@ -0,0 +1,117 @@
+"""Tests for the urgent tweet fast path."""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from fast_path import FastPathAlerter
+
+
+def make_result(tweet, urgency="LOW", category="NEUTRAL_MENTION"):
+    """Build an analyzed result for a tweet."""
+    return {
+        "tweet_id": tweet["tweet_id"],
+        "original_tweet": tweet,
+        "analysis": {
+            "urgency": urgency,
+            "strategic_category": category,
+            "summary": "summary",
+        },
+    }
+
+
+class TestFastPathAlerter:
+    """Test cases for FastPathAlerter."""
+
+    def test_from_config_disabled(self):
+        """Test no alerter is built unless monitoring.fast_path is enabled."""
+        assert FastPathAlerter.from_config({}, Mock(), Mock()) is None
+
+    def test_qualifying_tweets_are_analyzed_and_alerted(self):
+        """Test urgent and influencer tweets are fast-pathed, others are not."""
+        tweets = [
+            {"tweet_id": "1", "text": "Nansen is a SCAM", "author_followers": 10},
+            {"tweet_id": "2", "text": "Nansen app", "author_followers": 90000},
+            {"tweet_id": "3", "text": "Nansen app", "author_followers": 10},
+            {"tweet_id": "4", "text": "scam?", "author_followers": 10},
+        ]
+        analyzer = Mock()
+        analyzer.analyze_urgent_tweet.side_effect = lambda tweet: (
+            make_result(tweet, category="CRITICAL_FUD")
+            if tweet["tweet_id"] == "1"
+            else make_result(tweet)
+        )
+        notifier = Mock()
+        notifier.send_urgent_alert.return_value = True
+
+        alerter = FastPathAlerter(
+            analyzer,
+            notifier,
+            urgent_keywords=["scam"],
+            influencer_followers=50000,
+            skip_tweet=lambda tweet: tweet["tweet_id"] == "4",
+        )
+        assert alerter.submit(tweets) == 2
+        assert alerter.submit(tweets) == 0  # already queued
+        alerts = alerter.wait()
+
+        analyzed = sorted(
+            call.args[0]["tweet_id"]
+            for call in analyzer.analyze_urgent_tweet.call_args_list
+        )
+        assert analyzed == ["1", "2"]
+        assert [a["tweet_id"] for a in alerts] == ["1"]
+        notifier.send_urgent_alert.assert_called_once()
+        summary = alerter.summary()
+        assert summary["tweets_analyzed"] == 2
+        assert summary["alerts_sent"] == 1
+
+    def test_dry_run_and_limit(self):
+        """Test dry run never posts and max_tweets caps fast path requests."""
+        analyzer = Mock()
+        analyzer.analyze_urgent_tweet.side_effect = lambda tweet: make_result(
+            tweet, urgency="HIGH"
+        )
+        notifier = Mock()
+        alerter = FastPathAlerter(
+            analyzer, notifier, urgent_keywords=["hack"], max_tweets=2, dry_run=True
+        )
+
+        alerter.submit([{"tweet_id": str(i), "text": "hacked"} for i in range(5)])
+        alerts = alerter.wait()
+
+        assert len(alerts) == 2
+        notifier.send_urgent_alert.assert_not_called()
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_analyzer_reuses_fast_path_result(self, mock_anthropic, tmp_path):
+        """Test a fast-pathed tweet is not sent to Claude again."""
+        from sentiment_analyzer import SentimentAnalyzer
+
+        analyzer = SentimentAnalyzer(api_key="test_api_key")
+        analyzer.cache_file = tmp_path / "cache.json"
+
+        response = Mock()
+        response.content = [Mock(text=json.dumps([{"sentiment": "NEGATIVE"}]))]
+        response.usage = Mock(input_tokens=1000, output_tokens=100)
+        analyzer.client.messages.create.return_value = response
+
+        tweet = {"tweet_id": "1", "text": "Nansen scam", "engagement": {"total": 3}}
+        assert analyzer.analyze_urgent_tweet(tweet) is not None
+
+        with patch("sentiment_analyzer.time.sleep"):
+            results = analyzer.analyze_tweets([tweet], batch_size=15)
+
+        assert analyzer.client.messages.create.call_count == 1
+        assert results[0]["analysis"]["sentiment"] == "NEGATIVE"
+        assert analyzer.fast_path_results == {}
+
+        # Cached tweets skip the fast path until their engagement takes off
+        reusable = analyzer.cache_reuse_check()
+        assert reusable(tweet)
+        assert not reusable({**tweet, "engagement": {"total": 500}})
+        assert not reusable({**tweet, "tweet_id": "2"})
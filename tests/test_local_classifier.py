@@ -0,0 +1,157 @@
+"""Tests for the local classifier distilled from Claude labels."""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from local_classifier import (
+    LocalClassifier,
+    load_training_examples,
+    tokenize,
+    train_classifier,
+)
+
+POSITIVE = [
+    "Love the Nansen app, smart money alerts are amazing",
+    "Nansen mobile is amazing, love the new portfolio view",
+    "Great alpha from Nansen smart money dashboards, love it",
+]
+NEGATIVE = [
+    "Nansen trading execution is terrible, huge slippage again",
+    "Terrible slippage on Nansen swaps, execution is broken",
+    "Nansen fees are terrible and execution keeps failing",
+]
+
+
+def labelled(tweet_id, text, sentiment, category):
+    """Build an analyzed result like those in tweets_analyzed_*.json."""
+    return {
+        "tweet_id": tweet_id,
+        "original_tweet": {"tweet_id": tweet_id, "text": text},
+        "analysis": {"sentiment": sentiment, "strategic_category": category},
+    }
+
+
+def write_logs(logs_dir):
+    """Write a small labelled dataset in the layout main.py produces."""
+    results = [
+        labelled(f"p{i}", text, "POSITIVE", "ADOPTION_SIGNAL")
+        for i, text in enumerate(POSITIVE)
+    ] + [
+        labelled(f"n{i}", text, "NEGATIVE", "EXECUTION_ISSUE")
+        for i, text in enumerate(NEGATIVE)
+    ]
+    with open(logs_dir / "tweets_analyzed_2025-01-01_000000.json", "w") as f:
+        json.dump(results, f)
+
+    # Cache entries carry no text; it is joined from tweets_raw_*.json
+    with open(logs_dir / "tweets_raw_2025-01-02_000000.json", "w") as f:
+        json.dump([{"tweet_id": "c1", "text": "Nansen is useful for research"}], f)
+    with open(logs_dir / "sentiment_cache.json", "w") as f:
+        json.dump(
+            {
+                "c1": {
+                    "analysis": {
+                        "sentiment": "NEUTRAL",
+                        "strategic_category": "NEUTRAL_MENTION",
+                    }
+                },
+                "c2": {"analysis": {"sentiment": "NEUTRAL"}},
+            },
+            f,
+        )
+
+
+class TestLocalClassifier:
+    """Test cases for the local classifier."""
+
+    def test_tokenize(self):
+        """Test unigram and bigram features ignore case and URLs."""
+        assert tokenize("Nansen is a SCAM https://t.co/x") == [
+            "nansen",
+            "is",
+            "a",
+            "scam",
+            "nansen is",
+            "is a",
+            "a scam",
+        ]
+
+    def test_load_training_examples(self, tmp_path):
+        """Test labels are joined with texts from all log files."""
+        write_logs(tmp_path)
+        examples = load_training_examples(str(tmp_path))
+
+        texts = {text for text, _ in examples}
+        assert len(examples) == 7
+        assert "Nansen is useful for research" in texts
+
+    def test_train_save_load_classify(self, tmp_path):
+        """Test a trained model round-trips and separates the classes."""
+        write_logs(tmp_path)
+        classifier = train_classifier(load_training_examples(str(tmp_path)))
+        assert classifier.metadata["examples"] == 7
+
+        model_file = tmp_path / "model.json"
+        classifier.save(str(model_file))
+        loaded = LocalClassifier.load(str(model_file))
+
+        positive = loaded.classify("love the amazing Nansen app")
+        negative = loaded.classify("terrible slippage and broken execution")
+        assert positive["sentiment"] == "POSITIVE"
+        assert positive["strategic_category"] == "ADOPTION_SIGNAL"
+        assert negative["sentiment"] == "NEGATIVE"
+        assert 0 <= negative["confidence"] <= 100
+
+    def test_load_missing_model(self, tmp_path):
+        """Test a missing model file disables the classifier."""
+        assert LocalClassifier.load(str(tmp_path / "missing.json")) is None
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_analyzer_backend_and_degraded_mode(self, mock_anthropic, tmp_path):
+        """Test confident tweets skip Claude and the rest degrade locally."""
+        from sentiment_analyzer import SentimentAnalyzer
+
+        write_logs(tmp_path)
+        model_file = tmp_path / "model.json"
+        train_classifier(load_training_examples(str(tmp_path))).save(str(model_file))
+
+        config = {
+            "claude": {
+                "cost_limits": {"max_per_run_usd": 0.0},
+                "local_classifier": {
+                    "enabled": True,
+                    "model_file": str(model_file),
+                    "confidence_threshold": 90,
+                },
+            },
+            "sentiment": {"urgent_keywords": ["scam"]},
+        }
+        analyzer = SentimentAnalyzer(api_key="test_api_key", config=config)
+        analyzer.cache_file = tmp_path / "cache.json"
+
+        tweets = [
+            {"tweet_id": "1", "text": "love the amazing Nansen app, love it"},
+            {"tweet_id": "2", "text": "Nansen is a scam"},
+        ]
+        classify = Mock(wraps=analyzer.local_classifier.classify)
+        analyzer.local_classifier.classify = classify
+        results = analyzer.analyze_tweets(tweets, use_cache=False)
+        by_id = {r["tweet_id"]: r["analysis"] for r in results}
+
+        # Each tweet is classified once
+        assert classify.call_count == 2
+
+        # No budget for Claude: nothing is sent, nothing is left unlabelled
+        analyzer.client.messages.create.assert_not_called()
+        assert analyzer.unanalyzed_tweets == []
+        assert by_id["1"]["analyzed_by"] == "local"
+        assert by_id["1"]["degraded"] is False
+        # Urgent keywords are never handled locally unless Claude is unavailable
+        assert by_id["2"]["degraded"] is True
+        assert by_id["2"]["urgency"] == "HIGH"
+        assert analyzer.local_stats == {"local": 1, "degraded": 1}
@@ -0,0 +1,112 @@
+"""Tests for the analysis priority scheduler."""
+
+import sys
+import pytest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from priority_scheduler import PriorityScheduler
+
+
+def make_tweet(tweet_id, text="Nansen app", followers=100, engagement=0, **extra):
+    """Build a minimal tweet dictionary."""
+    return {
+        "tweet_id": tweet_id,
+        "text": text,
+        "author_username": f"user{tweet_id}",
+        "author_followers": followers,
+        "engagement": {"total": engagement},
+        **extra,
+    }
+
+
+class TestPriorityScheduler:
+    """Test cases for PriorityScheduler."""
+
+    def test_from_config(self):
+        """Test weights come from claude.priority and keywords from sentiment."""
+        config = {
+            "claude": {"priority": {"urgent_batch_size": 1, "recency_weight": 2}},
+            "sentiment": {"urgent_keywords": ["SCAM"]},
+        }
+        scheduler = PriorityScheduler.from_config(config)
+
+        assert scheduler.urgent_keywords == ["scam"]
+        assert scheduler.urgent_batch_size == 1
+        assert scheduler.recency_weight == 2
+        assert scheduler.keyword_weight == 10.0
+
+    def test_order_by_risk_signals(self):
+        """Test keywords dominate, then reach, engagement and verification."""
+        scheduler = PriorityScheduler(urgent_keywords=["scam"])
+        tweets = [
+            make_tweet("quiet"),
+            make_tweet("verified", is_verified=True),
+            make_tweet("viral", engagement=500),
+            make_tweet("scam", text="Nansen is a scam"),
+            make_tweet("whale", followers=500000),
+        ]
+
+        ordered = [t["tweet_id"] for t in scheduler.order(tweets)]
+
+        assert ordered == ["scam", "whale", "viral", "verified", "quiet"]
+
+    def test_recency_breaks_ties(self):
+        """Test newer tweets go first and the recency score halves per half-life."""
+        scheduler = PriorityScheduler(recency_half_life_hours=6)
+        now = datetime.now(timezone.utc)
+        old = make_tweet("old", created_at=(now - timedelta(hours=6)).isoformat())
+        new = make_tweet("new", created_at=now.isoformat().replace("+00:00", "Z"))
+
+        assert [t["tweet_id"] for t in scheduler.order([old, new])] == ["new", "old"]
+        assert scheduler.score(new, now) - scheduler.score(old, now) == pytest.approx(
+            0.5
+        )
+        assert scheduler.score(make_tweet("x", created_at="garbage"), now) == (
+            scheduler.score(make_tweet("x"), now)
+        )
+
+    def test_split_urgent(self):
+        """Test urgent tweets are separated and order is preserved."""
+        scheduler = PriorityScheduler(urgent_keywords=["hack"], urgent_score=10)
+        tweets = [
+            make_tweet("1", text="Nansen hack?"),
+            make_tweet("2"),
+            make_tweet("3", followers=10_000_000, engagement=5000),
+        ]
+
+        urgent, rest = scheduler.split_urgent(tweets)
+
+        assert [t["tweet_id"] for t in urgent] == ["1", "3"]
+        assert [t["tweet_id"] for t in rest] == ["2"]
+
+        scheduler.urgent_batch_size = 0
+        assert scheduler.split_urgent(tweets) == ([], tweets)
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_urgent_tweets_get_small_first_batches(self, mock_anthropic):
+        """Test the analyzer sends urgent tweets first in small batches."""
+        from sentiment_analyzer import SentimentAnalyzer
+
+        config = {
+            "claude": {"priority": {"urgent_batch_size": 2}},
+            "sentiment": {"urgent_keywords": ["scam"]},
+        }
+        analyzer = SentimentAnalyzer(api_key="test_api_key", config=config)
+        tweets = [make_tweet(str(i)) for i in range(5)] + [
+            make_tweet(f"s{i}", text="scam alert") for i in range(3)
+        ]
+
+        batches = analyzer._build_batches(
+            analyzer.scheduler.order(tweets), batch_size=15
+        )
+
+        assert [[t["tweet_id"] for t in b] for b in batches] == [
+            ["s0", "s1"],
+            ["s2"],
+            ["0", "1", "2", "3", "4"],
+        ]
@@ -0,0 +1,307 @@
+"""Tests for the offline prompt evaluation harness."""
+
+import json
+import sys
+import urllib.request
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+TWEETS = [
+    {
+        "tweet_id": "1",
+        "text": "Nansen is a scam, lost my funds https://t.co/abc",
+        "author_username": "angry",
+        "author_followers": 120,
+        "engagement": {
+            "likes": 3,
+            "retweets": 1,
+            "replies": 2,
+            "quotes": 0,
+            "total": 6,
+        },
+    },
+    {
+        "tweet_id": "2",
+        "text": "Nansen mobile is great",
+        "author_username": "fan",
+        "author_followers": 800,
+        "engagement": {
+            "likes": 9,
+            "retweets": 0,
+            "replies": 0,
+            "quotes": 0,
+            "total": 9,
+        },
+    },
+]
+
+REFERENCE = [
+    {
+        "tweet_id": "1",
+        "analysis": {
+            "sentiment": "NEGATIVE",
+            "strategic_category": "CRITICAL_FUD",
+            "urgency": "HIGH",
+            "analyzed_at": "2026-01-09T17:25:55",
+        },
+    },
+    {
+        "tweet_id": "2",
+        "analysis": {
+            "sentiment": "POSITIVE",
+            "strategic_category": "STRATEGIC_WIN",
+            "urgency": "LOW",
+        },
+    },
+]
+
+
+class HttpClient:
+    """Minimal messages client posting to the fake server over HTTP."""
+
+    def __init__(self, api_key, base_url, max_retries=0):
+        self.base_url = base_url
+        self.messages = self
+
+    def create(self, **kwargs):
+        request = urllib.request.Request(
+            f"{self.base_url}/v1/messages",
+            data=json.dumps(kwargs).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            body = json.load(response)
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=body["content"][0]["text"])],
+            usage=SimpleNamespace(**body["usage"]),
+        )
+
+
+def write_archive(tmp_path):
+    """Write raw and analyzed files for one saved run."""
+    raw_file = tmp_path / "tweets_raw_2026-01-09_172555.json"
+    raw_file.write_text(json.dumps(TWEETS))
+    reference_file = tmp_path / "tweets_analyzed_2026-01-09_172555.json"
+    reference_file.write_text(json.dumps(REFERENCE))
+    return raw_file, reference_file
+
+
+class TestFakeAnthropicServer:
+    """Test cases for FakeAnthropicServer."""
+
+    def test_anthropic_client_reads_response(self):
+        """Test the Anthropic SDK accepts the fake server's messages."""
+        from anthropic import Anthropic
+        from prompt_eval import FakeAnthropicServer
+
+        def responder(body):
+            assert body["messages"][0]["content"] == "hello"
+            return {"text": "[]", "usage": {"input_tokens": 12, "output_tokens": 3}}
+
+        with FakeAnthropicServer(responder) as server:
+            client = Anthropic(api_key="eval", base_url=server.url, max_retries=0)
+            response = client.messages.create(
+                model="claude-sonnet-4-5-20250929",
+                max_tokens=100,
+                system="system",
+                messages=[{"role": "user", "content": "hello"}],
+            )
+
+        assert response.content[0].text == "[]"
+        assert response.usage.input_tokens == 12
+        assert server.requests == 1
+
+
+class TestRunEval:
+    """Test cases for replaying saved tweets through prompt variants."""
+
+    def test_default_reference_file(self, tmp_path):
+        """Test the same run's analyzed file is the default reference."""
+        from prompt_eval import reference_file_for
+
+        raw_file, reference_file = write_archive(tmp_path)
+
+        assert reference_file_for(str(raw_file)) == str(reference_file)
+        assert reference_file_for(str(tmp_path / "tweets_raw_missing.json")) is None
+
+    @patch("prompt_eval.Anthropic", HttpClient)
+    def test_replay_metrics(self, tmp_path):
+        """Test tokens, parse failures and agreement are reported per variant."""
+        from prompt_eval import build_variant_analyzer, run_eval
+        from sentiment_analyzer import request_key
+
+        raw_file, reference_file = write_archive(tmp_path)
+
+        # Record an unparseable answer for the full layout's only request
+        analyzer = build_variant_analyzer({}, {"prompt_layout": "full"})
+        batch = analyzer._build_batches(analyzer.scheduler.order(TWEETS), 15)[0]
+        user_prompt = analyzer._build_user_prompt(
+            len(batch), analyzer._format_tweets_for_prompt(batch)
+        )
+        recordings_file = tmp_path / "eval_recordings.json"
+        recordings_file.write_text(
+            json.dumps(
+                {
+                    request_key(analyzer.model, analyzer.SYSTEM_PROMPT, user_prompt): {
+                        "text": "Sorry, I can't help with that.",
+                        "usage": {"input_tokens": 900, "output_tokens": 10},
+                        "latency_seconds": 4.0,
+                    }
+                }
+            )
+        )
+
+        with patch("sentiment_analyzer.time.sleep"):
+            report = run_eval(
+                {},
+                str(raw_file),
+                str(reference_file),
+                str(recordings_file),
+            )
+
+        compact, full = report["compact"], report["full"]
+        assert compact["responses"] == {"recorded": 0, "synthesized": 1}
+        assert compact["parse_failure_rate"] == 0.0
+        # Synthesized answers echo the reference, so they are not compared
+        assert compact["agreement"]["strategic_category"] is None
+        assert compact["reference_tweets"] == 0
+        assert compact["input_tokens_per_tweet"] > 0
+
+        assert full["responses"] == {"recorded": 1, "synthesized": 0}
+        assert full["parse_failure_rate"] == 1.0
+        assert full["input_tokens_per_tweet"] == 450.0
+        assert full["output_tokens_per_tweet"] == 5.0
+        assert full["agreement"]["strategic_category"] == 0.0
+        assert full["reference_tweets"] == 2
+        assert full["recorded_latency_seconds"] == {"p50": 4.0, "p95": 4.0}
+
+    def test_batches_pinned_to_archive_time(self):
+        """Test replay batches do not depend on how old the archive is."""
+        from prompt_eval import archive_time, build_variant_analyzer
+
+        tweets = [
+            {**TWEETS[1], "created_at": "2026-01-09T05:25:55Z"},
+            {**TWEETS[0], "created_at": "2026-01-09T17:25:55Z"},
+        ]
+        for tweet, engagement in zip(tweets, (3, 0)):
+            tweet["author_followers"] = 100
+            tweet["engagement"] = {**tweet["engagement"], "total": engagement}
+        now = archive_time(tweets)
+        assert now.isoformat() == "2026-01-09T17:25:55+00:00"
+
+        # At archive time the newer tweet outranks the more engaged one...
+        analyzer = build_variant_analyzer({}, {"prompt_layout": "full"}, now=now)
+        assert [t["tweet_id"] for t in analyzer.scheduler.order(tweets)] == ["1", "2"]
+
+        # ...which flips once recency has decayed for both
+        analyzer.scheduler.now = None
+        assert [t["tweet_id"] for t in analyzer.scheduler.order(tweets)] == ["2", "1"]
+
+
+def terse_user_prompt(analyzer, tweet_count, formatted_tweets):
+    """Prompt hook keeping only the tweets and the answer format."""
+    return f"Classify these {tweet_count} tweets as a JSON array.\n\n{formatted_tweets}"
+
+
+def padded_user_prompt(analyzer, tweet_count, formatted_tweets):
+    """Prompt hook adding a long preamble to the built-in prompt."""
+    preamble = "Read every tweet carefully before answering. " * 50
+    return preamble + analyzer.__class__._build_user_prompt(
+        analyzer, tweet_count, formatted_tweets
+    )
+
+
+class TestPromptHooks:
+    """Test cases for variants that replace how the prompt is built."""
+
+    def test_load_prompt_hook(self):
+        """Test hooks resolve from callables and module:function paths."""
+        import pytest
+        from prompt_eval import archive_time, load_prompt_hook
+
+        assert load_prompt_hook(terse_user_prompt) is terse_user_prompt
+        assert load_prompt_hook("prompt_eval:archive_time") is archive_time
+        for spec in ("prompt_eval", "prompt_eval:missing", "no_such_module:f"):
+            with pytest.raises(ValueError):
+                load_prompt_hook(spec)
+
+    def test_hooks_bound_onto_analyzer(self):
+        """Test hooks replace the analyzer's prompt and its fingerprint."""
+        from prompt_eval import build_variant_analyzer
+
+        default = build_variant_analyzer({}, {"prompt_layout": "compact"})
+        analyzer = build_variant_analyzer(
+            {},
+            {
+                "prompt_layout": "compact",
+                "build_user_prompt": terse_user_prompt,
+                "system_prompt": "You classify tweets.",
+            },
+        )
+
+        assert analyzer._build_user_prompt(2, "TWEETS").startswith(
+            "Classify these 2 tweets"
+        )
+        assert analyzer.SYSTEM_PROMPT == "You classify tweets."
+        assert analyzer.prompt_fingerprint != default.prompt_fingerprint
+        # The class and other analyzers keep the built-in prompt
+        assert default.SYSTEM_PROMPT != analyzer.SYSTEM_PROMPT
+        assert not default._build_user_prompt(2, "TWEETS").startswith("Classify")
+
+    @patch("prompt_eval.Anthropic", HttpClient)
+    def test_custom_prompt_reaches_server(self, tmp_path):
+        """Test a variant's own prompt is sent and drives its token counts."""
+        from prompt_eval import archive_time, build_variant_analyzer, run_eval
+        from sentiment_analyzer import request_key
+
+        raw_file, reference_file = write_archive(tmp_path)
+        terse = {
+            "prompt_layout": "compact",
+            "build_user_prompt": terse_user_prompt,
+            "system_prompt": "You classify tweets.",
+        }
+        variants = {
+            "compact": {"prompt_layout": "compact"},
+            "padded": {
+                "prompt_layout": "compact",
+                "build_user_prompt": padded_user_prompt,
+            },
+            "terse": terse,
+        }
+
+        # A recording only matches if the terse prompt is what gets sent
+        analyzer = build_variant_analyzer({}, terse, now=archive_time(TWEETS))
+        batch = analyzer._build_batches(analyzer.scheduler.order(TWEETS), 15)[0]
+        user_prompt = analyzer._build_user_prompt(
+            len(batch), analyzer._format_tweets_for_prompt(batch)
+        )
+        assert user_prompt.startswith("Classify these 2 tweets")
+        recordings_file = tmp_path / "eval_recordings.json"
+        recordings_file.write_text(
+            json.dumps(
+                {
+                    request_key(analyzer.model, "You classify tweets.", user_prompt): {
+                        "text": json.dumps(REFERENCE),
+                        "usage": {"input_tokens": 80, "output_tokens": 40},
+                    }
+                }
+            )
+        )
+
+        with patch("sentiment_analyzer.time.sleep"):
+            report = run_eval(
+                {}, str(raw_file), str(reference_file), str(recordings_file), variants
+            )
+
+        assert report["terse"]["responses"] == {"recorded": 1, "synthesized": 0}
+        assert report["terse"]["input_tokens_per_tweet"] == 40.0
+        assert report["compact"]["responses"] == {"recorded": 0, "synthesized": 1}
+        # Synthesized usage is estimated from the prompt the server received
+        assert (
+            report["padded"]["input_tokens_per_tweet"]
+            > report["compact"]["input_tokens_per_tweet"]
+        )
@@ -0,0 +1,76 @@
+"""Tests for the normalized report format."""
+
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+
+def make_analyzed_tweets(n):
+    """Analyzed tweets with themes, keywords and a non-standard URL."""
+    tweets = []
+    for i in range(n):
+        negative = i % 3 == 0
+        tweets.append(
+            {
+                "tweet_id": str(100 + i),
+                "original_tweet": {
+                    "url": f"https://twitter.com/user{i}/status/{100 + i}",
+                    "author_username": f"user{i}",
+                    "text": f"Nansen tweet number {i} " * 5,
+                    "engagement": {"total": i * 7 % 50},
+                },
+                "analysis": {
+                    "sentiment": "NEGATIVE" if negative else "POSITIVE",
+                    "confidence": 80,
+                    "urgency": "HIGH" if i % 2 else "LOW",
+                    "themes": ["scam_accusations"] if negative else ["ui_praise"],
+                    "critical_keywords": ["scam", "rug"] if negative else [],
+                    "is_influencer": i == 4,
+                },
+            }
+        )
+    tweets[0]["original_tweet"]["url"] = "https://x.com/i/web/status/100"
+    return tweets
+
+
+class TestReportFormat:
+    """Test cases for normalize_report/denormalize_report."""
+
+    def test_round_trip(self, tmp_path):
+        """Test a saved report loads back to the aggregator's shape."""
+        from aggregator import SentimentAggregator
+        from report_format import load_report, save_report
+
+        report = SentimentAggregator().aggregate(make_analyzed_tweets(12))
+        report_file = tmp_path / "report_2026-01-09.json"
+        save_report(report, str(report_file))
+
+        assert load_report(str(report_file)) == report
+
+        saved = json.loads(report_file.read_text())
+        assert saved["format"] == "normalized"
+        assert len(saved["tweets"]) == 12
+        assert saved["tweets"]["100"]["url"] == "https://x.com/i/web/status/100"
+        assert "url" not in saved["tweets"]["101"]
+        assert saved["raw_data"]["negative_phrase_analysis"][0]["tweet"] in (
+            saved["tweets"]
+        )
+        # Each tweet's text is stored once
+        text = make_analyzed_tweets(12)[3]["original_tweet"]["text"]
+        assert report_file.read_text().count(json.dumps(text)) == 1
+        compact = json.dumps(report, separators=(",", ":"))
+        assert len(report_file.read_text()) < len(compact)
+
+    def test_legacy_report_passes_through(self, tmp_path):
+        """Test reports saved before normalization load unchanged."""
+        from aggregator import SentimentAggregator
+        from report_format import load_report
+
+        report = SentimentAggregator().aggregate(make_analyzed_tweets(3))
+        report_file = tmp_path / "report_2026-01-08.json"
+        report_file.write_text(json.dumps(report, indent=2))
+
+        assert load_report(str(report_file)) == report
@@ -0,0 +1,148 @@
+"""Tests for opt-in Claude request hedging."""
+
+import json
+import sys
+import threading
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from request_hedger import RequestHedger
+
+
+def make_operation(delays):
+    """Operation whose n-th call sleeps delays[n] and returns (n, latency)."""
+    calls = []
+    lock = threading.Lock()
+
+    def operation():
+        with lock:
+            n = len(calls)
+            calls.append(n)
+        time.sleep(delays[n])
+        return n, delays[n]
+
+    return operation, calls
+
+
+class TestRequestHedger:
+    """Test cases for RequestHedger."""
+
+    def test_disabled_by_default(self):
+        """Test the hedger just runs the operation when disabled."""
+        hedger = RequestHedger.from_config({})
+        operation, calls = make_operation([0.0])
+
+        assert hedger.call(operation) == (0, 0.0)
+        assert len(calls) == 1
+        assert hedger.latency_summary()["hedges_fired"] == 0
+
+    def test_threshold_learned_from_recent_latencies(self):
+        """Test the hedge delay is a percentile of recent latencies."""
+        hedger = RequestHedger(enabled=True, percentile=95, min_samples=5)
+        hedger.seed([1.0, 1.0, 1.0])
+        assert hedger.threshold_seconds() is None
+
+        hedger.seed([1.0, 11.0])
+        assert hedger.threshold_seconds() == pytest.approx(9.0)
+
+    def test_slow_request_is_hedged(self):
+        """Test a slow first request is beaten by the hedge."""
+        hedger = RequestHedger(enabled=True, min_samples=1, budget_usd=1.0)
+        hedger.seed([0.05])
+        operation, calls = make_operation([0.5, 0.0])
+        losers = []
+
+        result = hedger.call(operation, estimated_cost=0.1, on_loser=losers.append)
+
+        assert result == (1, 0.0)
+        assert len(calls) == 2
+        summary = hedger.latency_summary()
+        assert summary["hedges_fired"] == 1
+        assert summary["hedges_won"] == 1
+        assert summary["with_hedging"]["p50"] < 0.5
+        assert summary["without_hedging"]["p50"] > 0.05
+
+        # The abandoned request is handed over once it finishes
+        time.sleep(0.6)
+        assert len(losers) == 1 and losers[0].result() == (0, 0.5)
+
+    def test_hedge_budget_limits_extra_requests(self):
+        """Test no hedge is sent once the budget is committed."""
+        hedger = RequestHedger(enabled=True, min_samples=1, budget_usd=0.15)
+        hedger.seed([0.01])
+
+        operation, calls = make_operation([0.1, 0.0, 0.1])
+        hedger.call(operation, estimated_cost=0.1)
+        assert len(calls) == 2
+
+        # 0.1 still committed: a second hedge would exceed the 0.15 budget
+        hedger.call(operation, estimated_cost=0.1)
+        assert len(calls) == 3
+        assert hedger.hedges_fired == 1
+
+    def test_governor_can_veto_hedge(self):
+        """Test the reserve gate (e.g. the cost governor) can refuse a hedge."""
+        hedger = RequestHedger(enabled=True, min_samples=1, budget_usd=1.0)
+        hedger.seed([0.01])
+        operation, calls = make_operation([0.1])
+
+        assert hedger.call(operation, reserve=lambda cost: False) == (0, 0.1)
+        assert len(calls) == 1
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_analyzer_accounts_for_abandoned_request(self, mock_anthropic, tmp_path):
+        """Test the losing request's cost is settled against the run totals."""
+        from sentiment_analyzer import SentimentAnalyzer
+
+        config = {"claude": {"hedging": {"enabled": True, "min_samples": 1}}}
+        analyzer = SentimentAnalyzer(api_key="test_api_key", config=config)
+        analyzer.cache_file = tmp_path / "cache.json"
+        analyzer.request_hedger.seed([0.05])
+
+        response = Mock()
+        response.content = [Mock(text=json.dumps([{"sentiment": "POSITIVE"}]))]
+        response.usage = Mock(input_tokens=1000, output_tokens=100)
+        delays = iter([0.4, 0.0])
+
+        def create(**kwargs):
+            time.sleep(next(delays))
+            return response
+
+        analyzer.client.messages.create.side_effect = create
+
+        results = analyzer.analyze_tweets(
+            [{"tweet_id": "1", "text": "Nansen is great"}], use_cache=False
+        )
+        assert len(results) == 1
+        single_cost = results[0]["api_cost"]["estimated_cost_usd"]
+
+        time.sleep(0.5)
+        assert analyzer.total_cost == pytest.approx(2 * single_cost)
+        assert analyzer.cost_governor.reserved_usd == pytest.approx(0.0)
+        assert analyzer.cost_governor.spent_usd == pytest.approx(2 * single_cost)
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_seeded_from_own_batch_requests(self, mock_anthropic, tmp_path):
+        """Test only this model's batch latencies from the ledger seed hedging."""
+        from cost_ledger import CostLedger
+        from sentiment_analyzer import SentimentAnalyzer
+
+        config = {"claude": {"hedging": {"enabled": True}}}
+        model = SentimentAnalyzer(api_key="test_api_key", config=config).model
+        ledger = CostLedger(str(tmp_path / "ledger.jsonl"))
+        ledger.record("run-1", model, 1000, 200, 4.0, 0.01)
+        ledger.record("run-1", model, 1000, 200, 9.0, 0.0, status="error:APIError")
+        ledger.record("run-1", model, 300, 60, 1.0, 0.002, request_type="fast_path")
+        ledger.record("run-1", "claude-haiku", 1000, 200, 2.0, 0.003)
+        ledger.record("run-1", model, 1000, 200, 3.0, 0.01, request_type="shadow")
+
+        analyzer = SentimentAnalyzer(
+            api_key="test_api_key", config=config, ledger=ledger
+        )
+
+        assert list(analyzer.request_hedger.recent_latencies) == [4.0]
@@ -0,0 +1,154 @@
+"""Tests for the Claude retry policy and circuit breaker."""
+
+import sys
+import anthropic
+import pytest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from retry_policy import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+REQUEST = Mock(method="POST", url="https://api.anthropic.com/v1/messages")
+
+
+def api_error(status_code, headers=None):
+    """Build the SDK's typed exception for an HTTP status code."""
+    response = Mock(status_code=status_code, headers=headers or {}, request=REQUEST)
+    error_classes = {
+        401: anthropic.AuthenticationError,
+        429: anthropic.RateLimitError,
+    }
+    default_class = (
+        anthropic.InternalServerError
+        if status_code >= 500
+        else anthropic.APIStatusError
+    )
+    error_class = error_classes.get(status_code, default_class)
+    return error_class(f"HTTP {status_code}", response=response, body=None)
+
+
+class TestRetryPolicy:
+    """Test cases for RetryPolicy."""
+
+    def test_from_config(self):
+        """Test max_retries, retry_backoff and breaker settings are read."""
+        config = {
+            "claude": {
+                "max_retries": 2,
+                "retry_backoff": [1, 3],
+                "retry_budget_per_run": 4,
+                "circuit_breaker": {"failure_threshold": 3},
+            }
+        }
+        policy = RetryPolicy.from_config(config)
+
+        assert policy.max_retries == 2
+        assert policy.retry_backoff == [1, 3]
+        assert policy.retry_budget == 4
+        assert policy.breaker.failure_threshold == 3
+
+    def test_retries_transient_errors(self):
+        """Test 429 and 5xx are retried until the call succeeds."""
+        sleeps = []
+        policy = RetryPolicy(retry_backoff=[1, 2], sleep=sleeps.append)
+        operation = Mock(side_effect=[api_error(429), api_error(529), "ok"])
+
+        assert policy.call(operation) == "ok"
+        assert operation.call_count == 3
+        assert len(sleeps) == 2
+        # Full jitter: never more than the configured backoff
+        assert 0 <= sleeps[0] <= 1 and 0 <= sleeps[1] <= 2
+
+    def test_does_not_retry_auth_errors(self):
+        """Test non-retryable errors are raised immediately."""
+        policy = RetryPolicy(sleep=Mock())
+        operation = Mock(side_effect=api_error(401))
+
+        with pytest.raises(anthropic.AuthenticationError):
+            policy.call(operation)
+        assert operation.call_count == 1
+
+    def test_honours_retry_after(self):
+        """Test retry-after sets the minimum wait."""
+        assert RetryPolicy.retry_after_seconds(
+            api_error(429, {"retry-after": "7"})
+        ) == pytest.approx(7)
+        assert RetryPolicy.retry_after_seconds(
+            api_error(429, {"retry-after-ms": "1500"})
+        ) == pytest.approx(1.5)
+        assert RetryPolicy.retry_after_seconds(api_error(429)) is None
+
+        policy = RetryPolicy(retry_backoff=[1])
+        wait_time = policy.backoff_seconds(1, api_error(429, {"retry-after": "7"}))
+        assert wait_time == pytest.approx(7)
+
+    def test_retry_budget_is_shared(self):
+        """Test the per-run retry budget caps retries across calls."""
+        policy = RetryPolicy(max_retries=5, retry_budget=3, sleep=Mock())
+        policy.breaker.failure_threshold = 100
+        operation = Mock(side_effect=api_error(500))
+
+        with pytest.raises(anthropic.InternalServerError):
+            policy.call(operation)
+        assert operation.call_count == 4
+
+        # Budget is spent: the next call gets a single attempt
+        with pytest.raises(anthropic.InternalServerError):
+            policy.call(operation)
+        assert operation.call_count == 5
+
+    def test_circuit_opens_and_refuses_calls(self):
+        """Test the breaker opens after consecutive outage failures."""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout_seconds=60)
+        policy = RetryPolicy(max_retries=10, breaker=breaker, sleep=Mock())
+        operation = Mock(side_effect=anthropic.APIConnectionError(request=REQUEST))
+
+        with pytest.raises(CircuitOpenError):
+            policy.call(operation)
+        assert operation.call_count == 3
+        assert breaker.is_open
+
+        with pytest.raises(CircuitOpenError):
+            policy.call(Mock(return_value="ok"))
+
+    def test_circuit_half_open_trial(self):
+        """Test one trial call is allowed after the reset timeout."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=60)
+        breaker.record_failure()
+        assert breaker.allow_request() is False
+
+        breaker.opened_at -= 61
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False  # trial already in flight
+
+        breaker.record_success()
+        assert breaker.is_open is False
+        assert breaker.allow_request() is True
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_analyzer_stops_when_circuit_open(self, mock_anthropic, tmp_path):
+        """Test the analyzer stops dispatching batches once the API is down."""
+        from sentiment_analyzer import SentimentAnalyzer
+
+        config = {
+            "claude": {
+                "max_retries": 1,
+                "circuit_breaker": {"failure_threshold": 2},
+            }
+        }
+        analyzer = SentimentAnalyzer(api_key="test_api_key", config=config)
+        analyzer.cache_file = tmp_path / "cache.json"
+        analyzer.retry_policy._sleep = Mock()
+        analyzer.client.messages.create.side_effect = api_error(503)
+
+        tweets = [{"tweet_id": str(i), "text": f"Nansen {i}"} for i in range(5)]
+        with patch("sentiment_analyzer.time.sleep"):
+            results = analyzer.analyze_tweets(tweets, batch_size=1, use_cache=False)
+
+        assert results == []
+        assert len(analyzer.unanalyzed_tweets) == 5
+        # Only the first batch reached the API before the circuit opened
+        assert analyzer.client.messages.create.call_count == 2
@@ -0,0 +1,86 @@
+"""Tests for hourly and daily rollups."""
+
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from rollups import RollupStore
+
+NOW = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def make_tweet(tweet_id, created, sentiment="NEGATIVE", category="CRITICAL_FUD"):
+    """Analyzed tweet created at the given UTC time."""
+    return {
+        "tweet_id": tweet_id,
+        "original_tweet": {"created_at": created.isoformat() + "+00:00"},
+        "analysis": {
+            "sentiment": sentiment,
+            "confidence": 50,
+            "strategic_category": category,
+            "themes": ["scam_accusations"],
+            "product_mentions": ["nansen_mobile"],
+        },
+    }
+
+
+class TestRollupStore:
+    """Test cases for RollupStore."""
+
+    def test_hourly_buckets_dedupe_by_tweet_id(self, tmp_path):
+        """Test tweets land in their creation hour and repeats count once."""
+        store = RollupStore(str(tmp_path / "rollups.json"))
+        tweets = [
+            make_tweet("1", NOW - timedelta(minutes=90)),
+            make_tweet("2", NOW - timedelta(minutes=80), "POSITIVE", "STRATEGIC_WIN"),
+            make_tweet("3", NOW - timedelta(minutes=10)),
+        ]
+
+        assert store.add_tweets(tweets) == 3
+        assert store.add_tweets(tweets[:1]) == 0
+        assert store.add({"tweet_id": "4", "original_tweet": {}}) is False
+
+        hours = store.buckets(NOW - timedelta(hours=3), NOW)
+        assert [start.hour for start, _ in hours] == [10, 11]
+        assert hours[0][1].tweets == 2
+        assert hours[0][1].negative_share == 0.5
+        assert hours[0][1].sentiment_score == 0.0
+        assert hours[1][1].critical_fud == 1
+        assert store.total(NOW - timedelta(hours=3), NOW).tweets == 3
+
+    def test_downsample_keeps_totals(self, tmp_path):
+        """Test old days become daily buckets with the same counts."""
+        store = RollupStore(str(tmp_path / "rollups.json"), hourly_days=7)
+        old = NOW - timedelta(days=10)
+        store.add_tweets(
+            [make_tweet(str(i), old + timedelta(hours=i)) for i in range(5)]
+            + [make_tweet("recent", NOW - timedelta(hours=2))]
+        )
+        before = store.total(NOW - timedelta(days=30), NOW)
+
+        assert store.downsample(now=NOW) == 1
+        assert len(store.hourly) == 1
+
+        store.save()
+        reloaded = RollupStore(str(tmp_path / "rollups.json"), hourly_days=7)
+        after = reloaded.total(NOW - timedelta(days=30), NOW)
+        assert after.to_dict() == before.to_dict()
+        assert reloaded.buckets(old - timedelta(days=1), NOW, "hour")[0][0] == (
+            NOW - timedelta(hours=2)
+        ).replace(minute=0)
+
+        days = reloaded.buckets(NOW - timedelta(days=30), NOW, "day")
+        assert [bucket.tweets for _, bucket in days] == [5, 1]
+        assert days[0][1].product_mentions == {"nansen_mobile": 5}
+
+    def test_unknown_resolution(self, tmp_path):
+        """Test an unknown resolution is rejected."""
+        store = RollupStore(str(tmp_path / "rollups.json"))
+
+        with pytest.raises(ValueError):
+            store.buckets(NOW - timedelta(days=1), NOW, "week")
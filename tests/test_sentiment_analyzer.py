@@ -281,3 +281,336 @@ class TestSentimentAnalyzer:
         # Entry without cached_at - should be invalid
         no_date_entry = {}
         assert analyzer._is_cache_valid(no_date_entry, max_days=7) is False
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_cache_snapshot_roundtrip(self, mock_anthropic, tmp_path):
+        """Test exporting and importing a compressed cache snapshot."""
+        from sentiment_analyzer import SentimentAnalyzer
+        from datetime import datetime, timedelta
+
+        analyzer = SentimentAnalyzer(api_key="test_api_key")
+        analyzer.cache_file = tmp_path / "cache.json"
+
+        fresh = datetime.utcnow().isoformat()
+        stale = (datetime.utcnow() - timedelta(days=10)).isoformat()
+        analyzer._save_cache(
+            {
+                "1": {"analysis": {"sentiment": "POSITIVE"}, "cached_at": fresh},
+                "2": {"analysis": {"sentiment": "NEGATIVE"}, "cached_at": stale},
+            }
+        )
+
+        snapshot = tmp_path / "snapshot.json.gz"
+        assert analyzer.export_cache(str(snapshot), max_days=7) == 1
+
+        # Simulate a fresh runner with an empty cache
+        analyzer.cache_file = tmp_path / "fresh_cache.json"
+        assert analyzer.import_cache(str(snapshot), max_days=7) == 1
+
+        restored = analyzer._load_cache()
+        assert list(restored) == ["1"]
+
+        # Restored entries are served as cache hits
+        tweets = [{"tweet_id": "1", "text": "Nansen is great"}]
+        results = analyzer.analyze_tweets(tweets)
+        assert results[0]["analysis"]["sentiment"] == "POSITIVE"
+        assert analyzer.get_cache_stats()["hit_rate"] == 1.0
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_import_cache_prefers_recently_validated(self, mock_anthropic, tmp_path):
+        """Test a revalidated local entry beats a later-cached snapshot entry."""
+        from sentiment_analyzer import SentimentAnalyzer
+        from datetime import datetime, timedelta
+
+        analyzer = SentimentAnalyzer(api_key="test_api_key")
+        analyzer.cache_file = tmp_path / "snapshot_source.json"
+        now = datetime.utcnow()
+        analyzer._save_cache(
+            {
+                "1": {
+                    "analysis": {"sentiment": "NEGATIVE"},
+                    "cached_at": (now - timedelta(days=2)).isoformat(),
+                }
+            }
+        )
+        snapshot = tmp_path / "snapshot.json.gz"
+        analyzer.export_cache(str(snapshot), max_days=7)
+
+        analyzer.cache_file = tmp_path / "cache.json"
+        analyzer._save_cache(
+            {
+                "1": {
+                    "analysis": {"sentiment": "POSITIVE"},
+                    "cached_at": (now - timedelta(days=5)).isoformat(),
+                    "validated_at": (now - timedelta(hours=1)).isoformat(),
+                }
+            }
+        )
+
+        assert analyzer.import_cache(str(snapshot), max_days=7) == 0
+        assert analyzer._load_cache()["1"]["analysis"]["sentiment"] == "POSITIVE"
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_import_cache_missing_snapshot(self, mock_anthropic, tmp_path):
+        """Test importing a snapshot that does not exist is a no-op."""
+        from sentiment_analyzer import SentimentAnalyzer
+
+        analyzer = SentimentAnalyzer(api_key="test_api_key")
+        analyzer.cache_file = tmp_path / "cache.json"
+
+        assert analyzer.import_cache(str(tmp_path / "missing.json.gz")) == 0
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_per_tweet_token_attribution(self, mock_anthropic, tmp_path):
+        """Test per-tweet tokens reconcile exactly with response.usage."""
+        from sentiment_analyzer import SentimentAnalyzer
+
+        analyzer = SentimentAnalyzer(api_key="test_api_key")
+        analyzer.cache_file = tmp_path / "cache.json"
+
+        analyses = [
+            {"sentiment": "POSITIVE", "summary": "Short"},
+            {"sentiment": "NEGATIVE", "summary": "A much longer explanation " * 10},
+            {"sentiment": "NEUTRAL", "summary": "Short"},
+        ]
+        response = Mock()
+        response.content = [Mock(text=json.dumps(analyses))]
+        response.usage = Mock(input_tokens=4001, output_tokens=701)
+        analyzer.client.messages.create.return_value = response
+
+        tweets = [
+            {"tweet_id": "1", "text": "gm"},
+            {"tweet_id": "2", "text": "Long thread about Nansen " * 20},
+            {"tweet_id": "3", "text": "ok"},
+        ]
+        results = analyzer.analyze_tweets(tweets, use_cache=False)
+        costs = {r["tweet_id"]: r["api_cost"] for r in results}
+
+        assert sum(c["input_tokens"] for c in costs.values()) == 4001
+        assert sum(c["output_tokens"] for c in costs.values()) == 701
+        assert costs["2"]["input_tokens"] > costs["1"]["input_tokens"]
+        assert costs["2"]["output_tokens"] > costs["3"]["output_tokens"]
+        assert sum(c["estimated_cost_usd"] for c in costs.values()) == pytest.approx(
+            analyzer.total_cost
+        )
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_results_matched_by_tweet_number(self, mock_anthropic, tmp_path):
+        """Test an extra or out-of-order object does not shift labels."""
+        from sentiment_analyzer import SentimentAnalyzer
+
+        analyzer = SentimentAnalyzer(api_key="test_api_key")
+        analyzer.cache_file = tmp_path / "cache.json"
+
+        analyses = [
+            {"sentiment": "NEGATIVE", "summary": "Thread root"},
+            {"tweet_number": 3, "sentiment": "POSITIVE"},
+            {"tweet_number": 1, "sentiment": "NEGATIVE"},
+            {"tweet_number": 7, "sentiment": "NEUTRAL"},
+        ]
+        response = Mock()
+        response.content = [Mock(text=json.dumps(analyses))]
+        response.usage = Mock(input_tokens=900, output_tokens=300)
+        analyzer.client.messages.create.return_value = response
+
+        tweets = [
+            {"tweet_id": "1", "text": "Nansen is a scam"},
+            {"tweet_id": "2", "text": "Looking at Nansen"},
+            {"tweet_id": "3", "text": "Love Nansen"},
+        ]
+        results = analyzer.analyze_tweets(tweets, use_cache=False)
+        sentiments = {r["tweet_id"]: r["analysis"]["sentiment"] for r in results}
+
+        # The unnumbered root object only fills its own position, which tweet
+        # 1 already holds; tweet 2 got no object and falls back to defaults
+        assert sentiments == {"1": "NEGATIVE", "2": "NEUTRAL", "3": "POSITIVE"}
+        assert results[1]["analysis"]["summary"] == "Looking at Nansen"
+        assert analyzer.parse_failures == 1
+
+        # Without numbers, objects are matched by position
+        unnumbered = [{"sentiment": "POSITIVE"}, {"sentiment": "NEGATIVE"}]
+        assert analyzer._match_analyses(unnumbered, 3) == unnumbered + [{}]
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_engagement_signals_computed_locally(self, mock_anthropic, tmp_path):
+        """Test is_viral, is_influencer and urgency follow current engagement."""
+        from sentiment_analyzer import SentimentAnalyzer
+
+        config = {
+            "sentiment": {
+                "thresholds": {"high_engagement": 50, "influencer_followers": 1000}
+            }
+        }
+        analyzer = SentimentAnalyzer(api_key="test_api_key", config=config)
+        analyzer.cache_file = tmp_path / "cache.json"
+
+        response = Mock()
+        response.content = [
+            Mock(text=json.dumps([{"sentiment": "NEGATIVE", "urgency": "LOW"}]))
+        ]
+        response.usage = Mock(input_tokens=1000, output_tokens=100)
+        analyzer.client.messages.create.return_value = response
+
+        tweet = {
+            "tweet_id": "1",
+            "text": "Nansen alerts are broken",
+            "author_followers": 10,
+            "engagement": {"total": 5},
+        }
+        analysis = analyzer.analyze_tweets([tweet])[0]["analysis"]
+        assert analysis["is_viral"] is False
+        assert analysis["urgency"] == "LOW"
+
+        # Prompt no longer asks Claude for the reach flags
+        prompt = analyzer.client.messages.create.call_args.kwargs["messages"][0]
+        assert "is_viral" not in prompt["content"]
+
+        # The author's reach grows later: the cached analysis is updated, not redone
+        viral_tweet = {
+            **tweet,
+            "author_followers": 20000,
+            "engagement": {"total": 40},
+        }
+        analysis = analyzer.analyze_tweets([viral_tweet])[0]["analysis"]
+        assert analyzer.client.messages.create.call_count == 1
+        assert analysis["is_viral"] is True
+        assert analysis["is_influencer"] is True
+        assert analysis["urgency"] == "HIGH"
+        assert analysis["actionable"] is True
+        assert analysis["content_urgency"] == "LOW"
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_cache_revalidation(self, mock_anthropic, tmp_path):
+        """Test cache entries are re-analyzed on growth or prompt change only."""
+        from sentiment_analyzer import SentimentAnalyzer
+        from datetime import datetime, timedelta
+
+        config = {
+            "sentiment": {
+                "cache": {
+                    "max_age_days": 7,
+                    "revalidation": {
+                        "engagement_growth_factor": 2.0,
+                        "min_engagement_increase": 50,
+                    },
+                }
+            }
+        }
+        analyzer = SentimentAnalyzer(api_key="test_api_key", config=config)
+        analyzer.cache_file = tmp_path / "cache.json"
+
+        tweet = {"tweet_id": "1", "text": "Nansen", "engagement": {"total": 10}}
+        entry = analyzer._new_cache_entry({"sentiment": "NEUTRAL"}, tweet)
+
+        # Modest growth: reused, and life extended past max_age_days
+        entry["validated_at"] = (datetime.utcnow() - timedelta(days=6)).isoformat()
+        assert analyzer._revalidate_cache_entry(
+            entry, {**tweet, "engagement": {"total": 40}}
+        )
+        assert analyzer._is_cache_valid(entry, max_days=1)
+
+        # Engagement went viral: re-analyze
+        assert not analyzer._revalidate_cache_entry(
+            entry, {**tweet, "engagement": {"total": 5000}}
+        )
+
+        # Prompt changed: re-analyze
+        entry["prompt_fingerprint"] = "0" * 16
+        assert not analyzer._revalidate_cache_entry(entry, tweet)
+
+        # Not seen for longer than max_age_days: re-analyze
+        stale = analyzer._new_cache_entry({"sentiment": "NEUTRAL"}, tweet)
+        stale["validated_at"] = (datetime.utcnow() - timedelta(days=8)).isoformat()
+        assert not analyzer._revalidate_cache_entry(stale, tweet)
+
+        assert analyzer.get_cache_stats()["revalidations"] == {
+            "engagement_growth": 1,
+            "prompt_changed": 1,
+            "expired": 1,
+        }
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_conversation_grouped_batches(self, mock_anthropic):
+        """Test threads stay in one batch and share context in the prompt."""
+        from sentiment_analyzer import SentimentAnalyzer
+
+        analyzer = SentimentAnalyzer(api_key="test_api_key")
+
+        def tweet(tweet_id, author, conversation_id, **extra):
+            return {
+                "tweet_id": tweet_id,
+                "text": f"tweet {tweet_id}",
+                "author_username": author,
+                "author_followers": 1000,
+                "conversation_id": conversation_id,
+                **extra,
+            }
+
+        root_text = "Nansen points are live"
+        tweets = [
+            tweet("1", "alice", "100", conversation_root_text=root_text),
+            tweet("2", "carol", "2"),
+            tweet("3", "bob", "100", conversation_root_text=root_text),
+            tweet("4", "alice", "100", conversation_root_text=root_text),
+        ]
+
+        batches = analyzer._build_batches(tweets, batch_size=3)
+        assert [[t["tweet_id"] for t in batch] for batch in batches] == [
+            ["1", "4", "3"],
+            ["2"],
+        ]
+
+        prompt = analyzer._format_tweets_for_prompt(batches[0])
+        assert prompt.count(root_text) == 1
+        assert prompt.count("@alice") == 1
+        assert "Author of Tweets 1-2: @alice" in prompt
+        assert "Tweet 3:\nText: tweet 3\nAuthor: @bob" in prompt
+
+        # Header tokens are attributed to the thread's tweets only
+        input_shares, _ = analyzer._attribute_tokens(
+            batches[0], analyzer._build_user_prompt(3, prompt), [], 3000, 0
+        )
+        assert sum(input_shares) == 3000
+
+        analyzer.group_conversations = False
+        assert [len(b) for b in analyzer._build_batches(tweets, batch_size=3)] == [3, 1]
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_compact_prompt_layout(self, mock_anthropic):
+        """Test the compact layout drops noise and keeps tweet numbering."""
+        from sentiment_analyzer import SentimentAnalyzer
+
+        analyzer = SentimentAnalyzer(api_key="test_api_key")
+        assert analyzer.prompt_layout == "compact"
+
+        tweets = [
+            {
+                "tweet_id": str(i),
+                "text": f"Nansen   points\n\nlive https://t.co/abc{i}",
+                "author_username": f"user{i}",
+                "author_followers": 12345,
+                "engagement": {"likes": 5, "retweets": 1, "replies": 2, "total": 8},
+                "url": f"https://twitter.com/user{i}/status/{i}",
+                "created_at": "2026-01-09T17:25:55+00:00",
+            }
+            for i in range(1, 4)
+        ]
+
+        compact = analyzer._format_tweets_for_prompt(tweets)
+        assert "Tweet 3:\nText: Nansen points live [link]\n" in compact
+        assert "@user3 (12.3K followers)\n" in compact
+        assert "t.co" not in compact
+        assert "twitter.com" not in compact
+        assert "2026-01-09" not in compact
+
+        stats = analyzer.measure_prompt_tokens(tweets, batch_size=15)
+        assert stats["compact"]["tweets"] < stats["full"]["tweets"]
+        assert analyzer.prompt_layout == "compact"
+
+        full = SentimentAnalyzer(
+            api_key="test_api_key", config={"claude": {"prompt_layout": "full"}}
+        )
+        assert "URL: https://twitter.com/user1/status/1" in (
+            full._format_tweets_for_prompt(tweets)
+        )
+        assert full.prompt_fingerprint != analyzer.prompt_fingerprint
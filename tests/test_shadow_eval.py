@@ -0,0 +1,127 @@
+"""Tests for shadow model evaluation."""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+
+def make_response(analyses, input_tokens=1000, output_tokens=200):
+    """Build a mock messages.create response."""
+    response = Mock()
+    response.content = [Mock(text=json.dumps(analyses))]
+    response.usage = Mock(input_tokens=input_tokens, output_tokens=output_tokens)
+    return response
+
+
+class TestShadowEvaluator:
+    """Test cases for ShadowEvaluator."""
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_disabled_by_default(self, mock_anthropic):
+        """Test no shadow evaluator is created without claude.shadow.enabled."""
+        from sentiment_analyzer import SentimentAnalyzer
+
+        assert SentimentAnalyzer(api_key="test_api_key").shadow is None
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_shadow_comparison(self, mock_anthropic, tmp_path):
+        """Test shadow labels are compared without changing production results."""
+        from sentiment_analyzer import SentimentAnalyzer
+
+        summary_file = tmp_path / "shadow_eval.json"
+        config = {
+            "claude": {
+                "shadow": {
+                    "enabled": True,
+                    "model": "claude-haiku-4-5-20251001",
+                    "prompt_layout": "full",
+                    "sample_rate": 1.0,
+                    "summary_file": str(summary_file),
+                }
+            }
+        }
+        analyzer = SentimentAnalyzer(api_key="test_api_key", config=config)
+        analyzer.cache_file = tmp_path / "cache.json"
+
+        production = [
+            {"sentiment": "NEGATIVE", "strategic_category": "CRITICAL_FUD"},
+            {"sentiment": "POSITIVE", "strategic_category": "STRATEGIC_WIN"},
+        ]
+        shadow = [
+            {"sentiment": "NEGATIVE", "strategic_category": "ROUTINE_NEGATIVE"},
+            {"sentiment": "POSITIVE", "strategic_category": "STRATEGIC_WIN"},
+        ]
+
+        def create(**kwargs):
+            if kwargs["model"] == "claude-haiku-4-5-20251001":
+                assert "URL:" in kwargs["messages"][0]["content"]
+                return make_response(shadow)
+            return make_response(production)
+
+        analyzer.client.messages.create.side_effect = create
+
+        tweets = [
+            {"tweet_id": "1", "text": "Nansen scam"},
+            {"tweet_id": "2", "text": "Nansen mobile rocks"},
+        ]
+        with patch("sentiment_analyzer.time.sleep"):
+            results = analyzer.analyze_tweets(tweets, use_cache=False)
+
+        summary = analyzer.shadow.finish()
+
+        assert results[0]["analysis"]["strategic_category"] == "CRITICAL_FUD"
+        assert summary["tweets_compared"] == 2
+        assert summary["agreement"] == {
+            "sentiment": 1.0,
+            "strategic_category": 0.5,
+            "urgency": 1.0,
+        }
+        # Haiku is a third of Sonnet's price for the same tokens
+        assert summary["cost_per_tweet_usd"]["delta_pct"] == -66.7
+        # Shadow spend is kept out of the run's totals
+        assert analyzer.total_cost == analyzer._calculate_cost(1000, 200)
+        assert json.loads(summary_file.read_text())[-1]["shadow"]["model"] == (
+            "claude-haiku-4-5-20251001"
+        )
+
+    @patch("sentiment_analyzer.Anthropic")
+    def test_shadow_reserves_run_budget(self, mock_anthropic, tmp_path):
+        """Test shadow batches draw on the cost governor and respect its limit."""
+        from sentiment_analyzer import SentimentAnalyzer
+
+        config = {
+            "claude": {
+                "shadow": {
+                    "enabled": True,
+                    "sample_rate": 1.0,
+                    "budget_usd": 10.0,
+                    "summary_file": str(tmp_path / "shadow_eval.json"),
+                }
+            }
+        }
+        analyzer = SentimentAnalyzer(api_key="test_api_key", config=config)
+        analyzer.client.messages.create.return_value = make_response(
+            [{"tweet_number": 1, "sentiment": "POSITIVE"}]
+        )
+        tweets = [{"tweet_id": "1", "text": "Nansen mobile rocks"}]
+        shadow = analyzer.shadow
+        governor = analyzer.cost_governor
+        estimated_cost = shadow.shadow._estimate_batch_cost(tweets)
+
+        shadow.submit(tweets).result()
+        assert governor.reserved_usd == 0.0
+        assert governor.spent_usd == analyzer._calculate_cost(1000, 200)
+        # Kept apart from production totals, to be added to the run's cost
+        assert shadow.stats["shadow_cost_usd"] == governor.spent_usd
+        assert analyzer.total_cost == 0.0
+
+        # No room left in the run's limit: the batch is not shadowed
+        governor.max_per_run_usd = governor.spent_usd + estimated_cost / 2
+        assert shadow.submit(tweets) is None
+        assert shadow.stats["batches_skipped_budget"] == 1
+        assert analyzer.client.messages.create.call_count == 1
+        shadow.finish()
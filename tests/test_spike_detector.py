@@ -0,0 +1,88 @@
+"""Tests for the rollup spike detector."""
+
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from rollups import RollupBucket, RollupStore
+from spike_detector import SpikeDetector
+
+START = datetime(2026, 3, 1, 0, 0, 0)
+
+
+def make_bucket(tweets, negative=0, critical_fud=0):
+    """Hourly bucket with the given counts."""
+    bucket = RollupBucket()
+    for i in range(tweets):
+        bucket.add(
+            {
+                "sentiment": "NEGATIVE" if i < negative else "POSITIVE",
+                "confidence": 80,
+                "strategic_category": "CRITICAL_FUD" if i < critical_fud else "",
+            }
+        )
+    return bucket
+
+
+def make_detector(tmp_path, **detection):
+    """Detector with its state in tmp_path."""
+    detection.setdefault("state_file", str(tmp_path / "detector.json"))
+    return SpikeDetector(
+        {"negative_spike_threshold": 0.5, "spike_detection": detection}
+    )
+
+
+class TestSpikeDetector:
+    """Test cases for SpikeDetector."""
+
+    def test_flags_fud_wave_in_onset_hour(self, tmp_path):
+        """Test a wave below the static threshold is flagged in its first hour."""
+        detector = make_detector(tmp_path)
+        hour = START
+        for i in range(48):
+            assert detector.update(hour, make_bucket(20, negative=2 + i % 2)) == []
+            hour += timedelta(hours=1)
+
+        alerts = detector.update(hour, make_bucket(20, negative=8, critical_fud=5))
+
+        assert {a["metric"] for a in alerts} == {"negative_share", "critical_fud_rate"}
+        assert all(a["bucket"] == hour.strftime("%Y-%m-%dT%H") for a in alerts)
+        assert "σ above baseline" in alerts[0]["message"]
+
+    def test_static_threshold_and_small_buckets(self, tmp_path):
+        """Test the configured share threshold applies from the first hour."""
+        detector = make_detector(tmp_path)
+
+        alerts = detector.update(START, make_bucket(10, negative=6))
+        assert [a["metric"] for a in alerts] == ["negative_share"]
+        assert "above 50%" in alerts[0]["message"]
+
+        # Too few tweets to score a share
+        assert detector.update(START + timedelta(hours=1), make_bucket(2, 2)) == []
+
+    def test_process_resumes_after_saved_hour(self, tmp_path):
+        """Test completed hours are scored once, gaps as zero volume."""
+        rollups = RollupStore(str(tmp_path / "rollups.json"))
+        tweets = [
+            {
+                "tweet_id": str(i),
+                "original_tweet": {"created_at": f"2026-03-01T0{i % 2 * 3}:10:00Z"},
+                "analysis": {"sentiment": "POSITIVE", "confidence": 90},
+            }
+            for i in range(6)
+        ]
+        rollups.add_tweets(tweets)
+
+        detector = make_detector(tmp_path)
+        detector.process(rollups, now=START + timedelta(hours=2, minutes=30))
+        assert detector.last_bucket == "2026-03-01T01"
+        assert detector.baselines["volume"].count == 2
+        detector.save()
+
+        reloaded = make_detector(tmp_path)
+        reloaded.process(rollups, now=START + timedelta(hours=4, minutes=5))
+        assert reloaded.last_bucket == "2026-03-01T03"
+        assert reloaded.baselines["volume"].count == 4
@@ -22,7 +22,14 @@ sys.path.insert(
 
 from twitter_client import TwitterClient
 from sentiment_analyzer import SentimentAnalyzer
-from aggregator import SentimentAggregator
+from aggregator import (
+    SENTIMENT_BASE_SCORES,
+    STRATEGIC_CATEGORY_COUNTERS,
+    TRACKED_PRODUCTS,
+    URGENCY_ORDER,
+    SentimentAggregator,
+    map_theme_to_category,
+)
 from slack_notifier import SlackNotifier
 from utils import (
     format_number,
@@ -34,6 +41,7 @@ from utils import (
     build_twitter_url,
     is_spam,
     calculate_engagement_rate,
+    apportion,
 )
 
 
@@ -225,6 +233,86 @@ def generate_mock_analyzed_tweets(n: int = 20) -> List[Dict]:
     return analyzed
 
 
+# ============================================================================
+# Reference Aggregations
+# ============================================================================
+# Straightforward per-section passes over the tweets, kept as oracles for the
+# single-pass AggregateState
+
+
+def reference_sentiment_score(tweets: List[Dict]) -> float:
+    """Confidence-weighted sentiment score from -100 to +100."""
+    total_weighted_score = 0.0
+    total_weight = 0.0
+    for tweet in tweets:
+        confidence = tweet["analysis"]["confidence"] / 100.0
+        sentiment = tweet["analysis"]["sentiment"]
+        total_weighted_score += SENTIMENT_BASE_SCORES.get(sentiment, 0.0) * confidence
+        total_weight += confidence
+    if total_weight > 0:
+        return total_weighted_score / total_weight * 100
+    return 0.0
+
+
+def reference_theme_groups(tweets: List[Dict]) -> Dict[str, List[Dict]]:
+    """Tweets per theme in first-seen order, untagged tweets under general."""
+    groups = {}
+    for tweet in tweets:
+        for theme in tweet["analysis"].get("themes", []) or ["general"]:
+            groups.setdefault(theme, []).append(tweet)
+    return groups
+
+
+def reference_product_mentions(tweets: List[Dict]) -> Dict[str, int]:
+    """Mentions of each tracked product."""
+    counts = {product: 0 for product in TRACKED_PRODUCTS}
+    for tweet in tweets:
+        for product in tweet["analysis"].get("product_mentions", []):
+            if product in counts:
+                counts[product] += 1
+    return counts
+
+
+def reference_strategic_categories(tweets: List[Dict]) -> Dict[str, int]:
+    """Tweets per strategic category counter, plus influencer mentions."""
+    counts = {
+        **{counter: 0 for counter in STRATEGIC_CATEGORY_COUNTERS.values()},
+        "influencer_mentions": 0,
+    }
+    for tweet in tweets:
+        category = tweet["analysis"].get("strategic_category", "")
+        counter = STRATEGIC_CATEGORY_COUNTERS.get(category)
+        if counter:
+            counts[counter] += 1
+        if tweet["analysis"].get("is_influencer", False):
+            counts["influencer_mentions"] += 1
+    return counts
+
+
+def reference_negative_phrases(tweets: List[Dict]) -> List[Dict]:
+    """Critical keywords of negative tweets, HIGH urgency first."""
+    phrases = []
+    for tweet in tweets:
+        themes = tweet["analysis"].get("themes", [])
+        primary_theme = themes[0] if themes else "unknown"
+        category = map_theme_to_category(
+            primary_theme, tweet["analysis"].get("negative_patterns", [])
+        )
+        for keyword in tweet["analysis"].get("critical_keywords", []):
+            phrases.append(
+                {
+                    "phrase": keyword,
+                    "username": tweet["original_tweet"]["author_username"],
+                    "theme": primary_theme,
+                    "category": category,
+                    "url": tweet["original_tweet"]["url"],
+                    "urgency": tweet["analysis"].get("urgency", "LOW"),
+                }
+            )
+    phrases.sort(key=lambda x: URGENCY_ORDER.get(x["urgency"], 3))
+    return phrases
+
+
 # ============================================================================
 # Test Classes
 # ============================================================================
@@ -356,23 +444,30 @@ class TestAggregator(unittest.TestCase):
 
     def test_calculate_sentiment_score(self):
         """Test sentiment score calculation."""
-        score = self.aggregator._calculate_sentiment_score(self.mock_tweets)
+        from aggregator import AggregateState
+
+        score = AggregateState.from_tweets(self.mock_tweets).sentiment_score
 
         # Score should be between -100 and 100
         self.assertGreaterEqual(score, -100)
         self.assertLessEqual(score, 100)
 
     def test_group_by_themes(self):
-        """Test grouping tweets by themes."""
-        groups = self.aggregator._group_by_themes(self.mock_tweets)
+        """Test counting tweets by themes."""
+        from aggregator import AggregateState
 
-        self.assertIsInstance(groups, dict)
-        for theme, tweets in groups.items():
-            self.assertIsInstance(tweets, list)
+        state = AggregateState.from_tweets(self.mock_tweets)
+
+        for side in ("positive", "negative"):
+            self.assertIsInstance(state.theme_counts[side], dict)
+            for theme, count in state.theme_counts[side].items():
+                self.assertIsInstance(count, int)
 
     def test_count_product_mentions(self):
         """Test counting product mentions."""
-        counts = self.aggregator._count_product_mentions(self.mock_tweets)
+        from aggregator import AggregateState
+
+        counts = AggregateState.from_tweets(self.mock_tweets).product_mentions
 
         self.assertIn("nansen_mobile", counts)
         self.assertIn("season2_rewards", counts)
@@ -381,11 +476,9 @@ class TestAggregator(unittest.TestCase):
 
     def test_extract_negative_phrases(self):
         """Test extracting negative phrases."""
-        negative_tweets = [
-            t for t in self.mock_tweets if t["analysis"]["sentiment"] == "NEGATIVE"
-        ]
+        from aggregator import AggregateState
 
-        phrases = self.aggregator._extract_negative_phrases(negative_tweets)
+        phrases = AggregateState.from_tweets(self.mock_tweets).negative_phrases
 
         self.assertIsInstance(phrases, list)
         for phrase in phrases:
@@ -425,6 +518,155 @@ class TestAggregator(unittest.TestCase):
         total = summary["positive_count"] + summary["negative_count"]
         self.assertEqual(total, summary["total_tweets"])
 
+    def test_single_pass_matches_helpers(self):
+        """Test the one-pass aggregate state matches per-section passes."""
+        from aggregator import AggregateState
+
+        tweets = generate_mock_analyzed_tweets(60)
+        tweets[0]["analysis"]["urgency"] = "LOW"
+        tweets[-1]["analysis"].update(
+            {"sentiment": "NEGATIVE", "urgency": "HIGH", "critical_keywords": ["rug"]}
+        )
+        negative_tweets = [
+            t for t in tweets if t["analysis"]["sentiment"] == "NEGATIVE"
+        ]
+
+        state = AggregateState()
+        for tweet in tweets:
+            state.add(tweet)
+        report = self.aggregator.aggregate(tweets)
+        raw_data = report["raw_data"]
+
+        self.assertEqual(state.sentiment_score, reference_sentiment_score(tweets))
+        self.assertEqual(
+            raw_data["product_mentions"], reference_product_mentions(tweets)
+        )
+        self.assertEqual(
+            raw_data["strategic_highlights"], reference_strategic_categories(tweets)
+        )
+        groups = reference_theme_groups(negative_tweets)
+        self.assertEqual(
+            state.theme_counts["negative"],
+            {theme: len(group) for theme, group in groups.items()},
+        )
+        self.assertEqual(
+            raw_data["negative_phrase_analysis"],
+            reference_negative_phrases(negative_tweets),
+        )
+        self.assertEqual(raw_data["negative_phrase_analysis"][0]["urgency"], "HIGH")
+
+        for theme, group in groups.items():
+            best = sorted(
+                group,
+                key=lambda t: (
+                    t["analysis"].get("is_influencer", False),
+                    t["original_tweet"]["engagement"]["total"],
+                ),
+                reverse=True,
+            )
+            self.assertEqual(
+                [row["url"] for row in state.theme_examples("negative")[theme]],
+                [t["original_tweet"]["url"] for t in best[:3]],
+            )
+
+        # The JSON report and Slack message show the same examples
+        for theme in raw_data["negative_themes"]:
+            links = " ".join(
+                f"<{t['url']}|@{t['username']}>" for t in theme["example_tweets"]
+            )
+            self.assertIn(f"(e.g., {links})", report["message_2"])
+
+    def test_incremental_snapshot(self):
+        """Test snapshot() after update() matches aggregate() at any point."""
+        tweets = generate_mock_analyzed_tweets(30)
+
+        empty = self.aggregator.snapshot()
+        self.assertEqual(empty["raw_data"]["summary"]["total_tweets"], 0)
+
+        for count in (12, 30):
+            for tweet in tweets[self.aggregator.state.total : count]:
+                self.aggregator.update(tweet)
+            snapshot = self.aggregator.snapshot()
+            expected = self.aggregator.aggregate(tweets[:count])
+
+            for key in ("message_1", "message_2", "raw_data"):
+                self.assertEqual(snapshot[key], expected[key])
+
+        self.aggregator.reset()
+        self.assertEqual(self.aggregator.state.total, 0)
+
+    def test_merge_hourly_partials(self):
+        """Test merged saved partials give the same report as one aggregate()."""
+        import tempfile
+
+        from aggregator import AggregateState, merge
+
+        tweets = generate_mock_analyzed_tweets(48)
+        tweets[40]["analysis"]["is_influencer"] = True
+        partials = [
+            AggregateState.from_tweets(tweets[i : i + 2]) for i in range(0, 48, 2)
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for hour, partial in enumerate(partials):
+                partial.save(os.path.join(tmp_dir, f"state_{hour:02d}.json"))
+            loaded = [
+                AggregateState.load(os.path.join(tmp_dir, f"state_{hour:02d}.json"))
+                for hour in range(24)
+            ]
+
+        report = self.aggregator.report_from_states(loaded)
+        expected = self.aggregator.aggregate(tweets)
+        for key in ("message_1", "message_2", "raw_data"):
+            self.assertEqual(report[key], expected[key])
+
+        a, b, c = partials[:3]
+        self.assertEqual(
+            merge(merge(a, b), c).to_dict(), merge(a, merge(b, c)).to_dict()
+        )
+        empty = self.aggregator.report_from_states([])
+        self.assertEqual(empty["raw_data"]["summary"]["total_tweets"], 0)
+
+    def test_aggregate_windows(self):
+        """Test each window's report matches aggregate() over its tweets."""
+        import random
+
+        from utils import parse_created_at
+
+        # Newest first, as fetched
+        tweets = generate_mock_analyzed_tweets(60)
+        now = parse_created_at(tweets[0]["original_tweet"]["created_at"])
+        now += timedelta(minutes=1)
+
+        reports = self.aggregator.aggregate_windows(tweets, [168, 1, 24], now=now)
+        self.assertEqual(list(reports), [1, 24, 168])
+        for hours, window_tweets in ((1, tweets[:1]), (24, tweets[:24])):
+            expected = self.aggregator.aggregate(window_tweets)
+            self.assertEqual(reports[hours]["raw_data"], expected["raw_data"])
+            self.assertEqual(reports[hours]["metadata"]["window_hours"], hours)
+        expected = self.aggregator.aggregate(tweets)
+        self.assertEqual(reports[168]["raw_data"], expected["raw_data"])
+        self.assertEqual(reports[168]["message_2"], expected["message_2"])
+
+        # Out of time order (and an undated tweet), the widest report is
+        # still the one aggregate() gives for the list as it is
+        shuffled = list(tweets)
+        random.Random(7).shuffle(shuffled)
+        shuffled[5] = {
+            **shuffled[5],
+            "original_tweet": {**shuffled[5]["original_tweet"], "created_at": "?"},
+        }
+        reports = self.aggregator.aggregate_windows(shuffled, [1, 24, 48], now=now)
+        expected = self.aggregator.aggregate(shuffled)
+        self.assertEqual(reports[48]["raw_data"], expected["raw_data"])
+        self.assertEqual(
+            reports[24]["raw_data"]["summary"],
+            self.aggregator.aggregate(tweets[:24])["raw_data"]["summary"],
+        )
+
+        empty = self.aggregator.aggregate_windows(tweets, [0.001, 24], now=now)
+        self.assertEqual(empty[0.001]["raw_data"]["summary"]["total_tweets"], 0)
+
 
 class TestSlackNotifier(unittest.TestCase):
     """Test cases for SlackNotifier."""
@@ -501,6 +743,18 @@ class TestSlackNotifier(unittest.TestCase):
         self.assertTrue(should_alert)
         self.assertIn("Critical FUD", reason)
 
+    def test_should_alert_team_anomaly(self):
+        """Test team alert trigger on a spike flagged by the detector."""
+        report = SentimentAggregator().aggregate(generate_mock_analyzed_tweets(20))
+        report["raw_data"]["anomalies"] = [
+            {"metric": "negative_share", "message": "Negative share spike"}
+        ]
+
+        should_alert, reason = self.notifier._should_alert_team(report)
+
+        self.assertTrue(should_alert)
+        self.assertEqual(reason, "Negative share spike")
+
     def test_validate_report_valid(self):
         """Test report validation with valid report."""
         analyzed_tweets = generate_mock_analyzed_tweets(10)
@@ -596,6 +850,13 @@ class TestUtils(unittest.TestCase):
         rate = calculate_engagement_rate(tweet)
         self.assertEqual(rate, 0.0)
 
+    def test_apportion_sums_to_total(self):
+        """Test largest-remainder apportionment keeps the exact total."""
+        self.assertEqual(apportion(10, [1, 1, 1]), [4, 3, 3])
+        self.assertEqual(apportion(100, [30, 10]), [75, 25])
+        self.assertEqual(apportion(7, [0, 0]), [4, 3])
+        self.assertEqual(sum(apportion(9999, [3.7, 1.2, 8.9, 0.4])), 9999)
+
 
 class TestFullWorkflow(unittest.TestCase):
     """Integration tests for complete workflow."""
@@ -0,0 +1,87 @@
+"""Tests for the per-run trend store."""
+
+import json
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from trend_store import TrendStore
+
+
+def make_report(generated_at, score, total=10, critical_fud=0):
+    """Minimal report with the fields the store keeps."""
+    return {
+        "raw_data": {
+            "summary": {
+                "total_tweets": total,
+                "positive_count": total,
+                "negative_count": 0,
+                "negative_pct": 0.0,
+                "sentiment_score": score,
+                "trend": "STABLE",
+            },
+            "strategic_highlights": {"critical_fud": critical_fud},
+        },
+        "metadata": {"generated_at": generated_at.isoformat()},
+    }
+
+
+class TestTrendStore:
+    """Test cases for TrendStore."""
+
+    def test_rolling_window(self, tmp_path):
+        """Test values come from the window only, oldest first, across reloads."""
+        store = TrendStore(str(tmp_path / "trend.jsonl"))
+        now = datetime(2026, 1, 10, 12, 0, 0)
+        store.record(make_report(now - timedelta(days=1), 20.0, critical_fud=2))
+        store.record(make_report(now - timedelta(days=9), -50.0))
+        store.record(make_report(now - timedelta(days=3), 40.0))
+        store.record(make_report(now - timedelta(hours=1), 0.0, total=0))
+
+        reloaded = TrendStore(str(tmp_path / "trend.jsonl"))
+        assert reloaded.values("sentiment_score", 7, now=now) == [40.0, 20.0]
+        assert reloaded.values("critical_fud", 7, now=now) == [0, 2]
+        assert len(reloaded.entries()) == 3
+
+    def test_backfill_skips_stored_reports(self, tmp_path):
+        """Test backfilling from report files is idempotent."""
+        store = TrendStore(str(tmp_path / "trend.jsonl"))
+        now = datetime(2026, 1, 10)
+        for day in range(3):
+            report = make_report(now - timedelta(days=day), float(day))
+            (tmp_path / f"report_{day}.json").write_text(json.dumps(report))
+        (tmp_path / "report_bad.json").write_text("{")
+
+        files = sorted(str(p) for p in tmp_path.glob("report_*.json"))
+        assert store.backfill(files) == 3
+        assert store.backfill(files) == 0
+        assert len(tmp_path.joinpath("trend.jsonl").read_text().splitlines()) == 3
+
+    def test_aggregator_trend_uses_history(self, tmp_path):
+        """Test the report trend compares with stored runs."""
+        from aggregator import SentimentAggregator
+
+        tweets = [
+            {
+                "original_tweet": {
+                    "url": f"https://x.com/user/status/{i}",
+                    "author_username": f"user{i}",
+                    "text": "Nansen is fine",
+                    "engagement": {"total": 1},
+                },
+                "analysis": {"sentiment": "NEUTRAL", "confidence": 80},
+            }
+            for i in range(3)
+        ]
+        store = TrendStore(str(tmp_path / "trend.jsonl"))
+        aggregator = SentimentAggregator(trend_store=store, trend_window_days=7)
+
+        report = aggregator.aggregate(tweets)
+        assert report["raw_data"]["summary"]["trend"] == "STABLE"
+
+        store.record(make_report(datetime.utcnow() - timedelta(hours=6), 90.0))
+        report = aggregator.aggregate(tweets)
+        assert report["raw_data"]["summary"]["trend"] == "DECLINING"
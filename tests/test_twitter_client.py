@@ -239,10 +239,12 @@ class TestTwitterClient:
         mock_tweepy_client.return_value = mock_client_instance
 
         client = TwitterClient(bearer_token="test_token")
-        tweets = client.search_mentions(hours=24)
+        pages = []
+        tweets = client.search_mentions(hours=24, on_page=pages.append)
 
         assert len(tweets) == 3
         assert mock_client_instance.search_recent_tweets.call_count == 2
+        assert [[t["tweet_id"] for t in page] for page in pages] == [["1", "2"], ["3"]]
 
     @patch("twitter_client.tweepy.Client")
     def test_search_mentions_rate_limit_handled(self, mock_tweepy_client):